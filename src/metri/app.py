@@ -2,6 +2,7 @@ import customtkinter as ctk
 from PIL import Image, ImageSequence
 import pygame, os
 from .views.main_screen import MainScreen
+from .logic.song_func import flush_songs
 
 
 class SplashGIF(ctk.CTkToplevel):
@@ -77,3 +78,4 @@ def run():
     app.withdraw()  # ukrycie głównego okna
 
     splash.mainloop()
+    flush_songs()
@@ -0,0 +1,115 @@
+import math
+import time
+
+# event waits may overshoot by a timer tick (about 15 ms on Windows)
+COARSE_MARGIN = 0.02
+# the last stretch before a deadline is busy-waited, below sleep() resolution
+SPIN_THRESHOLD = 0.002
+
+
+def sleep_until(deadline, stop_event=None, clock=time.perf_counter):
+    """Sleep until clock() reaches deadline; return False if stop_event was set.
+
+    Waits on stop_event (so stopping is immediate) until COARSE_MARGIN before
+    the deadline, then sleeps in shorter steps and spins the last
+    SPIN_THRESHOLD seconds.
+    """
+    remaining = deadline - clock()
+    while remaining > COARSE_MARGIN:
+        if stop_event is not None:
+            if stop_event.wait(remaining - COARSE_MARGIN):
+                return False
+        else:
+            time.sleep(remaining - COARSE_MARGIN)
+        remaining = deadline - clock()
+
+    while remaining > SPIN_THRESHOLD:
+        time.sleep(remaining - SPIN_THRESHOLD)
+        remaining = deadline - clock()
+
+    while clock() < deadline:
+        pass
+    return stop_event is None or not stop_event.is_set()
+
+
+class JitterStats:
+    """Running statistics of how late beats fired, in seconds."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.max = 0.0
+        self._m2 = 0.0
+
+    def add(self, lateness):
+        # Welford's algorithm, so a long session keeps constant memory
+        self.count += 1
+        delta = lateness - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (lateness - self.mean)
+        self.max = max(self.max, abs(lateness))
+
+    @property
+    def stdev(self):
+        return math.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    def summary(self):
+        """Return count, mean, stdev and max lateness in milliseconds."""
+        return {
+            'count': self.count,
+            'mean_ms': self.mean * 1000,
+            'stdev_ms': self.stdev * 1000,
+            'max_ms': self.max * 1000,
+        }
+
+
+class BeatClock:
+    """Beat deadlines on an absolute perf_counter grid.
+
+    Beat n is due at origin + n * interval, so time spent between beats
+    (callbacks, playing the click) never accumulates into tempo drift. A tempo
+    change restarts the grid at the last beat that fired, which keeps the
+    spacing exact across the change; the caller's bar position is untouched.
+    """
+
+    def __init__(self, bpm, stats=None, clock=time.perf_counter):
+        self._clock = clock
+        self._origin = clock()
+        self._index = 0
+        self.bpm = bpm
+        self.interval = 60.0 / bpm
+        self.stats = stats if stats is not None else JitterStats()
+        self.resyncs = 0
+
+    @property
+    def next_deadline(self):
+        return self._origin + self._index * self.interval
+
+    def set_bpm(self, bpm):
+        if bpm == self.bpm:
+            return
+        if self._index:
+            # origin moves to the last beat, which becomes beat 0 of the new grid
+            self._origin += (self._index - 1) * self.interval
+            self._index = 1
+        self.bpm = bpm
+        self.interval = 60.0 / bpm
+
+    def wait(self, stop_event=None):
+        """Wait for the next beat; return how late it fired, or None if stopped."""
+        deadline = self.next_deadline
+        if not sleep_until(deadline, stop_event, self._clock):
+            return None
+
+        now = self._clock()
+        lateness = now - deadline
+        self.stats.add(lateness)
+        if lateness > self.interval:
+            # a stall (e.g. system suspend) longer than a beat: start over
+            # from now instead of firing the missed beats in a burst
+            self._origin = now
+            self._index = 1
+            self.resyncs += 1
+        else:
+            self._index += 1
+        return lateness
@@ -0,0 +1,84 @@
+import unicodedata
+
+# Polish alphabet order; q, v and x only appear in loanwords
+ALPHABET = 'aąbcćdeęfghijklłmnńoópqrsśtuvwxyzźż'
+
+_SPACE = 0x0001
+_SYMBOLS = 0x0020
+_DIGITS = 0x1000
+_LETTERS = 0x2000
+_OTHER_LETTERS = 0x3000
+_MAX_WEIGHT = 0xD7FF  # stay below surrogates so UTF-16 bytes keep code point order
+
+_LETTER_WEIGHTS = {letter: _LETTERS + 4 * i for i, letter in enumerate(ALPHABET)}
+
+
+def _primary(char):
+    """Alphabet weight: decides order before accents and case are looked at."""
+    weights = []
+    for c in char.lower():
+        if c in _LETTER_WEIGHTS:
+            weights.append(_LETTER_WEIGHTS[c])
+            continue
+
+        decomposed = unicodedata.normalize('NFD', c)
+        base = decomposed[0]
+        if unicodedata.combining(base):
+            continue  # lone combining mark, only matters at the accent level
+        if base in _LETTER_WEIGHTS:
+            weights.append(_LETTER_WEIGHTS[base])
+        elif base.isspace():
+            weights.append(_SPACE)
+        elif base.isdigit() and unicodedata.digit(base, None) is not None:
+            weights.append(_DIGITS + unicodedata.digit(base))
+        elif base.isalpha():
+            weights.append(min(_OTHER_LETTERS + ord(base), _MAX_WEIGHT))
+        else:
+            weights.append(min(_SYMBOLS + ord(base), _DIGITS - 1))
+    return ''.join(map(chr, weights))
+
+
+def _secondary(char):
+    """Accent weight for letters outside the Polish alphabet (e.g. é, ü)."""
+    weights = []
+    for c in char.lower():
+        marks = unicodedata.normalize('NFD', c)[1:] if c not in _LETTER_WEIGHTS else ''
+        weights.append(2 + ord(marks[0]) % 0x100 if marks else 1)
+    return ''.join(map(chr, weights))
+
+
+def _tertiary(char):
+    """Case weight: lowercase sorts before uppercase."""
+    return ('\x01' if char == char.lower() else '\x02') * len(char.lower())
+
+
+class _WeightTable(dict):
+    """str.translate table that computes and caches weights on first use."""
+
+    def __init__(self, weigh):
+        super().__init__()
+        self._weigh = weigh
+
+    def __missing__(self, codepoint):
+        weight = self[codepoint] = self._weigh(chr(codepoint))
+        return weight
+
+
+_PRIMARY = _WeightTable(_primary)
+_SECONDARY = _WeightTable(_secondary)
+_TERTIARY = _WeightTable(_tertiary)
+
+
+def collation_key(text):
+    """Return a bytes sort key that orders `text` by Polish rules.
+
+    Letters compare by the Polish alphabet (Ł between L and M, Ż last), then
+    accents of foreign letters, then case. Keys are plain bytes, so they can
+    be precomputed once and compared cheaply.
+    """
+    # an empty level sorts before any filled one, so plain ASCII text skips
+    # the accent level and lowercase text skips the case level
+    secondary = '' if text.isascii() else text.translate(_SECONDARY)
+    tertiary = '' if text == text.lower() else text.translate(_TERTIARY)
+    key = '\0'.join((text.translate(_PRIMARY), secondary, tertiary))
+    return key.encode('utf-16-be')
@@ -1,9 +1,200 @@
+from collections import OrderedDict
+from itertools import zip_longest
+from .keys import song_chord_tokens, transpose_song
 from .song_func import get_song
 import re
+import threading
 
-def get_display_lyrics(song_id):
+DISPLAY_CACHE_SIZE = 128
 
-    song = get_song(song_id)
+_CHORD_TOKEN = re.compile(r'\S+')
+_CODE = r'<code>\g<0></code>'
+_NUMBER = re.compile(r'\d+')
+_TAG = re.compile(r'<[^>]+>')
+_CODE_SPLIT = re.compile(r'</?code>')
+_IMG_SRC = re.compile(r'src="([^"]+)"')
+
+# (song_id, renderer, transpose) -> (song, output), least recently used first
+_display_cache = OrderedDict()
+# guards both caches; songs may be rendered ahead on a worker thread (see song_prefetch)
+_cache_lock = threading.Lock()
+
+
+def _cached_display(song, renderer, build, transpose=0):
+    """Return build(song), reusing the output while the song is unchanged.
+
+    Song dicts from the repository are never mutated; song_create, song_edit
+    and remove_song replace or drop them. The cached dict therefore serves as
+    the song's revision: an entry is used only for that same object.
+    """
+    transpose %= 12
+    key = (song.get('id'), renderer, transpose)
+    with _cache_lock:
+        entry = _display_cache.get(key)
+        if entry is not None and entry[0] is song:
+            _display_cache.move_to_end(key)
+            return entry[1]
+
+    output = build(transposed_song(song, transpose) if transpose else song)
+    with _cache_lock:
+        _display_cache[key] = (song, output)
+        _display_cache.move_to_end(key)
+        if len(_display_cache) > DISPLAY_CACHE_SIZE:
+            _display_cache.popitem(last=False)
+    return output
+
+
+def clear_display_cache():
+    with _cache_lock:
+        _display_cache.clear()
+        _chord_token_cache.clear()
+
+
+# song_id -> (song, {section: [(chord line, tokens)]}), least recently used first
+_chord_token_cache = OrderedDict()
+
+
+def _chord_tokens(song):
+    """Tokenize the song's chord lines (chords and intro sections) once per song revision."""
+    key = song.get('id')
+    with _cache_lock:
+        entry = _chord_token_cache.get(key)
+        if entry is not None and entry[0] is song:
+            _chord_token_cache.move_to_end(key)
+            return entry[1]
+
+    tokens = song_chord_tokens(song)
+    with _cache_lock:
+        _chord_token_cache[key] = (song, tokens)
+        _chord_token_cache.move_to_end(key)
+        if len(_chord_token_cache) > DISPLAY_CACHE_SIZE:
+            _chord_token_cache.popitem(last=False)
+    return tokens
+
+
+def transposed_song(song, n):
+    """Return a copy of song with chords (and intro chord lines) moved by n semitones."""
+    return transpose_song(song, n, _chord_tokens(song))
+
+
+def render_lyrics(song, transpose=0):
+    """Return the lyrics of a song dict as plain text with [section] headers."""
+    return _cached_display(song, 'lyrics', _build_lyrics, transpose)
+
+
+def render_chords(song, transpose=0):
+    """Return the chords of a song dict as plain text with [section] headers."""
+    return _cached_display(song, 'chords', _build_chords, transpose)
+
+
+def render_columns(song, transpose=0):
+    """Return [lyrics_text, chords_text] of a song dict, aligned line by line."""
+    return list(_cached_display(song, 'columns', _build_columns, transpose))
+
+
+def render_html(song, transpose=0):
+    """Return a song dict as HTML-like markup (<b>, <code>, <i>, <img>)."""
+    return _cached_display(song, 'html', _build_html, transpose)
+
+
+def render_runs(song, transpose=0):
+    """Return a song dict as tagged text runs for a tk.Text widget (see markup_runs)."""
+    return _cached_display(song, 'runs', _build_runs, transpose)
+
+
+def get_display_lyrics(song_id, transpose=0):
+    return render_lyrics(get_song(song_id), transpose)
+
+
+def get_display_chords(song_id, transpose=0):
+    return render_chords(get_song(song_id), transpose)
+
+
+def get_display_2(song_id, transpose=0):
+    """Return [lyrics_text, chords_text] following the original web logic (plain text)."""
+    return render_columns(get_song(song_id), transpose)
+
+
+def get_display(song_id, transpose=0):
+    return render_html(get_song(song_id), transpose)
+
+
+def get_display_runs(song_id, transpose=0):
+    return render_runs(get_song(song_id), transpose)
+
+
+def markup_runs(display_text):
+    """Turn render_html() markup into (text, tags) runs for a tk.Text widget.
+
+    Every line ends with a newline. Tags: 'chords' (chord line, each chord
+    also tagged 'chord'), 'intro' (interlude chord lines), 'lyrics',
+    'second_voice', 'tab', 'blank' (empty line within a section) and 'gap'
+    (between sections). Chorus lines also carry 'chorus', with their tab
+    indent replaced by four spaces.
+    """
+    runs = []
+    for para in display_text.split('\n\n'):
+        if not para.strip():
+            continue
+        if runs:
+            runs.append(('\n', ('gap',)))
+
+        for line in para.strip().split('\n'):
+            if not line.strip():
+                runs.append(('\n', ('blank',)))
+
+            elif '<b>' in line:
+                text = line.replace('<b>', '').replace('</b>', '')
+                if '<code>' in text:
+                    _chord_runs(runs, text)
+                else:
+                    runs.append((text + '\n', ('intro',)))
+
+            elif '<i>' in line:
+                text = line.replace('<i>', '').replace('</i>', '')
+                runs.append((text + '\n', ('second_voice',)))
+
+            elif '<img' in line:
+                match = _IMG_SRC.search(line)
+                runs.append((f"[Tabulatura: {match.group(1) if match else '?'}]\n", ('tab',)))
+
+            else:
+                text = _TAG.sub('', line)
+                if not text.strip():
+                    continue
+                if text.startswith('\t'):
+                    runs.append(('    ' + text.lstrip('\t') + '\n', ('lyrics', 'chorus')))
+                else:
+                    runs.append((text + '\n', ('lyrics',)))
+
+    return runs
+
+
+def _chord_runs(runs, text):
+    tags = ('chords', 'chorus') if text.startswith('\t') else ('chords',)
+    parts = _CODE_SPLIT.split(text.replace('\t', '    '))
+    for i, part in enumerate(parts):
+        if part:
+            runs.append((part, tags + ('chord',) if i % 2 else tags))
+    runs.append(('\n', tags))
+
+
+def split_columns(display_data, columns=1, lines_per_column=50):
+    """Split render_columns() output into `columns` lists of (lyrics, chords) lines.
+
+    Each column but the last takes lines_per_column lines; the last one
+    takes the rest.
+    """
+    lyrics_lines = display_data[0].split('\n')
+    chords_lines = display_data[1].split('\n')
+    lines = list(zip_longest(lyrics_lines, chords_lines, fillvalue=''))
+
+    split = [lines[i * lines_per_column:(i + 1) * lines_per_column] for i in range(columns - 1)]
+    split.append(lines[(columns - 1) * lines_per_column:])
+    return split
+
+
+def _build_lyrics(song):
     display = ''
 
     lyrics = song['lyrics']
@@ -28,8 +219,7 @@ def get_display_lyrics(song_id):
                 display += '\n\n'
     return display.strip()
 
-def get_display_chords(song_id):
-    song = get_song(song_id)
+def _build_chords(song):
     display = ''
 
     chords = song['chords']
@@ -46,9 +236,7 @@ def get_display_chords(song_id):
                 display += '\n\n'
     return display.strip()
 
-def get_display_2(song_id):
-    """Return [lyrics_text, chords_text] following the original web logic (plain text)."""
-    song = get_song(song_id)
+def _build_columns(song):
     lyrics_output = []
     chords_output = []
 
@@ -122,93 +310,110 @@ def get_display_2(song_id):
     return ['\n'.join(lyrics_output).strip(), '\n'.join(chords_output).rstrip()]
 
 
-def get_display(song_id):
-    song = get_song(song_id)
-    display = ''
-
+def _build_html(song):
     lyrics = song['lyrics']
     chords = song['chords']
     content = song['content']
+    out = []
 
     for section in content:
-        chord_counter = -1
+        kind = section[0]
 
-        if section[0] == 'i':  # interlude / chord lines
-            for line in lyrics.get(section, []):  # assign next chord line from current section
-                # line = re.sub(r'([^\s]+)', r'<code>\1</code>', line)  # optional wrapping
-                display += '\n' + f"<b>{line}</b>"  # add line to display
+        if kind == 'i':  # interlude / chord lines
+            for line in lyrics.get(section, []):
+                out.append(f'\n<b>{line}</b>')
 
-        elif section[0] == 's':  # section with image / tab
-            song_name = song.get('title', 'song')
-            section_match = re.search(r'\d+', section)
+        elif kind == 's':  # section with image / tab
+            song_name = song.get('title', 'song').lower().replace(' ', '_')
+            section_match = _NUMBER.search(section)
             section_number = section_match.group(0) if section_match else '0'
-            song_name = song_name.lower().replace(' ', '_')
-            image_filename = f'static/tab/{song_name}_{section_number}.svg'
-            display += f'\n<img src="{image_filename}" alt="missing tab">'
+            out.append(f'\n<img src="static/tab/{song_name}_{section_number}.svg" alt="missing tab">')
 
-        elif section[0] in ['v', 'c']:  # verse / chorus
-            for i in range(len(lyrics.get(section, []))):
-                lyrics_line = lyrics[section][i]
+        elif kind == 'v' or kind == 'c':  # verse / chorus
+            indent = '\t' if kind == 'c' else ''
+            section_base = section if section in chords else section.rstrip('0123456789')
+            section_chords = chords.get(section_base) or ()
+            last_chord = len(section_chords) - 1
+            chord_counter = -1
 
+            for lyrics_line in lyrics.get(section, []):
                 if lyrics_line == '' or lyrics_line[0] == '!':  # skip empty lines
-                    display += '\n'
+                    out.append('\n')
 
-                elif lyrics_line[0] == '(':  # skip 2nd voice
-                    lyrics_line = lyrics_line.replace('|', '')
-                    display += '\n' + f"<i>{lyrics_line}</i>"
+                elif lyrics_line[0] == '(':  # 2nd voice
+                    out.append(f"\n<i>{lyrics_line.replace('|', '')}</i>")
 
                 else:
-                    section_base = section
-                    if section_base not in chords:  # if section not in chords use base section
-                        section_base = section_base.rstrip('0123456789')
-
-                    if section_base in chords and len(chords[section_base]) > 0:
-                        if chord_counter < len(chords[section_base]) - 1:  # if all chords used, start over
+                    text = lyrics_line.replace('|', '')
+                    if section_chords:
+                        if chord_counter < last_chord:  # the last chord line repeats
                             chord_counter += 1
+                        chord_line = section_chords[chord_counter]
+                        if len(text) == len(lyrics_line):  # no '|' markers
+                            chord_line = _code_tags(chord_line)
+                        else:
+                            chord_line = _html_chord_line(chord_line, lyrics_line)
+                        out.append(f"\n<b>{indent}{chord_line}</b>\n{indent}{text}")
+                    else:
+                        out.append(f"\n{indent}{text}")
 
-                        chord_line = chords[section_base][chord_counter]
-                        chord_line = chords_to_scheme(chord_line, lyrics_line)
-                        chord_line = re.sub(r'([^\s]+)', r'<code>\1</code>', chord_line)
+        out.append('\n')
 
-                        if section[0] == 'c':
-                            display += '\n' + f"<b>\t{chord_line}</b>"
-                        else:
-                            display += '\n' + f"<b>{chord_line}</b>"
+    return ''.join(out).strip()
 
-                    if section[0] == 'c':
-                        display += '\n' + '\t' + lyrics_line.replace('|', '')
-                    else:
-                        display += '\n' + lyrics_line.replace('|', '')
 
-        display += "\n"
+def _build_runs(song):
+    return markup_runs(_build_html(song))
+
+
+def _html_chord_line(chord_line, lyrics_line):
+    """chords_to_scheme() with every chord wrapped in <code> tags, in one pass."""
+    if '|' not in lyrics_line:
+        return _code_tags(chord_line)
+    if not chord_line.isprintable():
+        return _code_tags(chords_to_scheme(chord_line, lyrics_line))
+    return _align(chord_line, lyrics_line, '<code>', '</code>')
+
+
+def _code_tags(chord_line):
+    """Wrap every chord of a chord line in <code> tags, keeping the spacing."""
+    if not chord_line.isprintable():  # tabs or other unusual whitespace
+        return _CHORD_TOKEN.sub(_CODE, chord_line)
+    if chord_line and chord_line[0] != ' ' and chord_line[-1] != ' ' and '  ' not in chord_line:
+        return f"<code>{chord_line.replace(' ', '</code> <code>')}</code>"
+    return ' '.join([f'<code>{chord}</code>' if chord else '' for chord in chord_line.split(' ')])
 
-    return display.strip()
 
 def chords_to_scheme(chord_line, lyrics_line):
-    scheme_line = ''.join(' ' if char != '|' else '|' for char in lyrics_line)
-    if '|' not in scheme_line:
+    """Place chords over the '|' markers of lyrics_line.
+
+    Each chord starts at its marker's column; a chord wider than the text up
+    to the next marker pushes the following ones right. Chords beyond the
+    markers are appended, and markers beyond the chords reuse them cyclically.
+    """
+    if '|' not in lyrics_line:
         return chord_line
-    
-    chords_split = chord_line.split(' ')
-    chord_line = ''
+    return _align(chord_line, lyrics_line)
 
-    too_right = 0
-    chord_counter = 0
 
-    for c in scheme_line:
-        if c == ' ':
-            if too_right > 0:
-                too_right -= 1
-            else:
-                chord_line += ' '
-        elif c == '|':
-            chord = chords_split[chord_counter % len(chords_split)]
-            chord_line += chord + ' '
-            too_right += len(chord) + 1
-            chord_counter += 1
-    
-    while chord_counter < len(chords_split):
-        chord_line += chords_split[chord_counter] + ' '
-        chord_counter += 1
-        
-    return chord_line
\ No newline at end of file
+def _align(chord_line, lyrics_line, open_tag='', close_tag=''):
+    segments = lyrics_line.split('|')
+    chords_split = chord_line.split(' ')
+    chord_count = len(chords_split)
+    out = [' ' * len(segments[0])]
+    too_right = 0  # columns the previous chords overhang the lyrics
+
+    i = 0
+    for segment in segments[1:]:
+        chord = chords_split[i % chord_count]
+        i += 1
+        out.append(f'{open_tag}{chord}{close_tag} ' if chord else ' ')
+        too_right += len(chord) + 1 - len(segment)
+        if too_right < 0:
+            out.append(' ' * -too_right)
+            too_right = 0
+
+    for chord in chords_split[i:]:
+        out.append(f'{open_tag}{chord}{close_tag} ' if chord else ' ')
+
+    return ''.join(out)
@@ -1,6 +1,12 @@
 import re
 import json
 
+_SECTION_HEADER = re.compile(r"\[[A-Za-z0-9 ]*\]")
+# same lines as ^((\s?)*[CDEFGAHB](#|b)?(m?)([maj|sus|dim]?([1-9]?)*(\/[CDEFGAHB](#|b)?(m?))?)*(\s?)*)*$
+# without the nested quantifiers that backtrack exponentially on lyrics
+_CHORD_LINE = re.compile(r"(?:(?:\s*[CDEFGAHB](?:#|b)?(?:[majsudi|1-9]|/[CDEFGAHB](?:#|b)?)*)+\s*)?$")
+_BLANK_RUN = re.compile(r'(\n\s*){3,}')
+
 def song_data_jsonify_auto(song_data, song_id):
     song_dict = {
         'id': song_id,
@@ -25,8 +31,7 @@ def song_data_jsonify_auto(song_data, song_id):
         song_dict['tags'] = string_to_list(song_dict['tags'])
 
     text = song_data.get('lyrics', '')
-    text = split_into_sections(text)
-    text = redefine_sections(text)
+    text = parse_sections(text)
     text = name_sections(text)
     text = del_repetitions(text)
 
@@ -121,79 +126,114 @@ def song_data_jsonify(song_data, song_id):
 
     return song_dict
 
+def parse_sections(text):
+    """Split song text into sections with lyrics and chords in a single pass.
+
+    Gives the same result as redefine_sections(split_into_sections(text)).
+    """
+    sections = []
+    section = None
+
+    for line, is_header in _section_lines(text):
+        if is_header:
+            section = {"section": (line[1:-1].strip() + " ")[0], "content": [], "chords": [], "lyrics": []}
+            sections.append(section)
+            continue
+        if section is None:
+            section = {"section": " ", "content": [], "chords": [], "lyrics": []}
+            sections.append(section)
+
+        section["content"].append(line)
+        _add_line(section, line)
+
+    return _finish_sections([section for section in sections if section["content"]])
+
 def split_into_sections(text):
-    p_section = r"\[[A-Za-z0-9 ]*\]"
     text_split = []
-    
-    if '[' not in text or ']' not in text: 
-        text = re.sub(r'(\n\s*){3,}', '\n[]\n', text)
-
-    text_lines = text.splitlines()
-
-    for line in text_lines:
-        if line.strip() != "":
-            line = re.sub(r'\s+', ' ', line).strip()
-            if re.match(p_section, line):
-                section = line[1:-1].strip() + " "
-                text_split.append({"section": section[0], "content": []})
-            else:
-                if not text_split:
-                    text_split.append({"section": " ", "content": []})
-                text_split[-1]["content"].append(line.strip())
+
+    for line, is_header in _section_lines(text):
+        if is_header:
+            section = line[1:-1].strip() + " "
+            text_split.append({"section": section[0], "content": []})
+        else:
+            if not text_split:
+                text_split.append({"section": " ", "content": []})
+            text_split[-1]["content"].append(line)
 
     text_split = [section for section in text_split if section["content"]]
 
     return text_split
 
 def redefine_sections(text):
-    p_chord = r"^((\s?)*[CDEFGAHB](#|b)?(m?)([maj|sus|dim]?([1-9]?)*(\/[CDEFGAHB](#|b)?(m?))?)*(\s?)*)*$"
-
     for section in text:
         section['chords'] = []
         section['lyrics'] = []
 
-        for i in range(len(section["content"])):
-            line = section["content"][i]
-            if re.match(p_chord, section["content"][i]):
-                while len(section['chords']) < len(section['lyrics']):
-                    section['chords'].append("")
-                section['chords'].append(line)
-            else:
-                section['lyrics'].append(line)
-        
+        for line in section["content"]:
+            _add_line(section, line)
+
+    return _finish_sections(text)
+
+def _section_lines(text):
+    """Yield (line, is_header) for non-empty lines with whitespace collapsed."""
+    if '[' not in text or ']' not in text:
+        text = _BLANK_RUN.sub('\n[]\n', text)
+
+    for line in text.splitlines():
+        line = ' '.join(line.split())
+        if line:
+            yield line, line[0] == '[' and _SECTION_HEADER.match(line) is not None
+
+def is_chord_line(line):
+    """Tell whether a line holds only chords (an empty line counts as one)."""
+    return _CHORD_LINE.match(line) is not None
+
+
+def _add_line(section, line):
+    if _CHORD_LINE.match(line):
+        chords = section['chords']
+        missing = len(section['lyrics']) - len(chords)
+        if missing > 0:
+            chords.extend([""] * missing)
+        chords.append(line)
+    else:
+        section['lyrics'].append(line)
+
+def _finish_sections(text):
+    # sections with chords only keep them as their lyrics; empty ones are dropped
     for section in text:
-        if section['lyrics'] == []:
-            if section['chords'] == []:
-                text.remove(section)
-            else:
-                section['lyrics'] = section['chords']
-                section['chords'] = []
+        if section['lyrics'] == [] and section['chords'] != []:
+            section['lyrics'] = section['chords']
+            section['chords'] = []
 
+    text[:] = [section for section in text if section['lyrics'] != []]
     return text
 
 def name_sections(text):
-    for section in text:
+    # earlier sections are looked up by their lyrics and chords instead of
+    # compared one by one, so naming stays linear in the number of sections
+    first_with_text = {}
+    for index, section in enumerate(text):
         section['section'] = section['section'].lower()
         if section['section'] != 'v' and section['section'] != 'c' and section['section'] != 'i' and section['section'] != 's':
             if section['chords'] == []:
                 section['section'] = 'i'
             else:
                 section['section'] = 'v'
-        for section_2 in text:
-            if section == section_2:
-                break
-            if section['lyrics'] == section_2['lyrics'] and section['chords'] == section_2['chords']:
-                section_2['section'] = 'c'
-                section['section'] = 'c'
-                break
-                
+
+        key = (tuple(section['lyrics']), tuple(section['chords']))
+        first = first_with_text.setdefault(key, index)
+        # a repeated section (same lyrics and chords) is a chorus, unless it
+        # is identical to the first one in every field
+        if first != index and text[first] != section:
+            text[first]['section'] = 'c'
+            section['section'] = 'c'
 
     sect = ['', 'a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i', 'j', 'k', 'l', 'm', 'n', 'o', 'p', 'q', 'r', 's', 't', 'u', 'v', 'w', 'x', 'y', 'z']
     section_counts = {}
-    skip_nember = False
-    
+    name_for_chords = {}
+
     for section in text:
-        skip_nember = False
         i = 0
 
         while i < len(sect) and  f"{section['section']}{sect[i]}" in section_counts:
@@ -201,24 +241,19 @@ def name_sections(text):
 
         section['section'] = f"{section['section']}{sect[i]}"
 
-        for section_2 in text:
-            if section == section_2:
-                break
-            if section['chords'] == section_2['chords']:
-                section['section'] = section_2['section']
-                break
-            if section['lyrics'] == section_2['lyrics'] and section['chords'] == section_2['chords']:
-                section['section'] = section_2['section']
-                skip_nember = True
-                break
-        
-        if not skip_nember:
-            if section['section'] in section_counts:
-                section_counts[section['section']] += 1
-                section['section'] = f"{section['section']}{section_counts[section['section']]}"
-            else:
-                section_counts[section['section']] = 0
-                
+        # sections with the same chords as an earlier one share its name
+        chords = tuple(section['chords'])
+        if chords in name_for_chords:
+            section['section'] = name_for_chords[chords]
+
+        if section['section'] in section_counts:
+            section_counts[section['section']] += 1
+            section['section'] = f"{section['section']}{section_counts[section['section']]}"
+        else:
+            section_counts[section['section']] = 0
+
+        name_for_chords.setdefault(chords, section['section'])
+
     return text
 
 def string_to_list(string):
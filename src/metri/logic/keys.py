@@ -1,51 +1,213 @@
 import re
+from functools import lru_cache
+
+from .jsonify_func import is_chord_line
+
+INTERVALS = {
+    'C':0, 'C#':1, 'Db':1, 'D':2, 'D#':3, 'Eb':3,
+    'E':4, 'Fb':4, 'E#':5, 'F':5, 'F#':6, 'Gb':6,
+    'G':7, 'G#':8 ,'Ab':8, 'A':9, 'A#':10, 'Bb':10,
+    'B':11, 'Cb':11, 'B#':0
+}
+
+# usual name of the key on each pitch class
+MAJOR_KEYS = ['C', 'Db', 'D', 'Eb', 'E', 'F', 'F#', 'G', 'Ab', 'A', 'Bb', 'B']
+MINOR_KEYS = ['Cm', 'C#m', 'Dm', 'Ebm', 'Em', 'Fm', 'F#m', 'Gm', 'G#m', 'Am', 'Bbm', 'Bm']
+
+SHARP_SCALE = ['C','C#','D','D#','E','F','F#','G','G#','A','A#','B']
+FLAT_SCALE  = ['C','Db','D','Eb','E','F','Gb','G','Ab','A','Bb','B']
+
+FLAT_KEYS = frozenset([
+    "F", "Bb", "Eb", "Ab", "Db", "Gb", "Cb",
+    "Dm", "Gm", "Cm", "Fm", "Bbm", "Ebm", "Abm",
+])
+
+
+# root with optional accidental, then the rest of the chord up to a space
+_CHORD = re.compile(r"\b([A-G](?:#|b)?)([^ \n]*)")
+_BASS = re.compile(r"/([A-G](?:#|b)?)")
+
 
 def transpose(line, key, n):
     if key == '':
         key = 'C'
 
-    interval = {
-        'C':0, 'C#':1, 'Db':1, 'D':2, 'D#':3, 'Eb':3,
-        'E':4, 'Fb':4, 'E#':5, 'F':5, 'F#':6, 'Gb':6,
-        'G':7, 'G#':8 ,'Ab':8, 'A':9, 'A#':10, 'Bb':10,
-        'B':11, 'Cb':11, 'B#':0
+    int_key = INTERVALS.get(key.rstrip("m"))  # strip "m" for minor root
+    if int_key is None:
+        raise ValueError(f"Unknown key: {key}")
+
+    # the bass note is part of the suffix here and stays as written
+    return spell_chord_line(line, parse_chord_line(line), n - int_key, get_key_table(key), bass=False)
+
+
+@lru_cache(maxsize=4096)
+def parse_chord_line(line):
+    """Parse a chord line once into a tuple of chord tokens.
+
+    Each token is (start, end, root, accidental, suffix, quality, bass, tail):
+    the chord's columns in `line`, the root's pitch class and accidental
+    ('', '#' or 'b'), everything after the root, and that suffix split
+    around a bass note ("m7/G" -> quality "m7", bass 7, tail ""). bass is
+    None when the chord has no bass note.
+    """
+    tokens = []
+    for match in _CHORD.finditer(line):
+        root, suffix = match.groups()
+        bass_match = _BASS.search(suffix)
+        if bass_match:
+            quality = suffix[:bass_match.start()]
+            bass = INTERVALS[bass_match.group(1)]
+            tail = suffix[bass_match.end():]
+        else:
+            quality, bass, tail = suffix, None, ''
+        tokens.append((match.start(), match.end(), INTERVALS[root], root[1:], suffix, quality, bass, tail))
+    return tuple(tokens)
+
+
+def spell_chord_line(line, tokens, n, table=None, bass=True):
+    """Rebuild `line` from its parse_chord_line() tokens, moved by n semitones.
+
+    Notes are spelled from `table` (see get_key_table); without one, each
+    chord keeps the kind of accidental it was written with. With bass=False
+    bass notes are copied unchanged.
+    """
+    out = []
+    pos = 0
+    for start, end, root, accidental, suffix, quality, bass_note, tail in tokens:
+        names = table or (FLAT_SCALE if accidental == 'b' else SHARP_SCALE)
+        out.append(line[pos:start])
+        if bass and bass_note is not None:
+            out.append(f'{names[(root + n) % 12]}{quality}/{names[(bass_note + n) % 12]}{tail}')
+        else:
+            out.append(names[(root + n) % 12] + suffix)
+        pos = end
+    out.append(line[pos:])
+    return ''.join(out)
+
+
+def song_chord_tokens(song):
+    """Tokenize a song's chord lines: its chords and its intro ('i') sections.
+
+    'i' is also given to sections without chords, so intro lines that are
+    not chord lines (lyrics) get no tokens and are never transposed.
+    Returns {'chords': {section: [(line, tokens)]}, 'intro': {...}}.
+    """
+    lyrics = song.get('lyrics', {})
+    return {
+        'chords': {section: [(line, parse_chord_line(line)) for line in lines]
+                   for section, lines in song.get('chords', {}).items()},
+        'intro': {section: [(line, parse_chord_line(line) if is_chord_line(line) else ()) for line in lines]
+                  for section, lines in lyrics.items() if section[:1] == 'i'},
+    }
+
+
+def transpose_song(song, n, tokens=None):
+    """Return a copy of `song` with its chords and intro chord lines moved by n semitones.
+
+    Lyrics and capo stay as they are and a known key is renamed to match.
+    Notes are spelled for the new key; without a known key each chord keeps
+    its own kind of accidental. `tokens` may be a cached song_chord_tokens().
+    """
+    if tokens is None:
+        tokens = song_chord_tokens(song)
+    key = song.get('key', '')
+    table = key_spelling(key, n)
+
+    lyrics = dict(song.get('lyrics', {}))
+    for section, lines in tokens['intro'].items():
+        lyrics[section] = [spell_chord_line(line, line_tokens, n, table) for line, line_tokens in lines]
+    chords = {
+        section: [spell_chord_line(line, line_tokens, n, table) for line, line_tokens in lines]
+        for section, lines in tokens['chords'].items()
     }
+    song = dict(song, lyrics=lyrics, chords=chords)
+    if table is not None:
+        song['key'] = transposed_key(key, n)
+    return song
+
+
+def transpose_songbook(songs, semitones=None, target_key=None, save=False):
+    """Transpose many songs in one call and return the new song dicts.
+
+    Give either `semitones` (the same shift for every song) or `target_key`.
+    With a target key each song is moved so that it sounds in that key
+    (see sounding_key, also used by get_objective_key); songs without a
+    known key are returned unchanged.
+    With save=True the results replace the matching songs of the songbook
+    in a single save_songs() call.
+    """
+    if (semitones is None) == (target_key is None):
+        raise ValueError("Give either semitones or target_key")
+    if target_key is not None:
+        int_target = INTERVALS.get(target_key.rstrip("m"))
+        if int_target is None:
+            raise ValueError(f"Unknown key: {target_key}")
+
+    result = []
+    for song in songs:
+        if target_key is None:
+            n = semitones
+        else:
+            int_key = INTERVALS.get(song.get('key', '').rstrip("m")) if song.get('key') else None
+            if int_key is None:
+                result.append(song)
+                continue
+            sounding = INTERVALS[sounding_key(song['key'], _capo(song)).rstrip("m")]
+            n = (int_target - sounding) % 12
+            if n > 6:
+                n -= 12  # prefer the smaller move
+        result.append(transpose_song(song, n) if n % 12 else song)
+
+    if save:
+        from .song_func import load_songs, save_songs
+        transposed = {song['id']: song for song in result}
+        save_songs([transposed.get(song['id'], song) for song in load_songs()])
+    return result
+
+
+def _capo(song):
+    try:
+        return int(song.get('capo', 0))
+    except (ValueError, TypeError):
+        return 0
 
-    int_key = interval.get(key.rstrip("m"))  # strip "m" for minor root
+
+def sounding_key(key, capo=0):
+    """Return the key a song sounds in: the written key raised by the capo, e.g. ('G', 2) -> 'A'."""
+    return transposed_key(key, capo)
+
+
+def key_spelling(key, n=0):
+    """Return the note names of `key` moved by n semitones, or None if the key is unknown."""
+    if not key:
+        return None
+    int_key = INTERVALS.get(key.rstrip("m"))
     if int_key is None:
-        raise ValueError(f"Unknown key: {key}")
+        return None
+    spelling = MINOR_SPELLING if key.endswith('m') else MAJOR_SPELLING
+    return spelling[(int_key + n) % 12]
 
-    key_table = get_key_table(key)
 
-    def t_match(match):
-        chord = match.group(1)
-        suffix = match.group(2)
+def transposed_key(key, n):
+    """Return the name of `key` moved by n semitones, e.g. ('G', 2) -> 'A'."""
+    if key == '':
+        key = 'C'
 
-        if chord in interval:
-            int_chord = interval[chord]
-            new_int = (int_chord - int_key + n) % 12
-            new_chord = key_table[new_int]
-            return new_chord + suffix
-        return match.group(0)
+    int_key = INTERVALS.get(key.rstrip("m"))
+    if int_key is None:
+        raise ValueError(f"Unknown key: {key}")
 
-    pattern = r"\b([A-G](?:#|b)?)([^ \n]*)"
-    return re.sub(pattern, t_match, line)
+    names = MINOR_KEYS if key.endswith('m') else MAJOR_KEYS
+    return names[(int_key + n) % 12]
 
 
 def get_key_table(key):
     """Return a 12-note chromatic scale spelled according to the key signature."""
-    major_sharp_keys = ["C", "G", "D", "A", "E", "B", "F#", "C#"]
-    major_flat_keys  = ["F", "Bb", "Eb", "Ab", "Db", "Gb", "Cb"]
-
-    minor_sharp_keys = ["Am", "Em", "Bm", "F#m", "C#m", "G#m", "D#m", "A#m"]
-    minor_flat_keys  = ["Dm", "Gm", "Cm", "Fm", "Bbm", "Ebm", "Abm"]
-
-    sharp_scale = ['C','C#','D','D#','E','F','F#','G','G#','A','A#','B']
-    flat_scale  = ['C','Db','D','Eb','E','F','Gb','G','Ab','A','Bb','B']
+    if key in FLAT_KEYS:
+        return FLAT_SCALE
+    return SHARP_SCALE  # sharp keys and unknown keys
 
-    if key in major_sharp_keys or key in minor_sharp_keys:
-        return sharp_scale
-    if key in major_flat_keys or key in minor_flat_keys:
-        return flat_scale
 
-    return sharp_scale  # default to sharps
\ No newline at end of file
+# SPELLING[key pitch class][pitch class] -> note name in that key
+MAJOR_SPELLING = [get_key_table(name) for name in MAJOR_KEYS]
+MINOR_SPELLING = [get_key_table(name) for name in MINOR_KEYS]
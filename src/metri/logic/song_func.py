@@ -1,8 +1,21 @@
 from .jsonify_func import song_data_jsonify, song_data_jsonify_auto
-from .keys import transpose
-import json
+from .keys import sounding_key
+from .song_repository import SongRepository
+from .song_snapshot import BinaryStorage
+from .song_sqlite import SqliteSongStore
+from .song_storage import JsonStorage, JournalStorage
 import os
 
+STORAGE_BACKENDS = {
+    'json': lambda path: SongRepository(storage=JsonStorage(path)),
+    'journal': lambda path: SongRepository(storage=JournalStorage(path)),
+    'sqlite': SqliteSongStore.from_json_path,
+    'binary': lambda path: SongRepository(storage=BinaryStorage(path)),
+}
+
+_storage_mode = 'json'
+_repository = None
+
 
 def get_objective_key(song_id):
     song = get_song(song_id)
@@ -22,79 +35,30 @@ def get_objective_key(song_id):
     except (ValueError, TypeError):
         pass
     
-    key = transpose(key, key, capo)
-    return key
+    return sounding_key(key, capo)
 
 
 def filter_songs(search_args):
     """Filter and sort songs based on search arguments."""
-    songs = load_songs()
-    filtered_songs = songs.copy()
-    
-    if not search_args:
-        return filtered_songs
-    
-    if 'search' in search_args and search_args['search']:
-        search_term = search_args['search'].lower()
-        filtered_songs = [
-            song for song in filtered_songs 
-            if (search_term in song.get('title', '').lower() or
-                search_term in song.get('artist', '').lower() or
-                search_term in song.get('group', '').lower())
-        ]
-
-    if 'language' in search_args and search_args['language']:
-        # Zmienna language przechowuje język wybrany z filtra, np. "polski"
-        language_filter = search_args['language'].lower()
-
-        filtered_songs = [
-            song for song in filtered_songs
-            # POPRAWKA: Użycie == zamiast in dla dokładnego dopasowania
-            if song.get('language', '').lower() == language_filter
-        ]
-    
-    if 'tags' in search_args and search_args['tags']:
-        if isinstance(search_args['tags'], list):
-            tags = [tag.lower() for tag in search_args['tags']]
-        else:
-            tags = [search_args['tags'].lower()]
-            
-        filtered_songs = [
-            song for song in filtered_songs
-            if any(tag in [t.lower() for t in song.get('tags', [])] for tag in tags)
-        ]
-    
-    sort_field = search_args.get('filter_by', 'title')
-    if 'sort_by' in search_args:
-        sort_field = search_args['sort_by']
-    
-    if sort_field == 'title':
-        filtered_songs.sort(key=lambda x: x.get('title', '').lower())
-    elif sort_field == 'artist':
-        filtered_songs.sort(key=lambda x: x.get('artist', '').lower())
-    elif sort_field == 'group':
-        filtered_songs.sort(key=lambda x: x.get('group', '').lower())
-    elif sort_field == 'language':
-        filtered_songs.sort(key=lambda x: x.get('language', '').lower())
-    elif sort_field == 'id':
-        filtered_songs.sort(key=lambda x: x['id'])
-    
-    if 'order' in search_args and search_args['order'] == 'desc':
-        filtered_songs.reverse()
-    
-    return filtered_songs
+    return get_repository().filter(search_args)
+
+
+def iter_filtered_songs(search_args, offset=0, limit=None):
+    """Yield filter_songs() results lazily, starting at `offset`, at most `limit`."""
+    return get_repository().iter_filter(search_args, offset, limit)
 
 
 def get_tags():
-    songs = load_songs()
-    tags = set()
-    
-    for song in songs:
-        if 'tags' in song:
-            for tag in song['tags']:
-                tags.add(tag.lower())
-    
-    return sorted(tags)
+    return get_repository().tags()
+
+
+def get_tag_counts():
+    """Return {tag: number of songs}, e.g. for labels like "rock (124)"."""
+    return get_repository().tag_counts()
+
+
+def get_language_counts():
+    return get_repository().language_counts()
 
 
 def get_songs_path():
@@ -104,37 +68,56 @@ def get_songs_path():
     return songs_path
 
 
-def load_songs():
+def get_repository():
+    """Return the process-wide song repository for the current songs file."""
+    global _repository
     songs_path = get_songs_path()
-    if os.path.exists(songs_path):
-        with open(songs_path, 'r', encoding='utf-8') as f:
-            songs = json.load(f)
-            return [song for song in songs if song is not None]
-    return []
+    if _repository is None or _repository.path != songs_path:
+        _repository = STORAGE_BACKENDS[_storage_mode](songs_path)
+    return _repository
+
+
+def set_storage_mode(mode):
+    """Choose how songs are persisted: 'json' rewrites songs.json on every
+    change, 'journal' appends changes to songs.json.journal and compacts
+    them into songs.json periodically, 'sqlite' imports songs.json once into
+    songs.sqlite3 and keeps the songbook there, 'binary' does the same with
+    a songs.bin snapshot whose lyrics are only decoded when a song is opened."""
+    global _storage_mode, _repository
+    if mode not in STORAGE_BACKENDS:
+        raise ValueError(f"Unknown storage mode: {mode}")
+
+    if _repository is not None:
+        _repository.flush()
+    _storage_mode = mode
+    _repository = None
+
+
+def flush_songs():
+    """Write pending journal entries into songs.json (e.g. on exit)."""
+    if _repository is not None:
+        _repository.flush()
+
+
+def load_songs():
+    return list(get_repository().songs())
 
 
 def save_songs(songs):
-    songs_path = get_songs_path()
-    valid_songs = [song for song in songs if song is not None]
-    os.makedirs(os.path.dirname(songs_path), exist_ok=True)
-    with open(songs_path, 'w', encoding='utf-8') as f:
-        json.dump(valid_songs, f, indent=4, ensure_ascii=False)
+    get_repository().save(songs)
 
 
 def get_song(song_id):
-    songs = load_songs()
     try:
         song_id = int(song_id)
-        valid_songs = [song for song in songs if song is not None]
-        song = next((song for song in valid_songs if song['id'] == song_id), None)
-        return song
     except ValueError:
         return None
+    return get_repository().get(song_id)
 
 
 def get_new_song():
-    songs = load_songs()
-    song_id = max((song['id'] for song in songs), default=0) + 1
+    repository = get_repository()
+    song_id = repository.next_id()
     
     song_dict = {
         'id': song_id,
@@ -155,57 +138,47 @@ def get_new_song():
         'display': ''
     }
     
-    songs.append(song_dict)
-    save_songs(songs)
+    repository.upsert(song_dict)
     
     return song_id
 
 
+def upsert_song(song):
+    """Insert a song or replace the stored one with the same id."""
+    get_repository().upsert(song)
+    return song
+
+
+def delete_songs(song_ids):
+    """Remove many songs with a single write; return how many were removed."""
+    return get_repository().delete(int(song_id) for song_id in song_ids)
+
+
 def song_create(song_id, song_data):
-    songs = load_songs()
-    
     song_id = int(song_id)
-    song = next((song for song in songs if song['id'] == song_id), None)
-
-    if song is None:
+    if get_repository().get(song_id) is None:
         return None
 
     song_dict = song_data_jsonify_auto(song_data, song_id)
-    songs[songs.index(song)] = song_dict
-    save_songs(songs)
-    return song_dict
+    return upsert_song(song_dict)
 
 
 def song_edit(song_id, song_data):
-    songs = load_songs()
-    
     song_id = int(song_id)
-    song = next((song for song in songs if song['id'] == song_id), None)
-
-    if song is None:
+    if get_repository().get(song_id) is None:
         return None
 
     song_dict = song_data_jsonify(song_data, song_id)
-    songs[songs.index(song)] = song_dict
-    save_songs(songs)
-    return song_dict
+    return upsert_song(song_dict)
 
 
 def remove_song(song_id):
-    songs = load_songs()
     try:
-        song_id = int(song_id)
-        song = next((song for song in songs if song['id'] == song_id), None)
-        if song is not None:
-            songs.remove(song)
-            save_songs(songs)
-            return True
-        return False
+        return delete_songs([song_id]) > 0
     except ValueError:
         return False
 
 
 def get_songs_by_ids(id_list):
-    songs = load_songs()
     id_set = set(int(i) for i in id_list)
-    return [song for song in songs if song['id'] in id_set]
\ No newline at end of file
+    return [song for song in get_repository().songs() if song['id'] in id_set]
\ No newline at end of file
@@ -0,0 +1,89 @@
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from . import song_func
+from .jsonify_func import song_data_jsonify_auto
+
+
+def bulk_import(paths_or_blobs, workers=None):
+    """Parse many raw songs and add them to the songbook with a single save.
+
+    Each item is a path to a text file (the file name becomes the title),
+    raw song text (str or bytes) or a dict of form fields as passed to
+    song_create(). A str is read as a path only if such a file exists.
+    Parsing runs in a pool of `workers` processes (None means one per CPU,
+    1 parses in this process); ids are assigned afterwards, in input order.
+    Return the list of added songs.
+    """
+    sources = [_song_source(item) for item in paths_or_blobs]
+    if not sources:
+        return []
+
+    if workers == 1 or len(sources) == 1:
+        parsed = [_parse_song(source) for source in sources]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunksize = max(1, len(sources) // (4 * (workers or os.cpu_count() or 1)))
+            parsed = list(executor.map(_parse_song, sources, chunksize=chunksize))
+
+    repository = song_func.get_repository()
+    songs = list(repository.songs())
+    song_id = repository.next_id()
+    for song in parsed:
+        song['id'] = song_id
+        song_id += 1
+
+    song_func.save_songs(songs + parsed)
+    return parsed
+
+
+def _song_source(item):
+    """Turn an input item into a path or a song_data dict (both picklable)."""
+    if isinstance(item, dict):
+        return dict(item)
+    if isinstance(item, bytes):
+        return {'lyrics': item.decode('utf-8-sig')}
+    if isinstance(item, os.PathLike) or os.path.isfile(item):
+        return os.fspath(item)
+    return {'lyrics': item}
+
+
+def _parse_song(source):
+    # runs in worker processes, so it must stay a module-level function
+    if isinstance(source, str):
+        with open(source, 'r', encoding='utf-8-sig') as f:
+            lyrics = f.read()
+        title = os.path.splitext(os.path.basename(source))[0]
+        source = {'title': title, 'lyrics': lyrics}
+    return song_data_jsonify_auto(source, None)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m metri.logic.song_import',
+        description='Import song text files (lyrics with chords) into the songbook.'
+    )
+    parser.add_argument('paths', nargs='+', help='text files, one song per file')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='number of parsing processes (default: one per CPU)')
+    parser.add_argument('--storage', choices=sorted(song_func.STORAGE_BACKENDS),
+                        help='songbook storage mode (default: json)')
+    args = parser.parse_args(argv)
+
+    missing = [path for path in args.paths if not os.path.isfile(path)]
+    if missing:
+        parser.error(f"not a file: {', '.join(missing)}")
+
+    if args.storage:
+        song_func.set_storage_mode(args.storage)
+    songs = bulk_import([os.path.abspath(path) for path in args.paths], workers=args.workers)
+    song_func.flush_songs()
+
+    print(f"Imported {len(songs)} songs into {song_func.get_songs_path()}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
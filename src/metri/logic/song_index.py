@@ -0,0 +1,261 @@
+from bisect import bisect_left
+from collections import OrderedDict
+
+from .collation import collation_key
+
+SEARCH_FIELDS = ('title', 'artist', 'group')
+SORT_FIELDS = ('title', 'artist', 'group', 'language', 'id')
+RESULT_CACHE_SIZE = 64
+
+_EMPTY = frozenset()
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class SongIndex:
+    """Lookup structures over the songbook, kept in sync by SongRepository.
+
+    Title, artist and group are lowercased once and split into trigrams, so
+    a search term resolves to candidate ids by intersecting posting sets
+    instead of lowering and scanning every song on every keystroke. Tags and
+    languages have their own posting sets, which makes facet filters set
+    operations and facet counts a len() call.
+
+    query() remembers recent results per filter signature (LRU). When a
+    search term extends an earlier one with the same facets ("bal" ->
+    "ball"), only the earlier result is re-checked.
+
+    Every sort mode keeps the ids presorted by (key, position), so ordering
+    a result is a walk over that order (or a sort by integer rank for small
+    results) rather than a fresh sort with string keys. Text keys are Polish
+    collation keys, computed once when a song is added or edited.
+    """
+
+    def __init__(self, songs=()):
+        self._text = {}
+        self._trigrams = {}
+        self._song_tags = {}
+        self._tags = {}
+        self._song_language = {}
+        self._languages = {}
+        self._position = {}
+        self._next_position = 0
+        self._results = OrderedDict()
+        self._sort_entries = {}
+        self._orders = {}
+        for song in songs:
+            self.add(song)
+
+    def add(self, song):
+        """Index a new song or re-index an edited one (keeping its position)."""
+        song_id = song['id']
+        self._results.clear()
+        if song_id in self._text:
+            self._unindex(song_id)
+        else:
+            self._position[song_id] = self._next_position
+            self._next_position += 1
+
+        # fields are joined with NUL so a match cannot span two fields
+        text = '\0'.join(song.get(field, '') for field in SEARCH_FIELDS).lower()
+        self._text[song_id] = text
+        for gram in trigrams(text):
+            _post(self._trigrams, gram, song_id)
+
+        tags = {tag.lower() for tag in song.get('tags') or ()}
+        self._song_tags[song_id] = tags
+        for tag in tags:
+            _post(self._tags, tag, song_id)
+
+        language = song.get('language', '').lower()
+        self._song_language[song_id] = language
+        _post(self._languages, language, song_id)
+
+        position = self._position[song_id]
+        entries = {field: (_sort_key(song, field), position, song_id) for field in SORT_FIELDS}
+        entries[None] = (position, position, song_id)
+        self._sort_entries[song_id] = entries
+        for field, order in self._orders.items():
+            order.insert(entries[field])
+
+    def remove(self, song_id):
+        self._results.clear()
+        if song_id in self._text:
+            self._unindex(song_id)
+            del self._position[song_id]
+
+    def _unindex(self, song_id):
+        for gram in trigrams(self._text.pop(song_id)):
+            _unpost(self._trigrams, gram, song_id)
+        for tag in self._song_tags.pop(song_id):
+            _unpost(self._tags, tag, song_id)
+        _unpost(self._languages, self._song_language.pop(song_id), song_id)
+        entries = self._sort_entries.pop(song_id)
+        for field, order in self._orders.items():
+            order.remove(entries[field])
+
+    def search(self, term):
+        """Return ids of songs whose title, artist or group contains `term`."""
+        term = term.lower()
+        if len(term) < 3:
+            return {song_id for song_id, text in self._text.items() if term in text}
+
+        postings = []
+        for gram in trigrams(term):
+            song_ids = self._trigrams.get(gram)
+            if song_ids is None:
+                return set()
+            postings.append(song_ids)
+
+        postings.sort(key=len)
+        candidates = postings[0].intersection(*postings[1:])
+        if len(term) == 3:
+            return candidates
+        # trigrams do not encode their order, so confirm the whole term
+        text = self._text
+        return {song_id for song_id in candidates if term in text[song_id]}
+
+    def query(self, term=None, language=None, tags=None):
+        """Return ids of songs matching all given filters, or None if no
+        filter is set. The returned set is cached and must not be modified."""
+        term = term.lower() if term else ''
+        language = language.lower() if language else ''
+        tags = tuple(sorted({tag.lower() for tag in tags})) if tags else ()
+        if not (term or language or tags):
+            return None
+
+        key = (term, language, tags)
+        song_ids = self._results.get(key)
+        if song_ids is not None:
+            self._results.move_to_end(key)
+            return song_ids
+
+        narrower = self._refinement_base(key)
+        if narrower is not None:
+            text = self._text
+            song_ids = {song_id for song_id in narrower if term in text[song_id]}
+        else:
+            song_ids = self.search(term) if term else None
+            if language:
+                language_ids = self.with_language(language)
+                song_ids = language_ids if song_ids is None else song_ids & language_ids
+            if tags:
+                tag_ids = self.with_any_tag(tags)
+                song_ids = tag_ids if song_ids is None else song_ids & tag_ids
+
+        self._results[key] = song_ids
+        if len(self._results) > RESULT_CACHE_SIZE:
+            self._results.popitem(last=False)
+        return song_ids
+
+    def _refinement_base(self, key):
+        """Find the smallest cached result for a term contained in key's term."""
+        term, language, tags = key
+        if not term:
+            return None
+
+        best = None
+        for (cached_term, cached_language, cached_tags), song_ids in self._results.items():
+            if (cached_term and cached_term in term
+                    and cached_language == language and cached_tags == tags
+                    and (best is None or len(song_ids) < len(best))):
+                best = song_ids
+        return best
+
+    def with_language(self, language):
+        """Return ids of songs in `language` (the set must not be modified)."""
+        return self._languages.get(language.lower(), _EMPTY)
+
+    def with_any_tag(self, tags):
+        """Return ids of songs that have at least one of `tags`."""
+        postings = [self._tags.get(tag.lower(), _EMPTY) for tag in tags]
+        if len(postings) == 1:
+            return postings[0]
+        return set().union(*postings)
+
+    def tag_counts(self):
+        """Return {tag: number of songs} for all lowercased tags."""
+        return {tag: len(song_ids) for tag, song_ids in self._tags.items()}
+
+    def language_counts(self):
+        """Return {language: number of songs}, skipping songs without one."""
+        return {language: len(song_ids) for language, song_ids in self._languages.items() if language}
+
+    def ordered(self, song_ids, field=None, descending=False):
+        """Return an iterable of `song_ids` (None means all songs) sorted by `field`.
+
+        Unknown fields keep the songbook order. Ties are broken by position,
+        and descending order is the exact reverse of ascending order.
+        """
+        if field not in SORT_FIELDS:
+            field = None
+        order = self._orders.get(field)
+        if order is None:
+            order = SortOrder(entries[field] for entries in self._sort_entries.values())
+            self._orders[field] = order
+        return order.select(song_ids, descending)
+
+
+class SortOrder:
+    """Ids sorted by (key, position, id) entries, with a lazily built rank map.
+
+    `ids` is replaced rather than mutated on changes, so a walk started by
+    select() keeps iterating the order it began with.
+    """
+
+    def __init__(self, entries):
+        self.entries = sorted(entries)
+        self.ids = [entry[2] for entry in self.entries]
+        self._ranks = None
+
+    def insert(self, entry):
+        i = bisect_left(self.entries, entry)
+        self.entries.insert(i, entry)
+        self.ids = self.ids[:i] + [entry[2]] + self.ids[i:]
+        self._ranks = None
+
+    def remove(self, entry):
+        i = bisect_left(self.entries, entry)
+        del self.entries[i]
+        self.ids = self.ids[:i] + self.ids[i + 1:]
+        self._ranks = None
+
+    def select(self, song_ids, descending=False):
+        """Return an iterable of the ids from `song_ids` (None means all) in this order.
+
+        Large results are filtered lazily while walking the order.
+        """
+        ids = self.ids
+        if song_ids is None:
+            return reversed(ids) if descending else iter(ids)
+
+        if len(song_ids) * 16 < len(ids):
+            # small result: sorting by integer rank beats walking every id
+            if self._ranks is None:
+                self._ranks = {song_id: rank for rank, song_id in enumerate(ids)}
+            return sorted(song_ids, key=self._ranks.__getitem__, reverse=descending)
+
+        return (song_id for song_id in (reversed(ids) if descending else ids) if song_id in song_ids)
+
+
+def _sort_key(song, field):
+    if field == 'id':
+        return song['id']
+    return collation_key(song.get(field, ''))
+
+
+def _post(postings, key, song_id):
+    song_ids = postings.get(key)
+    if song_ids is None:
+        postings[key] = {song_id}
+    else:
+        song_ids.add(song_id)
+
+
+def _unpost(postings, key, song_id):
+    song_ids = postings[key]
+    song_ids.discard(song_id)
+    if not song_ids:
+        del postings[key]
@@ -0,0 +1,58 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from .display_func import render_columns, render_runs
+
+# display data the song views show: side-by-side columns and the tagged markup
+PREFETCH_RENDERERS = (render_columns, render_runs)
+
+
+def adjacent_songs(songs, song_id, radius=1):
+    """Return the songs around song_id in `songs`, nearest first, next before previous."""
+    index = next((i for i, song in enumerate(songs) if song.get('id') == song_id), None)
+    if index is None:
+        return []
+
+    adjacent = []
+    for distance in range(1, radius + 1):
+        if index + distance < len(songs):
+            adjacent.append(songs[index + distance])
+        if index - distance >= 0:
+            adjacent.append(songs[index - distance])
+    return adjacent
+
+
+class DisplayPrefetcher:
+    """Render songs' display data on a worker thread before they are opened.
+
+    The output lands in the display_func caches, so opening a prefetched
+    song only paints it. Song dicts are looked up by the caller, on its own
+    thread, and only rendered here; a newer prefetch() drops work that has
+    not started yet. Prefetching is best effort, errors are ignored and the
+    song is simply rendered when opened.
+    """
+
+    def __init__(self, renderers=PREFETCH_RENDERERS):
+        self.renderers = renderers
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='song-prefetch')
+        self._pending = []
+
+    def prefetch(self, songs, transpose=0):
+        for future in self._pending:
+            future.cancel()
+        self._pending = [self._executor.submit(self._render, song, transpose) for song in songs]
+
+    def wait(self):
+        """Block until the queued songs are rendered."""
+        for future in self._pending:
+            if not future.cancelled():
+                future.result()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _render(self, song, transpose):
+        for renderer in self.renderers:
+            try:
+                renderer(song, transpose)
+            except Exception:
+                pass
@@ -0,0 +1,189 @@
+from itertools import islice
+
+from .song_index import SongIndex
+from .song_storage import JsonStorage
+
+
+class SongRepository:
+    """In-memory copy of the songbook, indexed by song id.
+
+    The storage is decoded once and re-read only when its mtime or size
+    changes, so repeated lookups cost a stat() call instead of a full JSON
+    decode. Returned song dicts are shared with the cache and must not be
+    mutated.
+    """
+
+    def __init__(self, path=None, storage=None):
+        if storage is None and path is not None:
+            storage = JsonStorage(path)
+        self.storage = storage
+        self.path = storage.path if storage is not None else None
+        self._by_id = {}
+        self._songs = []
+        self._max_id = 0
+        self._index = None
+        self._signature = None
+        self._loaded = False
+
+    @classmethod
+    def from_songs(cls, songs):
+        """Build a repository that is not backed by a file (tests, benchmarks)."""
+        repository = cls()
+        repository._set_songs(songs)
+        repository._loaded = True
+        return repository
+
+    def _set_songs(self, songs):
+        # dict keeps insertion order, so it doubles as the song list
+        self._by_id = {song['id']: song for song in songs if song is not None}
+        self._songs = None
+        self._max_id = None
+        self._index = None
+
+    def refresh(self):
+        """Reload the songbook if the storage changed since it was last read."""
+        if self.storage is None:
+            return
+
+        signature = self.storage.signature()
+        if self._loaded and signature == self._signature:
+            return
+
+        self._set_songs(self.storage.read())
+        self._signature = signature
+        self._loaded = True
+
+    def songs(self):
+        self.refresh()
+        return self._song_list()
+
+    def _song_list(self):
+        if self._songs is None:
+            self._songs = list(self._by_id.values())
+        return self._songs
+
+    def get(self, song_id):
+        self.refresh()
+        return self._by_id.get(song_id)
+
+    def index(self):
+        """Return the search index, building it on first use."""
+        self.refresh()
+        if self._index is None:
+            self._index = SongIndex(self._by_id.values())
+        return self._index
+
+    def filter(self, search_args):
+        """Filter and sort songs based on filter_songs() search arguments."""
+        songs = self.songs()
+    
+        if not search_args:
+            return songs.copy()
+
+        by_id = self._by_id
+        return [by_id[song_id] for song_id in self._ordered_ids(search_args)]
+
+    def iter_filter(self, search_args, offset=0, limit=None):
+        """Yield the songs filter() would return, from `offset`, at most `limit`.
+
+        Songs are produced lazily in sort order, so the first page is ready
+        before the rest of a large result has been ordered. The walk keeps
+        the order it started with; songs deleted meanwhile are skipped.
+        """
+        stop = None if limit is None else offset + limit
+        if not search_args:
+            song_ids = iter([song['id'] for song in self.songs()])
+        else:
+            song_ids = self._ordered_ids(search_args)
+
+        by_id = self._by_id
+        for song_id in islice(song_ids, offset, stop):
+            song = by_id.get(song_id)
+            if song is not None:
+                yield song
+
+    def _ordered_ids(self, search_args):
+        tags = search_args.get('tags')
+        if tags and not isinstance(tags, list):
+            tags = [tags]
+
+        # Język porównywany dokładnie (==), nie jako podciąg
+        index = self.index()
+        song_ids = index.query(search_args.get('search'), search_args.get('language'), tags)
+
+        sort_field = search_args.get('filter_by', 'title')
+        if 'sort_by' in search_args:
+            sort_field = search_args['sort_by']
+        descending = search_args.get('order') == 'desc'
+        return index.ordered(song_ids, sort_field, descending)
+
+    def tags(self):
+        """Return all tags, lowercased and sorted."""
+        return sorted(self.index().tag_counts())
+
+    def tag_counts(self):
+        """Return {tag: number of songs}."""
+        return self.index().tag_counts()
+
+    def language_counts(self):
+        """Return {language: number of songs}."""
+        return self.index().language_counts()
+
+    def next_id(self):
+        """Return the id a newly created song should get."""
+        self.refresh()
+        if self._max_id is None:
+            self._max_id = max(self._by_id, default=0)
+        return self._max_id + 1
+
+    def upsert(self, song):
+        """Insert a song or replace the one with the same id, then persist."""
+        self.refresh()
+        song_id = song['id']
+        self._by_id[song_id] = song
+        self._songs = None
+        if self._max_id is not None and song_id > self._max_id:
+            self._max_id = song_id
+        if self._index is not None:
+            self._index.add(song)
+        self._write(upserted=[song])
+
+    def delete(self, song_ids):
+        """Remove songs by id with a single write; return how many were removed."""
+        self.refresh()
+        removed = []
+        for song_id in set(song_ids):
+            if self._by_id.pop(song_id, None) is not None:
+                removed.append(song_id)
+                if self._index is not None:
+                    self._index.remove(song_id)
+                if song_id == self._max_id:
+                    self._max_id = None
+
+        if removed:
+            self._songs = None
+            self._write(deleted=removed)
+        return len(removed)
+
+    def save(self, songs):
+        """Replace the whole songbook and write it back to the file."""
+        self._set_songs(songs)
+        self._loaded = True
+        self._write()
+
+    def flush(self):
+        """Fold any pending journal entries into the snapshot."""
+        if self.storage is None:
+            return
+        self.storage.compact(self._song_list())
+        self._signature = self.storage.signature()
+
+    def _write(self, upserted=None, deleted=None):
+        if self.storage is None:
+            return
+
+        if upserted is None and deleted is None:
+            self.storage.write(self._song_list())
+        else:
+            self.storage.apply(self._song_list(), upserted or (), deleted or ())
+        self._signature = self.storage.signature()
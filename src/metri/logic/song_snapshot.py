@@ -0,0 +1,271 @@
+import json
+import mmap
+import os
+import struct
+import tempfile
+
+from .song_storage import JsonStorage, _stat
+
+MAGIC = b'METRISNP'
+SNAPSHOT_VERSION = 1
+BODY_FIELDS = ('content', 'lyrics', 'chords')
+
+# magic, version, number of songs, length of the metadata block
+_HEADER = struct.Struct('<8sHxxIQ')
+# per song: offset of its body in the body block, body length
+_ENTRY = struct.Struct('<QI')
+
+
+class BinaryStorage:
+    """Songbook stored as a binary snapshot (songs.bin) next to songs.json.
+
+    The file is a struct-packed header and offset table, a JSON block with
+    the metadata of every song, and one JSON body (content, lyrics, chords)
+    per song. Reading decodes the metadata only and memory-maps the rest;
+    each body is decoded when its song is first opened (see LazySong), so
+    loading the song list costs time per song, not per line of lyrics.
+
+    songs.json (and its journal) is imported on first use; after that the
+    snapshot is authoritative and songs.json is no longer written.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.snapshot_path = os.path.splitext(path)[0] + '.bin'
+        self._blobs = None
+
+    def signature(self):
+        return _stat(self.snapshot_path)
+
+    def read(self):
+        if not os.path.exists(self.snapshot_path):
+            songs = JsonStorage(self.path).read()
+            if songs:
+                self.write(songs)
+            return songs
+
+        blobs = self._open()
+        data = blobs.data
+        magic, version, count, meta_length = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError(f"Not a songbook snapshot: {self.snapshot_path}")
+
+        meta_start = _HEADER.size + count * _ENTRY.size
+        body_start = meta_start + meta_length
+        entries = _ENTRY.iter_unpack(data[_HEADER.size:meta_start])
+        metas = json.loads(data[meta_start:body_start])
+
+        if self._blobs is not None:
+            self._blobs.detach()
+        self._blobs = blobs
+        return [
+            LazySong(meta, blobs, body_start + offset, length)
+            for meta, (offset, length) in zip(metas, entries)
+        ]
+
+    def write(self, songs):
+        """Atomically replace the snapshot.
+
+        Bodies of songs that were never opened are copied over as bytes,
+        without decoding them.
+        """
+        metas = []
+        bodies = []
+        for song in songs:
+            if song is None:
+                continue
+            meta, body = _split_song(song)
+            metas.append(meta)
+            bodies.append(body)
+
+        meta_block = json.dumps(metas, ensure_ascii=False).encode('utf-8')
+        offsets = []
+        offset = 0
+        for body in bodies:
+            offsets.append(offset)
+            offset += len(body)
+
+        directory = os.path.dirname(self.snapshot_path)
+        os.makedirs(directory, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.songs-', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_HEADER.pack(MAGIC, SNAPSHOT_VERSION, len(bodies), len(meta_block)))
+                f.write(b''.join(_ENTRY.pack(offset, len(body)) for offset, body in zip(offsets, bodies)))
+                f.write(meta_block)
+                f.writelines(bodies)
+                f.flush()
+                os.fsync(f.fileno())
+            if self._blobs is not None:
+                # songs still pointing at the old file keep working from a
+                # copy; the mapping is closed so the file can be replaced
+                self._blobs.detach()
+            os.replace(tmp_path, self.snapshot_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        # point unopened songs at the new file so the old copy can be freed
+        blobs = self._blobs = self._open()
+        body_start = _HEADER.size + len(bodies) * _ENTRY.size + len(meta_block)
+        songs = [song for song in songs if song is not None]
+        for song, offset in zip(songs, offsets):
+            if isinstance(song, LazySong) and not song.loaded:
+                song._blobs = blobs
+                song._offset = body_start + offset
+
+    def apply(self, songs, upserted=(), deleted=()):
+        self.write(songs)
+
+    def compact(self, songs):
+        pass
+
+    def _open(self):
+        with open(self.snapshot_path, 'rb') as f:
+            return _Blobs(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+class _Blobs:
+    """Memory-mapped snapshot file shared by the songs read from it."""
+
+    def __init__(self, data):
+        self.data = data
+
+    def read(self, offset, length):
+        return self.data[offset:offset + length]
+
+    def detach(self):
+        """Replace the mapping with an in-memory copy and close it."""
+        if isinstance(self.data, mmap.mmap):
+            mapping = self.data
+            self.data = mapping[:]
+            mapping.close()
+
+
+class LazySong(dict):
+    """Song dict whose content, lyrics and chords are decoded on first use.
+
+    Until then those keys hold None in the underlying dict (to keep the key
+    order), and every way of reading their values - item access, get(),
+    items(), comparisons, copying, JSON encoding - decodes the body first.
+    Metadata reads (title, tags, ...) never do.
+    """
+
+    __slots__ = ('_blobs', '_offset', '_length')
+
+    def __init__(self, meta, blobs, offset, length):
+        super().__init__(meta)
+        self._blobs = blobs
+        self._offset = offset
+        self._length = length
+
+    @property
+    def loaded(self):
+        return self._blobs is None
+
+    def _load(self):
+        blobs = self._blobs
+        if blobs is not None:
+            dict.update(self, json.loads(blobs.read(self._offset, self._length)))
+            self._blobs = None
+
+    def raw_body(self):
+        """Return the encoded body of a song that has not been loaded yet."""
+        return self._blobs.read(self._offset, self._length)
+
+    def __getitem__(self, key):
+        if self._blobs is not None and key in BODY_FIELDS:
+            self._load()
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        if self._blobs is not None and key in BODY_FIELDS:
+            self._load()
+        return super().get(key, default)
+
+    def __iter__(self):
+        # overriding __iter__ makes dict(song) and {**song} use __getitem__
+        return super().__iter__()
+
+    def items(self):
+        self._load()
+        return super().items()
+
+    def values(self):
+        self._load()
+        return super().values()
+
+    def copy(self):
+        self._load()
+        return dict(self)
+
+    def __setitem__(self, key, value):
+        self._load()
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._load()
+        super().__delitem__(key)
+
+    def update(self, *args, **kwargs):
+        self._load()
+        super().update(*args, **kwargs)
+
+    def __ior__(self, other):
+        self._load()
+        return super().__ior__(other)
+
+    def __or__(self, other):
+        self._load()
+        return super().__or__(other)
+
+    def pop(self, key, *default):
+        self._load()
+        return super().pop(key, *default)
+
+    def popitem(self):
+        self._load()
+        return super().popitem()
+
+    def setdefault(self, key, default=None):
+        self._load()
+        return super().setdefault(key, default)
+
+    def __eq__(self, other):
+        self._load()
+        if isinstance(other, LazySong):
+            other._load()
+        return super().__eq__(other)
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        self._load()
+        return super().__repr__()
+
+    def __reduce_ex__(self, protocol):
+        # copy, deepcopy and pickle produce a plain dict
+        self._load()
+        return (dict, (dict(self),))
+
+
+def _split_song(song):
+    """Return (metadata with body keys set to None, encoded body)."""
+    if isinstance(song, LazySong) and not song.loaded:
+        return dict(dict.items(song)), song.raw_body()
+
+    meta = {}
+    body = {}
+    for key, value in song.items():
+        if key in BODY_FIELDS:
+            meta[key] = None
+            body[key] = value
+        else:
+            meta[key] = value
+    return meta, json.dumps(body, ensure_ascii=False).encode('utf-8')
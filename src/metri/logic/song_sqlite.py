@@ -0,0 +1,340 @@
+import json
+import os
+import sqlite3
+import tempfile
+
+from .collation import collation_key
+from .song_storage import JsonStorage
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS songs (
+    id INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL,
+    title_lc TEXT NOT NULL,
+    artist_lc TEXT NOT NULL,
+    group_lc TEXT NOT NULL,
+    language_lc TEXT NOT NULL,
+    title_key BLOB NOT NULL,
+    artist_key BLOB NOT NULL,
+    group_key BLOB NOT NULL,
+    language_key BLOB NOT NULL,
+    meta TEXT NOT NULL,
+    lyrics TEXT NOT NULL,
+    chords TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS songs_position ON songs (position);
+CREATE INDEX IF NOT EXISTS songs_language_lc ON songs (language_lc);
+CREATE INDEX IF NOT EXISTS songs_title_key ON songs (title_key, position);
+CREATE INDEX IF NOT EXISTS songs_artist_key ON songs (artist_key, position);
+CREATE INDEX IF NOT EXISTS songs_group_key ON songs (group_key, position);
+CREATE INDEX IF NOT EXISTS songs_language_key ON songs (language_key, position);
+
+CREATE TABLE IF NOT EXISTS song_tags (
+    tag TEXT NOT NULL,
+    song_id INTEGER NOT NULL,
+    PRIMARY KEY (tag, song_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS song_tags_song ON song_tags (song_id);
+"""
+
+KEY_FIELDS = ('title', 'artist', 'group', 'language')
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS songs_fts
+USING fts5(title, artist, grp, lyrics, tokenize='trigram');
+"""
+
+SORT_COLUMNS = {
+    'title': 'title_key',
+    'artist': 'artist_key',
+    'group': 'group_key',
+    'language': 'language_key',
+    'id': 'id',
+}
+
+
+class SqliteSongStore:
+    """Songbook kept in an SQLite database.
+
+    Implements the same interface as SongRepository, so song_func can use
+    either. Metadata used for filtering and sorting lives in indexed columns,
+    tags in their own table and title/artist/group/lyrics in an FTS5 trigram
+    index, so filter() runs as index lookups instead of a scan over every
+    song dict. Lyrics and chords are stored as JSON text. Sorting uses the
+    same Polish collation keys as SongIndex, stored as BLOB columns.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.path = db_path
+        self._conn = sqlite3.connect(db_path)
+        self._conn.executescript(SCHEMA)
+        try:
+            self._conn.executescript(FTS_SCHEMA)
+            self._fts = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5 or the trigram tokenizer
+            self._fts = False
+        self._conn.commit()
+        self._cache = {}
+        self._songs = None
+        self._data_version = self._get_data_version()
+
+    @classmethod
+    def from_json_path(cls, songs_path):
+        """Open the database next to songs.json, importing the JSON on first use.
+
+        After the import the database is authoritative; songs.json is no
+        longer written. The import is built in a temporary file that replaces
+        the database only once complete, so a failed import is retried on
+        the next start instead of leaving an empty songbook behind.
+        """
+        db_path = os.path.splitext(songs_path)[0] + '.sqlite3'
+        if not os.path.exists(db_path):
+            directory = os.path.dirname(db_path) or '.'
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.songs-', suffix='.sqlite3.tmp')
+            os.close(fd)
+            try:
+                store = cls(tmp_path)
+                try:
+                    migrate_json(songs_path, store)
+                finally:
+                    store.close()
+                os.replace(tmp_path, db_path)
+            except BaseException:
+                for path in (tmp_path, tmp_path + '-journal'):
+                    if os.path.exists(path):
+                        os.remove(path)
+                raise
+
+        store = cls(db_path)
+        store.path = songs_path
+        return store
+
+    def _get_data_version(self):
+        return self._conn.execute('PRAGMA data_version').fetchone()[0]
+
+    def refresh(self):
+        """Drop cached songs if another connection modified the database."""
+        data_version = self._get_data_version()
+        if data_version != self._data_version:
+            self._data_version = data_version
+            self._cache = {}
+            self._songs = None
+
+    def _decode(self, row):
+        song_id, meta, lyrics, chords = row
+        song = self._cache.get(song_id)
+        if song is None:
+            song = json.loads(meta)
+            song['lyrics'] = json.loads(lyrics)
+            song['chords'] = json.loads(chords)
+            self._cache[song_id] = song
+        return song
+
+    def songs(self):
+        self.refresh()
+        if self._songs is None:
+            rows = self._conn.execute('SELECT id, meta, lyrics, chords FROM songs ORDER BY position')
+            self._songs = [self._decode(row) for row in rows]
+        return self._songs
+
+    def get(self, song_id):
+        self.refresh()
+        song = self._cache.get(song_id)
+        if song is not None:
+            return song
+        row = self._conn.execute(
+            'SELECT id, meta, lyrics, chords FROM songs WHERE id = ?', (song_id,)
+        ).fetchone()
+        return self._decode(row) if row else None
+
+    def filter(self, search_args):
+        """Filter and sort songs based on filter_songs() search arguments."""
+        if not search_args:
+            return self.songs().copy()
+
+        self.refresh()
+        sql, params = self._filter_query(search_args)
+        return [self._decode(row) for row in self._conn.execute(sql, params)]
+
+    def iter_filter(self, search_args, offset=0, limit=None):
+        """Yield the songs filter() would return, from `offset`, at most `limit`.
+
+        Rows are fetched from the cursor as the caller iterates.
+        """
+        self.refresh()
+        if search_args:
+            sql, params = self._filter_query(search_args)
+        else:
+            sql, params = 'SELECT id, meta, lyrics, chords FROM songs ORDER BY position', []
+        sql += ' LIMIT ? OFFSET ?'
+        params.extend([-1 if limit is None else limit, offset])
+        for row in self._conn.execute(sql, params):
+            yield self._decode(row)
+
+    def _filter_query(self, search_args):
+        where = []
+        params = []
+
+        search_term = search_args.get('search')
+        if search_term:
+            search_term = search_term.lower()
+            if self._fts and len(search_term) >= 3:
+                where.append('id IN (SELECT rowid FROM songs_fts WHERE songs_fts MATCH ?)')
+                params.append('{title artist grp}: "%s"' % search_term.replace('"', '""'))
+            else:
+                # trigram index needs at least three characters
+                where.append('(instr(title_lc, ?) OR instr(artist_lc, ?) OR instr(group_lc, ?))')
+                params.extend([search_term] * 3)
+
+        language = search_args.get('language')
+        if language:
+            where.append('language_lc = ?')
+            params.append(language.lower())
+
+        tags = search_args.get('tags')
+        if tags:
+            if not isinstance(tags, list):
+                tags = [tags]
+            tags = [tag.lower() for tag in tags]
+            where.append('id IN (SELECT song_id FROM song_tags WHERE tag IN (%s))' % ','.join('?' * len(tags)))
+            params.extend(tags)
+
+        sort_field = search_args.get('sort_by', search_args.get('filter_by', 'title'))
+        direction = 'DESC' if search_args.get('order') == 'desc' else 'ASC'
+        order = ['position ' + direction]
+        if sort_field in SORT_COLUMNS:
+            order.insert(0, f'{SORT_COLUMNS[sort_field]} {direction}')
+
+        sql = 'SELECT id, meta, lyrics, chords FROM songs'
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += ' ORDER BY ' + ', '.join(order)
+        return sql, params
+
+    def tags(self):
+        """Return all tags, lowercased and sorted."""
+        return [row[0] for row in self._conn.execute('SELECT DISTINCT tag FROM song_tags ORDER BY tag')]
+
+    def tag_counts(self):
+        """Return {tag: number of songs}."""
+        return dict(self._conn.execute('SELECT tag, count(*) FROM song_tags GROUP BY tag'))
+
+    def language_counts(self):
+        """Return {language: number of songs}."""
+        return dict(self._conn.execute(
+            "SELECT language_lc, count(*) FROM songs WHERE language_lc != '' GROUP BY language_lc"
+        ))
+
+    def search_lyrics(self, term):
+        """Return songs whose lyrics contain `term` (case-insensitive)."""
+        term = term.lower().replace('|', '')
+        if self._fts and len(term) >= 3:
+            sql = ('SELECT id, meta, lyrics, chords FROM songs WHERE id IN '
+                   '(SELECT rowid FROM songs_fts WHERE songs_fts MATCH ?) ORDER BY position')
+            rows = self._conn.execute(sql, ('lyrics: "%s"' % term.replace('"', '""'),))
+            return [self._decode(row) for row in rows]
+        return [song for song in self.songs() if term in _lyrics_text(song).lower()]
+
+    def next_id(self):
+        return (self._conn.execute('SELECT max(id) FROM songs').fetchone()[0] or 0) + 1
+
+    def upsert(self, song):
+        """Insert a song or replace the one with the same id."""
+        with self._conn:
+            row = self._conn.execute('SELECT position FROM songs WHERE id = ?', (song['id'],)).fetchone()
+            if row:
+                position = row[0]
+            else:
+                position = (self._conn.execute('SELECT max(position) FROM songs').fetchone()[0] or 0) + 1
+            self._delete_rows([song['id']])
+            self._insert(song, position)
+        self._after_write()
+
+    def delete(self, song_ids):
+        """Remove songs by id in one transaction; return how many were removed."""
+        song_ids = list(set(song_ids))
+        with self._conn:
+            removed = self._delete_rows(song_ids)
+        if removed:
+            self._after_write()
+        return removed
+
+    def save(self, songs):
+        """Replace the whole songbook."""
+        with self._conn:
+            self._conn.execute('DELETE FROM songs')
+            self._conn.execute('DELETE FROM song_tags')
+            if self._fts:
+                self._conn.execute('DELETE FROM songs_fts')
+            for position, song in enumerate(song for song in songs if song is not None):
+                self._insert(song, position)
+        self._after_write()
+
+    def flush(self):
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+    def _after_write(self):
+        self._cache = {}
+        self._songs = None
+        self._data_version = self._get_data_version()
+
+    def _delete_rows(self, song_ids):
+        removed = 0
+        for song_id in song_ids:
+            removed += self._conn.execute('DELETE FROM songs WHERE id = ?', (song_id,)).rowcount
+            self._conn.execute('DELETE FROM song_tags WHERE song_id = ?', (song_id,))
+            if self._fts:
+                self._conn.execute('DELETE FROM songs_fts WHERE rowid = ?', (song_id,))
+        return removed
+
+    def _insert(self, song, position):
+        meta = {k: v for k, v in song.items() if k not in ('lyrics', 'chords')}
+        self._conn.execute(
+            'INSERT INTO songs (id, position, title_lc, artist_lc, group_lc, language_lc, '
+            'title_key, artist_key, group_key, language_key, meta, lyrics, chords) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (
+                song['id'],
+                position,
+                song.get('title', '').lower(),
+                song.get('artist', '').lower(),
+                song.get('group', '').lower(),
+                song.get('language', '').lower(),
+                *_sort_keys(song),
+                json.dumps(meta, ensure_ascii=False),
+                json.dumps(song.get('lyrics', {}), ensure_ascii=False),
+                json.dumps(song.get('chords', {}), ensure_ascii=False),
+            )
+        )
+        self._conn.executemany(
+            'INSERT OR IGNORE INTO song_tags (tag, song_id) VALUES (?, ?)',
+            [(tag.lower(), song['id']) for tag in song.get('tags', [])]
+        )
+        if self._fts:
+            self._conn.execute(
+                'INSERT INTO songs_fts (rowid, title, artist, grp, lyrics) VALUES (?, ?, ?, ?, ?)',
+                (song['id'], song.get('title', ''), song.get('artist', ''), song.get('group', ''),
+                 _lyrics_text(song))
+            )
+
+
+def _sort_keys(song):
+    return [collation_key(song.get(field, '')) for field in KEY_FIELDS]
+
+
+def _lyrics_text(song):
+    lyrics = song.get('lyrics', {}) or {}
+    return '\n'.join(line.replace('|', '') for lines in lyrics.values() for line in lines)
+
+
+def migrate_json(songs_path, store):
+    """Import songs.json (and its journal, if any) into an SqliteSongStore."""
+    songs = JsonStorage(songs_path).read()
+    store.save(songs)
+    return len(store.songs())
@@ -0,0 +1,216 @@
+import hashlib
+import json
+import os
+import tempfile
+
+SNAPSHOT_FORMAT = 2
+SECTION_FIELDS = ('lyrics', 'chords')
+
+
+class JsonStorage:
+    """Songbook stored as a single JSON snapshot (songs.json).
+
+    Every change rewrites the snapshot. Writes go to a temporary file that
+    is renamed over the snapshot, so a crash never leaves a half-written book.
+    A leftover journal (see JournalStorage) is replayed on read, so switching
+    storage modes never loses changes.
+
+    Section bodies (the line lists in 'lyrics' and 'chords') are stored once
+    per snapshot under their content hash, see pack_sections(). Snapshots
+    written as a plain list of songs are still read.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.journal_path = path + '.journal'
+        self._journal_entries = 0
+        self._journal_torn = False
+
+    def signature(self):
+        """Return a value that changes whenever the stored songbook changes."""
+        return (_stat(self.path), _stat(self.journal_path))
+
+    def read(self):
+        songs = []
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                songs = unpack_sections(json.load(f))
+
+        entries, self._journal_torn = _read_journal(self.journal_path)
+        self._journal_entries = len(entries)
+        if not entries:
+            return songs
+
+        by_id = {song['id']: song for song in songs if song is not None}
+        for entry in entries:
+            if entry['op'] == 'upsert':
+                song = entry['song']
+                by_id[song['id']] = song
+            elif entry['op'] == 'delete':
+                for song_id in entry['ids']:
+                    by_id.pop(song_id, None)
+        return list(by_id.values())
+
+    def write(self, songs):
+        """Atomically replace the snapshot and drop the journal it absorbs."""
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.songs-', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(pack_sections(songs), f, indent=4, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        self._journal_entries = 0
+        self._journal_torn = False
+
+    def apply(self, songs, upserted=(), deleted=()):
+        """Persist a change; `songs` is the full songbook after the change."""
+        self.write(songs)
+
+    def compact(self, songs):
+        if self._journal_entries:
+            self.write(songs)
+
+
+class JournalStorage(JsonStorage):
+    """Snapshot plus an append-only journal of changes (JSON lines).
+
+    A change costs one appended line; the journal is folded back into the
+    snapshot every `compact_every` entries.
+    """
+
+    def __init__(self, path, compact_every=200):
+        super().__init__(path)
+        self.compact_every = compact_every
+
+    def apply(self, songs, upserted=(), deleted=()):
+        lines = [json.dumps({'op': 'upsert', 'song': song}, ensure_ascii=False) for song in upserted]
+        if deleted:
+            lines.append(json.dumps({'op': 'delete', 'ids': list(deleted)}))
+        if not lines:
+            return
+
+        text = '\n'.join(lines) + '\n'
+        if self._journal_torn:
+            # terminate the partial line left by an interrupted append
+            text = '\n' + text
+            self._journal_torn = False
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+
+        self._journal_entries += len(lines)
+        if self._journal_entries >= self.compact_every:
+            self.write(songs)
+
+
+def section_hash(lines):
+    """Return the content hash a section body is stored under."""
+    data = json.dumps(lines, ensure_ascii=False).encode('utf-8')
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def pack_sections(songs):
+    """Return the snapshot for `songs`, with every distinct section body
+    stored once in 'sections' and referred to from the songs as
+    {'$ref': hash}; other values (empty or non-list bodies) stay inline.
+
+    Repeated sections of one song and identical sections of different songs
+    share a single entry. The songs themselves are not modified.
+    """
+    sections = {}
+    hashes = {}  # id(lines) -> hash, bodies shared in memory are hashed once
+
+    def ref(lines):
+        if not isinstance(lines, list) or not lines:
+            return lines  # an empty body is shorter inline than as a reference
+        key = hashes.get(id(lines))
+        if key is None:
+            key = section_hash(lines)
+            # on a (very unlikely) collision, fall back to a suffixed key
+            suffix = 0
+            while sections.setdefault(key, lines) != lines:
+                suffix += 1
+                key = f'{section_hash(lines)}-{suffix}'
+            hashes[id(lines)] = key
+        return {'$ref': key}
+
+    packed = []
+    for song in songs:
+        if song is not None:
+            changes = {
+                field: {name: ref(lines) for name, lines in song[field].items()}
+                for field in SECTION_FIELDS if isinstance(song.get(field), dict)
+            }
+            song = dict(song, **changes)
+        packed.append(song)
+    return {'format': SNAPSHOT_FORMAT, 'sections': sections, 'songs': packed}
+
+
+def unpack_sections(snapshot):
+    """Return the song list stored in a snapshot written by pack_sections()
+    or in an older plain-list snapshot.
+
+    Songs that refer to the same section body share one list, which must
+    not be modified in place.
+    """
+    if isinstance(snapshot, list):
+        return snapshot
+
+    sections = snapshot['sections']
+
+    def deref(lines):
+        if isinstance(lines, dict) and len(lines) == 1 and '$ref' in lines:
+            return sections[lines['$ref']]
+        return lines
+
+    songs = snapshot['songs']
+    for song in songs:
+        if song is None:
+            continue
+        for field in SECTION_FIELDS:
+            bodies = song.get(field)
+            if isinstance(bodies, dict):
+                song[field] = {name: deref(lines) for name, lines in bodies.items()}
+    return songs
+
+
+def _stat(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _read_journal(path):
+    """Return (entries, torn) where torn means the last append was interrupted."""
+    if not os.path.exists(path):
+        return [], False
+
+    entries = []
+    torn = False
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            torn = not line.endswith('\n')
+            if not line.strip():
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                # partial line written before a crash
+                continue
+    return entries, torn
@@ -6,6 +6,8 @@ import pygame
 from PIL import Image  # <-- DODANE
 from typing import Optional, Callable  # <-- DODANE
 
+from ..logic.beat_clock import BeatClock, JitterStats
+
 
 # --- LOGIC ---
 class MetronomeLogic(threading.Thread):
@@ -20,21 +22,26 @@ class MetronomeLogic(threading.Thread):
         self._stop_event = threading.Event()
         self.click_obj = click_obj
         self.strong_click_obj = strong_click_obj
+        self.clock = None
+        self.jitter = JitterStats()  # lateness of every beat played, across pauses and tempo changes
 
     def stop(self):
         self._stop_event.set()
 
+    def jitter_stats(self):
+        """Return count, mean, stdev and max beat lateness (ms) measured so far."""
+        return self.jitter.summary()
+
     def run(self):
         beat_counter = 0
         while not self._stop_event.is_set():
             if not self.is_running_var.get():
+                self.clock = None
                 self._stop_event.wait(0.1)
                 continue
 
             bpm = self.bpm_var.get()
-            try:
-                interval = 60.0 / bpm
-            except ZeroDivisionError:
+            if bpm <= 0:
                 self._stop_event.wait(0.1)
                 continue
 
@@ -43,16 +50,24 @@ class MetronomeLogic(threading.Thread):
             except:
                 beats_per_measure = 4
 
-            beat_counter = (beat_counter % beats_per_measure) + 1
-            self.beat_indicator_callback(beat_counter)
+            # beats are due on an absolute grid; a tempo change restarts the
+            # grid at the last beat, beat_counter keeps the bar position
+            if self.clock is None:
+                self.clock = BeatClock(bpm, self.jitter)
+            else:
+                self.clock.set_bpm(bpm)
+            if self.clock.wait(self._stop_event) is None:
+                break
 
+            beat_counter = (beat_counter % beats_per_measure) + 1
+            # sound first, it is what the player hears on time
             if self.click_obj:
                 if beat_counter == 1 and self.strong_click_obj:
                     self.strong_click_obj.play()
                 else:
                     self.click_obj.play()
 
-            time.sleep(interval)
+            self.beat_indicator_callback(beat_counter)
 
         self.beat_indicator_callback(0)
 
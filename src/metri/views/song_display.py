@@ -2,7 +2,6 @@ import customtkinter as ctk
 from typing import Callable, Optional
 import os
 import sys
-import re
 from PIL import Image
 
 # Add parent directory to path
@@ -11,8 +10,9 @@ if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
 from ..logic.song_func import get_song
-from ..logic.display_func import get_display
+from ..logic.display_func import render_runs
 from ..logic.keys import transpose
+from .song_text import SongText
 
 
 class SongDisplayView(ctk.CTkFrame):
@@ -234,149 +234,36 @@ class SongDisplayView(ctk.CTkFrame):
         content_frame = ctk.CTkFrame(self, fg_color=self.CARD_BG, corner_radius=12)
         content_frame.pack(fill="both", expand=True, padx=20, pady=(0, 20))
 
-        # Scrollable text area
-        self.text_scroll = ctk.CTkScrollableFrame(
-            content_frame,
-            fg_color="transparent",
-            corner_radius=0
-        )
-        self.text_scroll.pack(fill="both", expand=True, padx=30, pady=30)
+        # Song text, drawn into a single text widget
+        self.song_text = SongText(content_frame, self._text_styles(), background=self.CARD_BG)
+        self.song_text.pack(fill="both", expand=True, padx=30, pady=30)
 
         # Display song
         self._display_song()
 
     def _display_song(self):
         """Display the song using display_func."""
-        # Clear existing content
-        for widget in self.text_scroll.winfo_children():
-            widget.destroy()
-
         try:
             # Get formatted display from display_func
-            display_text = get_display(self.song_id, self.transpose_value)
-            
-            # Parse and display the formatted text
-            self._parse_and_display(display_text)
-            
+            self.song_text.show_runs(render_runs(self.song, self.transpose_value))
+
         except Exception as e:
             print(f"Error displaying song: {e}")
-            ctk.CTkLabel(
-                self.text_scroll,
-                text=f"⚠️ Błąd wyświetlania piosenki: {str(e)}",
-                font=("Roboto", 14),
-                text_color=self.ACCENT_RED
-            ).pack(pady=20)
-
-    def _parse_and_display(self, display_text: str):
-        """Parse HTML-like formatted text and display it."""
-        # Split by paragraphs
-        paragraphs = display_text.split('\n\n')
-        
-        for para in paragraphs:
-            if not para.strip():
-                continue
-            
-            # Create frame for paragraph
-            para_frame = ctk.CTkFrame(self.text_scroll, fg_color="transparent")
-            para_frame.pack(fill="x", pady=(0, 20))
-            
-            lines = para.strip().split('\n')
-            for line in lines:
-                if not line.strip():
-                    # Empty line - add spacing
-                    ctk.CTkLabel(para_frame, text="", height=5).pack()
-                    continue
-                
-                # Check for bold (chords or section headers)
-                if '<b>' in line:
-                    # Extract text from <b> tags
-                    text = re.sub(r'</?b>', '', line)
-                    
-                    # Check if it contains <code> tags (chords)
-                    if '<code>' in text:
-                        # Parse chords
-                        chord_frame = ctk.CTkFrame(para_frame, fg_color="transparent")
-                        chord_frame.pack(fill="x", pady=(2, 0))
-                        
-                        # Split by code tags and create labels
-                        parts = re.split(r'<code>|</code>', text)
-                        current_x = 0
-                        
-                        for i, part in enumerate(parts):
-                            if not part.strip():
-                                continue
-                            
-                            if i % 2 == 1:  # Inside code tag (chord)
-                                chord_label = ctk.CTkLabel(
-                                    chord_frame,
-                                    text=part,
-                                    font=("Courier New", 13, "bold"),
-                                    text_color=self.ACCENT_CYAN,
-                                    fg_color=self._get_chord_bg(),
-                                    corner_radius=4,
-                                    padx=4,
-                                    pady=2
-                                )
-                                chord_label.pack(side="left", padx=(current_x, 2))
-                                current_x = 0
-                            else:  # Outside code tag (spacing)
-                                # Add spacing based on text length
-                                if part:
-                                    current_x += len(part) * 3
-                    else:
-                        # Regular bold text (section intro or emphasis)
-                        ctk.CTkLabel(
-                            para_frame,
-                            text=text,
-                            font=("Roboto", 14, "bold"),
-                            text_color=self.ACCENT_PURPLE,
-                            anchor="w",
-                            justify="left"
-                        ).pack(anchor="w", pady=(5, 2))
-                
-                # Check for italic (second voice)
-                elif '<i>' in line:
-                    text = re.sub(r'</?i>', '', line)
-                    ctk.CTkLabel(
-                        para_frame,
-                        text=text,
-                        font=("Roboto", 13, "italic"),
-                        text_color="gray",
-                        anchor="w",
-                        justify="left"
-                    ).pack(anchor="w", pady=1)
-                
-                # Check for image (tab)
-                elif '<img' in line:
-                    # Extract image path
-                    match = re.search(r'src="([^"]+)"', line)
-                    if match:
-                        img_path = match.group(1)
-                        ctk.CTkLabel(
-                            para_frame,
-                            text=f"[Tabulatura: {img_path}]",
-                            font=("Roboto", 12),
-                            text_color=self.ACCENT_GOLD,
-                            anchor="w"
-                        ).pack(anchor="w", pady=5)
-                
-                # Regular lyrics
-                else:
-                    # Remove any remaining HTML tags
-                    text = re.sub(r'<[^>]+>', '', line)
-                    if text.strip():
-                        # Check for tab character (chorus)
-                        if text.startswith('\t'):
-                            text = text.lstrip('\t')
-                            text = "    " + text  # Replace tab with spaces
-                        
-                        ctk.CTkLabel(
-                            para_frame,
-                            text=text,
-                            font=("Roboto", 13),
-                            anchor="w",
-                            justify="left"
-                        ).pack(anchor="w", pady=1)
+            self.song_text.show_message(f"⚠️ Błąd wyświetlania piosenki: {str(e)}")
+
+    def _text_styles(self):
+        """Text tag styles for the song text (see SongText)."""
+        return {
+            "lyrics": {"font": ("Roboto", 13), "spacing1": 1, "spacing3": 1},
+            "chords": {"font": ("Courier New", 13, "bold"), "foreground": self.ACCENT_CYAN, "spacing1": 2},
+            "chord": {"background": self._get_chord_bg()},
+            "intro": {"font": ("Roboto", 14, "bold"), "foreground": self.ACCENT_PURPLE, "spacing1": 5, "spacing3": 2},
+            "second_voice": {"font": ("Roboto", 13, "italic"), "foreground": "gray", "spacing1": 1, "spacing3": 1},
+            "tab": {"font": ("Roboto", 12), "foreground": self.ACCENT_GOLD, "spacing1": 5, "spacing3": 5},
+            "blank": {"font": ("Roboto", 1), "spacing3": 5},
+            "gap": {"font": ("Roboto", 1), "spacing3": 20},
+            "message": {"font": ("Roboto", 14), "foreground": self.ACCENT_RED},
+        }
 
     def _transpose_up(self):
         """Transpose up by one semitone."""
@@ -0,0 +1,129 @@
+import customtkinter as ctk
+import tkinter as tk
+from itertools import zip_longest
+from tkinter import font as tkfont
+from typing import Dict, List, Tuple
+
+from ..logic.display_func import markup_runs, split_columns
+
+
+class SongText(ctk.CTkFrame):
+    """Read-only song text drawn into a single tk.Text widget.
+
+    The song is inserted as tagged runs (see markup_runs) in one call, so
+    opening, transposing or switching the view of a long song replaces the
+    text of one widget instead of creating a label per line. Styles map the
+    run tags ('lyrics', 'chords', 'chord', 'intro', 'second_voice', 'tab',
+    'chorus', 'blank', 'gap', 'message') to tk.Text tag options.
+    """
+
+    COLUMN_GAP = 8  # between lyrics and their chords
+    COLUMN_SPACING = 30  # between two lyrics/chords column pairs
+    LINES_PER_COLUMN = 50
+    TWO_COLUMN_WIDTH = 1200
+
+    def __init__(self, master, styles: Dict[str, Dict], background: str = "#FFFFFF",
+                 text_color: str = "#000000", **kwargs):
+        super().__init__(master, fg_color=background, corner_radius=0, **kwargs)
+
+        self.text = tk.Text(
+            self,
+            wrap="none",
+            background=background,
+            foreground=text_color,
+            borderwidth=0,
+            highlightthickness=0,
+            padx=0,
+            pady=0,
+            cursor="arrow",
+            takefocus=0,
+            state="disabled"
+        )
+        scrollbar = ctk.CTkScrollbar(self, command=self.text.yview)
+        self.text.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y")
+        self.text.pack(side="left", fill="both", expand=True)
+
+        self._fonts: Dict[str, tkfont.Font] = {}
+        self.set_styles(styles)
+
+    def set_styles(self, styles: Dict[str, Dict]):
+        """Configure the run tags; tags missing from `styles` keep their options."""
+        for tag, options in styles.items():
+            self.text.tag_configure(tag, **options)
+        self._fonts.clear()
+
+    def show_markup(self, display_text: str):
+        """Show render_html() markup."""
+        self.show_runs(markup_runs(display_text))
+
+    def show_runs(self, runs: List[Tuple[str, Tuple[str, ...]]]):
+        """Show runs prepared by markup_runs() (or render_runs(), which caches them)."""
+        self.text.configure(tabs="")
+        self._replace(runs)
+
+    def show_columns(self, display_data: List[str]):
+        """Show render_columns() output as lyrics with chords beside them.
+
+        Long songs are split into two column pairs when the widget is wide
+        enough; tab stops are set from the widest line of each column.
+        """
+        lines = max(display_data[0].count('\n'), display_data[1].count('\n')) + 1
+        columns = 1
+        if self.text.winfo_width() > self.TWO_COLUMN_WIDTH and lines > self.LINES_PER_COLUMN:
+            columns = 2
+        # chorus lines are indented with a tab, which would jump to the
+        # chords column once tab stops are set; indent with spaces instead
+        split = [
+            [("    " + lyrics.lstrip("\t") if lyrics.startswith("\t") else lyrics, chords) for lyrics, chords in column]
+            for column in split_columns(display_data, columns, self.LINES_PER_COLUMN)
+        ]
+
+        lyrics_font = self._font("lyrics")
+        chords_font = self._font("chords")
+        tabs = []
+        x = 0
+        for i, column in enumerate(split):
+            if i:
+                x += self.COLUMN_SPACING
+                tabs.append(x)
+            x += max((lyrics_font.measure(lyrics) for lyrics, _ in column), default=0) + self.COLUMN_GAP
+            tabs.append(x)
+            x += max((chords_font.measure(chords) for _, chords in column), default=0)
+
+        runs: List[Tuple[str, Tuple[str, ...]]] = []
+        for row in zip_longest(*split, fillvalue=("", "")):
+            if not any(lyrics.strip() or chords.strip() for lyrics, chords in row):
+                runs.append(("\n", ("blank",)))
+                continue
+            for i, (lyrics, chords) in enumerate(row):
+                if i:
+                    runs.append(("\t", ()))
+                runs.append((lyrics, ("lyrics",)))
+                runs.append(("\t", ()))
+                runs.append((chords, ("chords",)))
+            runs.append(("\n", ()))
+
+        self.text.configure(tabs=tabs)
+        self._replace(runs)
+
+    def show_message(self, message: str):
+        self.text.configure(tabs="")
+        self._replace([(message, ("message",))])
+
+    def _replace(self, runs):
+        args = [part for text, tags in runs for part in (text, tags)]
+        self.text.configure(state="normal")
+        self.text.delete("1.0", "end")
+        if args:
+            self.text.insert("1.0", *args)
+        self.text.configure(state="disabled")
+        self.text.yview_moveto(0)
+
+    def _font(self, tag: str) -> tkfont.Font:
+        """Font of a tag, for measuring column widths."""
+        font = self._fonts.get(tag)
+        if font is None:
+            spec = self.text.tag_cget(tag, "font") or self.text.cget("font")
+            font = self._fonts[tag] = tkfont.Font(root=self.text, font=spec)
+        return font
@@ -1,8 +1,9 @@
 import customtkinter as ctk
+from itertools import islice
+from tkinter import filedialog, messagebox
 from typing import List, Dict, Callable, Optional
 import os
 import sys
-import re
 
 # Add parent directory to path
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -11,11 +12,14 @@ if parent_dir not in sys.path:
 
 from ..logic.song_func import (
     load_songs, save_songs, get_song, get_new_song,
-    song_create, song_edit, remove_song, filter_songs, get_tags
+    song_create, song_edit, remove_song, delete_songs, iter_filtered_songs, get_tags
 )
+from ..logic.song_import import bulk_import
 from ..logic.display_func import (
-    get_display, get_display_lyrics, get_display_chords, get_display_2
+    get_display_runs, get_display_lyrics, get_display_chords, get_display_2
 )
+from ..logic.song_prefetch import DisplayPrefetcher, adjacent_songs
+from .song_text import SongText
 
 
 class SongbookView(ctk.CTkFrame):
@@ -35,6 +39,9 @@ class SongbookView(ctk.CTkFrame):
     OUTER_PADDING = 24
     CARD_GAP = 12
     ACTION_BUTTON_WIDTH = 70
+    LIST_ROW_HEIGHT = 76  # card + gap, refined once cards are laid out
+    LIST_BUFFER_ROWS = 2
+    LIST_WHEEL_ROWS = 2
 
     def __init__(self, master, sidebar=None, back_callback=None, show_module_callback=None, show_menu_callback=None, **kwargs):
         super().__init__(master, **kwargs)
@@ -48,11 +55,18 @@ class SongbookView(ctk.CTkFrame):
 
         # Data storage
         self.songs_data: List[Dict] = []
-        self.filtered_songs: List[Dict] = []
+        self.filtered_songs: List[Dict] = []  # results pulled so far
+        self._song_stream = None  # lazy rest of the current filter result
         self.selected_songs: List[int] = []  # song IDs of selected songs
 
         # UI References
-        self.song_widgets: List[Dict] = []
+        self.song_widgets: List[Dict] = []  # recycled song cards
+        self._card_order: List[Dict] = []  # cards currently packed, top to bottom
+        self.songs_scrollbar = None
+        self._list_top = 0  # index in filtered_songs of the first visible card
+        self._list_row_height = self.LIST_ROW_HEIGHT
+        self._list_empty_label = None
+        self._list_wheel_bindings = []  # (sequence, funcid) bound on "all"
         self.search_var = ctk.StringVar()
         self._search_timer = None
         self.search_var.trace_add("write", lambda *args: self._debounced_search())
@@ -73,6 +87,7 @@ class SongbookView(ctk.CTkFrame):
         self.form_widgets: Dict[str, object] = {}
         self.form_error_label = None
         self.display_widgets: Dict[str, object] = {}
+        self._prefetcher = DisplayPrefetcher()  # renders the next/previous song ahead
         self.left_frame = None
         self.right_frame = None
         self.right_header = None
@@ -80,10 +95,6 @@ class SongbookView(ctk.CTkFrame):
         
         # Performance cache
         self._color_cache = {}
-        self._song_render_job = None
-        self._render_batch_size = 12
-        self._render_index = 0
-        self._list_loading_label = None
         self._last_filter_signature = None
 
         # Load songs data
@@ -101,6 +112,7 @@ class SongbookView(ctk.CTkFrame):
             print(f"Error loading songbook data: {e}")
             self.songs_data = []
             self.filtered_songs = []
+        self._song_stream = None
 
     def _save_songs(self):
         """Save songs to JSON file using song_func."""
@@ -179,6 +191,21 @@ class SongbookView(ctk.CTkFrame):
             corner_radius=10
         )
         self.add_btn.pack(side="right", padx=(0, 18), pady=16)
+
+        # Import songs from text files
+        self.import_btn = ctk.CTkButton(
+            header,
+            text="Importuj",
+            command=self._import_songs,
+            width=120,
+            height=40,
+            fg_color=self.ACCENT_PISTACHIO_LIGHT,
+            hover_color=self.ACCENT_PISTACHIO_DARK,
+            font=("Arial", 14, "bold"),
+            text_color="#FFFFFF",
+            corner_radius=10
+        )
+        self.import_btn.pack(side="right", padx=(0, 10), pady=16)
         
         # Back to list button (hidden by default)
         self.back_to_list_btn = ctk.CTkButton(
@@ -477,7 +504,9 @@ class SongbookView(ctk.CTkFrame):
         self.back_to_list_btn.pack_forget()
         self.display_back_btn.pack_forget()
         self.form_back_btn.pack_forget()
+        self.import_btn.pack_forget()
         self.add_btn.pack(side="right", padx=(0, 18), pady=16)
+        self.import_btn.pack(side="right", padx=(0, 10), pady=16)
 
         # Subtle accent line
         accent_line = ctk.CTkFrame(self.right_header, fg_color=self.ACCENT_PISTACHIO_LIGHT, height=3, corner_radius=0)
@@ -491,92 +520,207 @@ class SongbookView(ctk.CTkFrame):
         )
         title_label.pack(side="left", anchor="w")
 
-        self.songs_scroll = ctk.CTkScrollableFrame(
-            self.right_content,
-            fg_color="transparent",
-            corner_radius=0
-        )
-        self.songs_scroll.pack(fill="both", expand=True)
+        # Virtualized list: only enough cards to fill the viewport exist, and
+        # they are rebound to other songs while scrolling
+        self.songs_scrollbar = ctk.CTkScrollbar(self.right_content, command=self._on_list_scroll)
+        self.songs_scrollbar.pack(side="right", fill="y")
+
+        self.songs_scroll = ctk.CTkFrame(self.right_content, fg_color="transparent", corner_radius=0)
+        self.songs_scroll.pack(side="left", fill="both", expand=True)
+        self.songs_scroll.pack_propagate(False)
+        self.songs_scroll.bind("<Configure>", lambda e: self._update_visible_songs())
+
+        self.song_widgets = []
+        self._card_order = []
+        self._list_empty_label = None
+        self._bind_list_wheel()
 
         self._refresh_song_list()
 
     def _refresh_song_list(self):
-        """Refresh the song list display."""
+        """Show the current filter result from the top."""
         if not self.songs_scroll:
             return
 
-        self._cancel_song_render_job()
-
-        # Clear existing widgets
-        for widget in self.songs_scroll.winfo_children():
-            widget.destroy()
-
-        self.song_widgets = []
         self.selected_songs = []
-        if self._list_loading_label:
-            self._list_loading_label = None
+        self._list_top = 0
+        self._update_visible_songs()
+        self._update_delete_button_state()
 
-        if not self.filtered_songs:
-            ctk.CTkLabel(
-                self.songs_scroll,
-                text="Brak piosenek do wyświetlenia.\nDodaj nowe piosenki używając przycisku '+Dodaj Piosenkę'",
-                font=("Roboto", 16),
-                text_color=self.TEXT_MUTED,
-                justify="center"
-            ).pack(pady=50)
-            self._update_delete_button_state()
+    def _pull_songs(self, count: Optional[int] = None):
+        """Take results from the filter stream until `count` are loaded (None = all)."""
+        if self._song_stream is None:
             return
+        try:
+            if count is None:
+                self.filtered_songs.extend(self._song_stream)
+            else:
+                missing = count - len(self.filtered_songs)
+                if missing <= 0:
+                    return
+                pulled = list(islice(self._song_stream, missing))
+                self.filtered_songs.extend(pulled)
+                if len(pulled) == missing:
+                    return
+        except Exception:
+            # the stream runs the search lazily, so its errors surface here;
+            # fall back to the unfiltered list
+            self.filtered_songs = self.songs_data.copy()
+        self._song_stream = None
 
-        self._list_loading_label = ctk.CTkLabel(
-            self.songs_scroll,
-            text="Ładowanie listy…",
-            font=("Roboto", 14),
-            text_color=self.ACCENT_PISTACHIO_DARK
-        )
-        self._list_loading_label.pack(pady=20)
-
-        self._render_index = 0
-        self._render_song_batch()
-
-    def _cancel_song_render_job(self):
-        if self._song_render_job:
-            try:
-                self.after_cancel(self._song_render_job)
-            except Exception:
-                pass
-            self._song_render_job = None
-
-    def _render_song_batch(self):
-        if self.current_mode != "list":
-            self._song_render_job = None
-            return
+    def _visible_rows(self) -> int:
+        """Number of cards needed to fill the viewport, plus a small buffer."""
+        height = self.songs_scroll.winfo_height()
+        if height <= 1:
+            height = self.songs_scroll.winfo_reqheight()
+        return -(-height // self._list_row_height) + self.LIST_BUFFER_ROWS
 
+    def _update_visible_songs(self):
+        """Bind the recycled cards to the songs at the current scroll position."""
         if not self.songs_scroll or not self.songs_scroll.winfo_exists():
-            self._song_render_job = None
             return
 
-        if self._render_index == 0 and self._list_loading_label:
-            self._list_loading_label.destroy()
-            self._list_loading_label = None
-
-        end_index = min(self._render_index + self._render_batch_size, len(self.filtered_songs))
+        rows = self._visible_rows()
+        self._pull_songs(self._list_top + rows)
+        total = len(self.filtered_songs)
+        self._list_top = max(0, min(self._list_top, total - rows + self.LIST_BUFFER_ROWS))
 
-        for idx in range(self._render_index, end_index):
-            self._create_song_item(self.filtered_songs[idx])
-
-        self._render_index = end_index
-
-        if self._render_index >= len(self.filtered_songs):
-            self._song_render_job = None
-            self._update_delete_button_state()
+        if not total:
+            for card in self.song_widgets:
+                self._hide_song_card(card)
+            self._show_empty_list_label()
+            self.songs_scrollbar.set(0.0, 1.0)
+            return
+        if self._list_empty_label:
+            self._list_empty_label.destroy()
+            self._list_empty_label = None
+
+        # reconcile by song id: cards already showing a visible song keep it,
+        # the others are rebound, and new cards are only made if none are free
+        visible_songs = self.filtered_songs[self._list_top:self._list_top + rows]
+        visible_ids = {song['id'] for song in visible_songs}
+        cards_by_id = {card["song_id"]: card for card in self.song_widgets if card["song_id"] in visible_ids}
+        free_cards = [card for card in self.song_widgets if card["song_id"] not in visible_ids]
+
+        order = []
+        for song in visible_songs:
+            card = cards_by_id.get(song['id'])
+            if card is None:
+                if free_cards:
+                    card = free_cards.pop()
+                else:
+                    card = self._create_song_card()
+                    self.song_widgets.append(card)
+            self._bind_song_card(card, song)
+            order.append(card)
+
+        for card in free_cards:
+            self._hide_song_card(card)
+        self._arrange_song_cards(order)
+        self._measure_list_rows()
+
+        # the stream may hold more songs; keep room to scroll into them
+        known = total if self._song_stream is None else total + rows
+        visible = rows - self.LIST_BUFFER_ROWS
+        self.songs_scrollbar.set(self._list_top / known, min(1.0, (self._list_top + visible) / known))
+
+    def _arrange_song_cards(self, order: List[Dict]):
+        """Pack `order` top to bottom, moving only cards that are out of place."""
+        packed = self._card_order
+        for i, card in enumerate(order):
+            if i < len(packed) and packed[i] is card:
+                continue
+            if card["shown"]:
+                packed.remove(card)
+            if i < len(packed):
+                card["frame"].pack(fill="x", pady=self.CARD_GAP // 2, padx=self.CARD_GAP, before=packed[i]["frame"])
+            else:
+                card["frame"].pack(fill="x", pady=self.CARD_GAP // 2, padx=self.CARD_GAP)
+            packed.insert(i, card)
+            card["shown"] = True
+
+    def _measure_list_rows(self):
+        """Use the real distance between two cards as the row height."""
+        cards = self._card_order
+        if len(cards) < 2 or not cards[1]["frame"].winfo_ismapped():
+            return
+        height = cards[1]["frame"].winfo_y() - cards[0]["frame"].winfo_y()
+        if height > 1 and height != self._list_row_height:
+            self._list_row_height = height
+            self.after_idle(self._update_visible_songs)
+
+    def _hide_song_card(self, card: Dict):
+        card["song_id"] = None
+        if card["shown"]:
+            card["frame"].pack_forget()
+            card["shown"] = False
+            self._card_order.remove(card)
+
+    def _show_empty_list_label(self):
+        if self._list_empty_label:
+            return
+        self._list_empty_label = ctk.CTkLabel(
+            self.songs_scroll,
+            text="Brak piosenek do wyświetlenia.\nDodaj nowe piosenki używając przycisku '+Dodaj Piosenkę'",
+            font=("Roboto", 16),
+            text_color=self.TEXT_MUTED,
+            justify="center"
+        )
+        self._list_empty_label.pack(pady=50)
+
+    def _scroll_list_to(self, top: int):
+        if top != self._list_top:
+            self._list_top = max(0, top)
+            self._update_visible_songs()
+
+    def _on_list_scroll(self, action, *args):
+        """Handle the scrollbar ('moveto', fraction) and ('scroll', n, 'units')."""
+        if action == "moveto":
+            # jumping needs the full result, so the rest of the stream is read
+            self._pull_songs()
+            self._scroll_list_to(round(float(args[0]) * len(self.filtered_songs)))
+        elif action == "scroll":
+            step = int(args[0])
+            if len(args) > 1 and args[1] == "pages":
+                step *= max(1, self._visible_rows() - self.LIST_BUFFER_ROWS)
+            self._scroll_list_to(self._list_top + step)
+
+    def _bind_list_wheel(self):
+        """Scroll the song list with the mouse wheel while the pointer is over it."""
+        if self._list_wheel_bindings:
+            return
+        root = self.winfo_toplevel()  # CTk widgets refuse bind_all themselves
+        sequences = ("<Button-4>", "<Button-5>") if "linux" in sys.platform else ("<MouseWheel>",)
+        for sequence in sequences:
+            funcid = root.bind_all(sequence, self._on_list_wheel, add=True)
+            self._list_wheel_bindings.append((sequence, funcid))
+
+    def _unbind_list_wheel(self):
+        """Remove only this view's wheel handlers; other widgets bind the same events on "all"."""
+        root = self.winfo_toplevel()
+        for sequence, funcid in self._list_wheel_bindings:
+            script = root.tk.call("bind", "all", sequence)
+            kept = [line for line in str(script).split("\n") if funcid not in line]
+            root.tk.call("bind", "all", sequence, "\n".join(kept))
+            root.deletecommand(funcid)
+        self._list_wheel_bindings = []
+
+    def _on_list_wheel(self, event):
+        if self.current_mode != "list" or not self.songs_scroll or not self.songs_scroll.winfo_exists():
             return
+        widget, viewport = str(event.widget), str(self.songs_scroll)
+        if widget != viewport and not widget.startswith(viewport + "."):
+            return
+        if getattr(event, "num", None) in (4, 5):
+            direction = -1 if event.num == 4 else 1
+        else:
+            direction = -1 if event.delta > 0 else 1
+        self._scroll_list_to(self._list_top + direction * self.LIST_WHEEL_ROWS)
 
-        self._song_render_job = self.after(20, self._render_song_batch)
+    def _create_song_card(self) -> Dict:
+        """Create an empty song card; _bind_song_card() fills it in."""
+        card = {"song_id": None, "shown": False}
 
-    def _create_song_item(self, song: Dict):
-        """Create a song item in the list."""
-        song_id = song['id']
-        
         # Song card
         song_frame = ctk.CTkFrame(
             self.songs_scroll,
@@ -584,7 +728,6 @@ class SongbookView(ctk.CTkFrame):
             corner_radius=12,
             border_width=0
         )
-        song_frame.pack(fill="x", pady=self.CARD_GAP // 2, padx=self.CARD_GAP)
 
         # Content frame
         content = ctk.CTkFrame(song_frame, fg_color="transparent")
@@ -599,31 +742,18 @@ class SongbookView(ctk.CTkFrame):
         info_frame.pack(side="left", fill="x", expand=True)
 
         # Make info_frame clickable to view song
-        info_frame.bind("<Button-1>", lambda e, sid=song_id: self._view_song(sid))
+        info_frame.bind("<Button-1>", lambda e: self._view_song(card["song_id"]))
         info_frame.configure(cursor="hand2")
 
-        # Single-line: Title - Artist - Group only
-        title_text = song.get("title", "Bez tytułu")
-        artist_text = song.get("artist", "")
-        group_text = song.get("group", "")
-        
-        parts = [title_text]
-        if artist_text:
-            parts.append(artist_text)
-        if group_text:
-            parts.append(group_text)
-        
-        combined_text = "  —  ".join(parts)
-        
         combined_label = ctk.CTkLabel(
             info_frame,
-            text=combined_text,
+            text="",
             font=("Roboto", 16),
             anchor="w",
             cursor="hand2"
         )
         combined_label.pack(anchor="w")
-        combined_label.bind("<Button-1>", lambda e, sid=song_id: self._view_song(sid))
+        combined_label.bind("<Button-1>", lambda e: self._view_song(card["song_id"]))
 
         actions_frame = ctk.CTkFrame(content, fg_color="transparent")
         actions_frame.pack(side="right", padx=(12, 0))
@@ -633,7 +763,7 @@ class SongbookView(ctk.CTkFrame):
             actions_frame,
             text="",
             variable=checkbox_var,
-            command=lambda sid=song_id, v=checkbox_var: self._on_song_select(sid, v),
+            command=lambda: self._on_song_select(card["song_id"], checkbox_var),
             width=20,
             fg_color=self.ACCENT_PISTACHIO_DARK,
             hover_color="#7FAD5A",
@@ -645,7 +775,7 @@ class SongbookView(ctk.CTkFrame):
         delete_btn = ctk.CTkButton(
             actions_frame,
             text="🗑",
-            command=lambda sid=song_id: self._delete_single_song(sid),
+            command=lambda: self._delete_single_song(card["song_id"]),
             width=36,
             height=36,
             fg_color=self.ACCENT_PISTACHIO_DARK,
@@ -659,7 +789,7 @@ class SongbookView(ctk.CTkFrame):
         edit_btn = ctk.CTkButton(
             actions_frame,
             text="✏",
-            command=lambda sid=song_id: self._edit_song(sid),
+            command=lambda: self._edit_song(card["song_id"]),
             width=36,
             height=36,
             fg_color=self.ACCENT_PISTACHIO_DARK,
@@ -670,13 +800,34 @@ class SongbookView(ctk.CTkFrame):
         )
         edit_btn.pack(side="left")
 
-        # Store references
-        self.song_widgets.append({
+        card.update({
             "frame": song_frame,
+            "label": combined_label,
             "checkbox_var": checkbox_var,
             "checkbox": checkbox,
-            "song_id": song_id
         })
+        return card
+
+    def _bind_song_card(self, card: Dict, song: Dict):
+        """Show `song` in a recycled card."""
+        song_id = song['id']
+        card["song_id"] = song_id
+
+        # Single-line: Title - Artist - Group only
+        parts = [song.get("title", "Bez tytułu")]
+        if song.get("artist", ""):
+            parts.append(song["artist"])
+        if song.get("group", ""):
+            parts.append(song["group"])
+        text = "  —  ".join(parts)
+
+        # unchanged cards are left alone, so kept songs cost no widget updates
+        if card.get("text") != text:
+            card["text"] = text
+            card["label"].configure(text=text)
+        selected = song_id in self.selected_songs
+        if card["checkbox_var"].get() != selected:
+            card["checkbox_var"].set(selected)
 
     def _on_song_select(self, song_id: int, var: ctk.BooleanVar):
         """Handle song selection."""
@@ -704,6 +855,8 @@ class SongbookView(ctk.CTkFrame):
         if not self.filtered_songs or not self.select_all_btn:
             return
 
+        self._pull_songs()
+
         # Check if all are selected
         all_selected = len(self.selected_songs) == len(self.filtered_songs)
 
@@ -827,9 +980,8 @@ class SongbookView(ctk.CTkFrame):
 
     def _confirm_delete(self, dialog):
         """Confirm and execute deletion."""
-        # Remove from main data using remove_song
-        for song_id in self.selected_songs:
-            remove_song(song_id)
+        # Remove all selected songs with a single write
+        delete_songs(self.selected_songs)
 
         self._refresh_after_delete()
         dialog.destroy()
@@ -849,7 +1001,7 @@ class SongbookView(ctk.CTkFrame):
         """Debounce search input to avoid filtering on every keystroke."""
         if self._search_timer:
             self.after_cancel(self._search_timer)
-        self._search_timer = self.after(300, self._apply_filters)  # 300ms delay
+        self._search_timer = self.after(100, self._apply_filters)  # 100ms delay, search is index-backed
 
     def _apply_filters(self, force: bool = False):
         """Apply filters; skip work if inputs unchanged unless force=True."""
@@ -907,12 +1059,11 @@ class SongbookView(ctk.CTkFrame):
             return
         self._last_filter_signature = signature
 
-        try:
-            self.filtered_songs = filter_songs(search_args)
-        except:
-            # Fallback to manual filtering
-            self.filtered_songs = self.songs_data.copy()
-        
+        # results are pulled batch by batch while the list is rendered;
+        # _pull_songs falls back to the unfiltered list if the search fails
+        self.filtered_songs = []
+        self._song_stream = iter_filtered_songs(search_args)
+
         if self.current_mode == "list" and self.songs_scroll:
             self._refresh_song_list()
 
@@ -920,6 +1071,26 @@ class SongbookView(ctk.CTkFrame):
         """Switch to inline form for creating a new song."""
         self._open_form()
 
+    def _import_songs(self):
+        """Import song text files chosen by the user in one batch."""
+        paths = filedialog.askopenfilenames(
+            title="Importuj piosenki",
+            filetypes=[("Pliki tekstowe", "*.txt"), ("Wszystkie pliki", "*.*")]
+        )
+        if not paths:
+            return
+
+        try:
+            songs = bulk_import(paths)
+        except Exception as exc:
+            messagebox.showerror("Import", f"Nie udało się zaimportować piosenek: {exc}")
+            return
+
+        self._load_songs()
+        self._apply_filters(force=True)
+        self._update_tag_checkboxes()
+        messagebox.showinfo("Import", f"Zaimportowano piosenki: {len(songs)}")
+
     def _edit_song(self, song_id: int):
         """Switch to inline form for editing an existing song."""
         song = get_song(song_id)
@@ -943,6 +1114,7 @@ class SongbookView(ctk.CTkFrame):
         
         # Update header buttons - use arrow for form
         self.add_btn.pack_forget()
+        self.import_btn.pack_forget()
         self.display_back_btn.pack_forget()
         self.back_to_list_btn.pack_forget()
         self.form_back_btn.pack_forget()
@@ -1096,6 +1268,7 @@ class SongbookView(ctk.CTkFrame):
         
         # Update header buttons
         self.add_btn.pack_forget()
+        self.import_btn.pack_forget()
         self.back_to_list_btn.pack_forget()
         self.form_back_btn.pack_forget()
         self.display_back_btn.pack(side="right", padx=(0, 18), pady=16)
@@ -1177,11 +1350,11 @@ class SongbookView(ctk.CTkFrame):
 
         view_switch = self.display_widgets.get("view_switch")
 
-        scroll = ctk.CTkScrollableFrame(self.right_content, fg_color="transparent")
-        scroll.pack(fill="both", expand=True)
+        song_text = SongText(self.right_content, self._display_styles(), background=self.CARD_BG)
+        song_text.pack(fill="both", expand=True, pady=12)
 
         self.display_widgets["view_switch"] = view_switch
-        self.display_widgets["scroll"] = scroll
+        self.display_widgets["song_text"] = song_text
 
         self._render_display_text()
 
@@ -1228,193 +1401,70 @@ class SongbookView(ctk.CTkFrame):
 
         self.display_widgets["view_switch"] = view_switch
 
+        # Previous / next song in the current list order
+        index = self._song_position(song_id)
+        nav_row = ctk.CTkFrame(self.left_frame, fg_color="transparent")
+        nav_row.pack(pady=(0, 20), padx=20, fill="x")
+        for text, step, side in (("◀ Poprzednia", -1, "left"), ("Następna ▶", 1, "right")):
+            target = None if index is None else index + step
+            enabled = target is not None and 0 <= target < len(self.filtered_songs)
+            ctk.CTkButton(
+                nav_row,
+                text=text,
+                command=lambda step=step: self._view_adjacent_song(step),
+                width=120,
+                height=36,
+                fg_color=self.ACCENT_PISTACHIO_DARK,
+                hover_color="#7FAD5A",
+                font=("Roboto", 13, "bold"),
+                text_color="#FFFFFF",
+                corner_radius=10,
+                state="normal" if enabled else "disabled"
+            ).pack(side=side)
+
     def _render_display_text(self):
-        """Draw the song text with chords using the display helper."""
-        scroll = self.display_widgets.get("scroll")
-        if not scroll or not self.current_display_song_id:
+        """Draw the song text with chords into the song text widget."""
+        song_text = self.display_widgets.get("song_text")
+        if not song_text or not self.current_display_song_id:
             return
 
-        for widget in scroll.winfo_children():
-            widget.destroy()
-
+        song_text.set_styles(self._display_styles())
         try:
             if self.display_view_mode == 0:
                 display_data = get_display_2(self.current_display_song_id)
-                self._render_side_by_side(scroll, display_data)
+                if not display_data or len(display_data) < 2:
+                    song_text.show_message("Brak danych do wyświetlenia.")
+                    return
+                # measure the real width for the one/two column decision
+                song_text.update_idletasks()
+                song_text.show_columns(display_data)
             else:
-                display_text = get_display(self.current_display_song_id)
-                self._parse_display_text(scroll, display_text)
+                song_text.show_runs(get_display_runs(self.current_display_song_id))
         except Exception as exc:
-            ctk.CTkLabel(
-                scroll,
-                text=f"Błąd wyświetlania piosenki: {exc}",
-                font=("Roboto", 13),
-                text_color=self.ACCENT_PISTACHIO_LIGHT
-            ).pack(pady=20)
-
-    def _render_side_by_side(self, parent, display_data):
-        """Render lyrics and chords side by side in two columns within the main scroll."""
-        if not display_data or len(display_data) < 2:
-            ctk.CTkLabel(
-                parent,
-                text="Brak danych do wyświetlenia.",
-                font=("Roboto", 13),
-                text_color=self.ACCENT_PISTACHIO_LIGHT
-            ).pack(pady=20)
-            return
-
-        lyrics_text = display_data[0]
-        chords_text = display_data[1]
+            song_text.show_message(f"Błąd wyświetlania piosenki: {exc}")
 
-        lyrics_lines = lyrics_text.split('\n')
-        chords_lines = chords_text.split('\n')
-
-        max_lines = max(len(lyrics_lines), len(chords_lines))
-
-        # Calculate how many columns can fit
-        parent.update_idletasks()
-        scroll_width = parent.winfo_width()
-        lines_per_column = 50  # Max lines per column
-        num_columns = 1
-        
-        if scroll_width > 1200 and max_lines > lines_per_column:
-            num_columns = min(2, (max_lines + lines_per_column - 1) // lines_per_column)
-
-        container = ctk.CTkFrame(parent, fg_color="transparent")
-        container.pack(anchor="w", padx=self.OUTER_PADDING, pady=12)
-
-        font_lyrics = ("Roboto", 17)
-        font_chords = ("Roboto", 16, "bold")
-
-        for col_idx in range(num_columns):
-            container.grid_columnconfigure(col_idx * 2, weight=0)
-            container.grid_columnconfigure(col_idx * 2 + 1, weight=0)
-
-        # Split content into multiple columns
-        widget_count = 0
-        for col_idx in range(num_columns):
-            start_line = col_idx * lines_per_column
-            end_line = min(start_line + lines_per_column, max_lines)
-
-            for i in range(start_line, end_line):
-                widget_count += 1
-                # Update UI periodically to keep responsive
-                if widget_count % 20 == 0:
-                    self.update_idletasks()
-                row = i - start_line
-                lyrics_line = lyrics_lines[i] if i < len(lyrics_lines) else ''
-                chords_line = chords_lines[i] if i < len(chords_lines) else ''
-
-                if lyrics_line.strip() or chords_line.strip():
-                    lyrics_label = ctk.CTkLabel(
-                        container,
-                        text=lyrics_line if lyrics_line else ' ',
-                        font=font_lyrics,
-                        anchor="w",
-                        justify="left"
-                    )
-                    lyrics_label.grid(
-                        row=row,
-                        column=col_idx * 2,
-                        sticky="w",
-                        padx=(30 if col_idx > 0 else 0, 8),
-                        pady=1
-                    )
-
-                    chord_label = ctk.CTkLabel(
-                        container,
-                        text=chords_line if chords_line else ' ',
-                        font=font_chords,
-                        text_color=self.ACCENT_PISTACHIO_DARK,
-                        anchor="w",
-                        justify="left"
-                    )
-                    chord_label.grid(
-                        row=row,
-                        column=col_idx * 2 + 1,
-                        sticky="w",
-                        pady=1
-                    )
-                else:
-                    spacer = ctk.CTkLabel(container, text='', height=10)
-                    spacer.grid(row=row, column=col_idx * 2, columnspan=2)
+    def _display_styles(self) -> Dict[str, Dict]:
+        """Text tag styles of the current display mode (see SongText)."""
+        if self.display_view_mode == 0:
+            return {
+                "lyrics": {"font": ("Roboto", 17), "foreground": "#000000", "spacing1": 1, "spacing3": 1},
+                "chords": {"font": ("Roboto", 16, "bold"), "foreground": self.ACCENT_PISTACHIO_DARK},
+                "blank": {"font": ("Roboto", 1), "spacing3": 8},
+                "message": {"font": ("Roboto", 13), "foreground": self.ACCENT_PISTACHIO_LIGHT},
+            }
 
-    def _parse_display_text(self, parent, display_text: str):
-        """Parse the pseudo-HTML markup into CTk labels."""
-        paragraphs = display_text.split('\n\n')
         mono_font = ("Courier New", 16)
         chord_font = ("Courier New", 16, "bold")
-
-        for para in paragraphs:
-            if not para.strip():
-                continue
-
-            para_frame = ctk.CTkFrame(parent, fg_color="transparent")
-            para_frame.pack(anchor="w", pady=(0, 18))
-
-            lines = para.strip().split('\n')
-            for line in lines:
-                if not line.strip():
-                    ctk.CTkLabel(para_frame, text="", height=6).pack()
-                    continue
-
-                if '<b>' in line:
-                    text = re.sub(r'</?b>', '', line)
-                    if '<code>' in text:
-                        # Check if line starts with tab (chorus chords)
-                        has_indent = text.startswith('\t')
-                        chord_line = re.sub(r'</?code>', '', text)
-                        chord_line = chord_line.replace('\t', '    ')
-                        ctk.CTkLabel(
-                            para_frame,
-                            text=chord_line,
-                            font=chord_font,
-                            text_color=self.ACCENT_PISTACHIO_DARK,
-                            anchor="w",
-                            justify="left"
-                        ).pack(anchor="w", pady=(0, 0))
-                    else:
-                        # [i] section chords - lighter color but bold
-                        ctk.CTkLabel(
-                            para_frame,
-                            text=text,
-                            font=chord_font,
-                            text_color=self.TEXT_MUTED,
-                            anchor="w",
-                            justify="left"
-                        ).pack(anchor="w", pady=(4, 1))
-                elif '<i>' in line:
-                    text = re.sub(r'</?i>', '', line)
-                    ctk.CTkLabel(
-                        para_frame,
-                        text=text,
-                        font=mono_font,
-                        text_color=self.TEXT_MUTED,
-                        anchor="w",
-                        justify="left"
-                    ).pack(anchor="w", pady=1)
-                elif '<img' in line:
-                    match = re.search(r'src="([^"]+)"', line)
-                    img_path = match.group(1) if match else "?"
-                    ctk.CTkLabel(
-                        para_frame,
-                        text=f"[Tabulatura: {img_path}]",
-                        font=("Roboto", 13),
-                        text_color=self.ACCENT_PISTACHIO_DARK,
-                        anchor="w"
-                    ).pack(anchor="w", pady=5)
-                else:
-                    text = re.sub(r'<[^>]+>', '', line)
-                    if text.strip():
-                        if text.startswith('\t'):
-                            text = "    " + text.lstrip('\t')
-                        ctk.CTkLabel(
-                            para_frame,
-                            text=text,
-                            font=mono_font,
-                            anchor="w",
-                            justify="left"
-                        ).pack(anchor="w", pady=1)
+        return {
+            "lyrics": {"font": mono_font, "foreground": "#000000", "spacing1": 1, "spacing3": 1},
+            "chords": {"font": chord_font, "foreground": self.ACCENT_PISTACHIO_DARK},
+            "intro": {"font": chord_font, "foreground": self.TEXT_MUTED, "spacing1": 4, "spacing3": 1},
+            "second_voice": {"font": mono_font, "foreground": self.TEXT_MUTED, "spacing1": 1, "spacing3": 1},
+            "tab": {"font": ("Roboto", 13), "foreground": self.ACCENT_PISTACHIO_DARK, "spacing1": 5, "spacing3": 5},
+            "blank": {"font": ("Roboto", 1), "spacing3": 6},
+            "gap": {"font": ("Roboto", 1), "spacing3": 16},
+            "message": {"font": ("Roboto", 13), "foreground": self.ACCENT_PISTACHIO_LIGHT},
+        }
 
     def _toggle_display_view(self):
         """Toggle between side-by-side and inline chord view."""
@@ -1577,6 +1627,29 @@ class SongbookView(ctk.CTkFrame):
         self.current_mode = "display"
         self.display_view_mode = 0
         self._render_right_panel()
+        self._prefetch_adjacent(song_id)
+
+    def _view_adjacent_song(self, step: int):
+        """Show the song `step` places away in the current list order."""
+        index = self._song_position(self.current_display_song_id)
+        if index is None:
+            return
+        target = index + step
+        if 0 <= target < len(self.filtered_songs):
+            self._view_song(self.filtered_songs[target]["id"])
+
+    def _song_position(self, song_id: Optional[int]) -> Optional[int]:
+        """Index of a song in filtered_songs; the song after it is pulled from the stream too."""
+        for index, song in enumerate(self.filtered_songs):
+            if song.get("id") == song_id:
+                self._pull_songs(index + 2)
+                return index
+        return None
+
+    def _prefetch_adjacent(self, song_id: int):
+        """Render the next and previous songs on the prefetch thread while this one is read."""
+        if self._song_position(song_id) is not None:
+            self._prefetcher.prefetch(adjacent_songs(self.filtered_songs, song_id))
 
     def _handle_display_back(self):
         """Return from inline display to the list."""
@@ -1587,6 +1660,12 @@ class SongbookView(ctk.CTkFrame):
         self._restore_left_panel()
         self._render_right_panel()
 
+    def destroy(self):
+        """Stop the prefetch thread and drop the global wheel bindings with the view."""
+        self._prefetcher.shutdown()
+        self._unbind_list_wheel()
+        super().destroy()
+
     def _show_tooltip(self, widget, text: str):
         """Show tooltip popup window on hover."""
         tooltip_window = None
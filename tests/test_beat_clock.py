@@ -0,0 +1,136 @@
+"""
+Testy jednostkowe dla modułu beat_clock.py
+"""
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from metri.logic.beat_clock import BeatClock, JitterStats, sleep_until
+
+
+class FakeClock:
+    """Zegar sterowany ręcznie; czas ustawiany jest przed każdym uderzeniem"""
+
+    def __init__(self, now=100.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestBeatClock:
+    """Testy dla klasy BeatClock"""
+
+    def test_deadlines_do_not_drift(self):
+        """Test że opóźnienia między uderzeniami nie przesuwają siatki"""
+        clock = FakeClock()
+        beats = BeatClock(120, clock=clock)
+
+        for n in range(100):
+            assert beats.next_deadline == pytest.approx(100.0 + n * 0.5)
+            clock.now = beats.next_deadline + 0.01  # each beat fires 10 ms late
+            assert beats.wait() == pytest.approx(0.01)
+
+        assert beats.next_deadline == pytest.approx(150.0)
+
+    def test_bpm_change_restarts_grid_at_last_beat(self):
+        """Test zmiany tempa względem ostatniego uderzenia"""
+        clock = FakeClock()
+        beats = BeatClock(60, clock=clock)
+        for _ in range(3):
+            clock.now = beats.next_deadline + 0.2
+            beats.wait()
+
+        beats.set_bpm(120)
+        assert beats.next_deadline == pytest.approx(102.5)
+        clock.now = 102.5
+        beats.wait()
+        assert beats.next_deadline == pytest.approx(103.0)
+
+    def test_bpm_change_before_first_beat(self):
+        """Test zmiany tempa przed pierwszym uderzeniem"""
+        beats = BeatClock(60, clock=FakeClock())
+        beats.set_bpm(240)
+        assert beats.next_deadline == 100.0
+        assert beats.interval == 0.25
+
+    def test_stall_restarts_grid(self):
+        """Test że po długim zatrzymaniu zaległe uderzenia nie są nadrabiane"""
+        clock = FakeClock()
+        beats = BeatClock(120, clock=clock)
+        clock.now = 105.0
+        assert beats.wait() == pytest.approx(5.0)
+
+        assert beats.resyncs == 1
+        assert beats.next_deadline == pytest.approx(105.5)
+
+    def test_stop_event(self):
+        """Test przerwania oczekiwania"""
+        stop = threading.Event()
+        beats = BeatClock(1)
+        beats.wait(stop)
+        threading.Timer(0.05, stop.set).start()
+
+        start = time.perf_counter()
+        assert beats.wait(stop) is None
+        assert time.perf_counter() - start < 0.5
+
+    def test_real_time_accuracy(self):
+        """Test dokładności na prawdziwym zegarze mimo pracy między uderzeniami"""
+        beats = BeatClock(1200)  # 50 ms
+        start = beats.next_deadline
+        fired = []
+        for _ in range(10):
+            beats.wait()
+            fired.append(time.perf_counter())
+            time.sleep(0.01)  # work done between beats
+
+        assert fired[-1] - start == pytest.approx(9 * 0.05, abs=0.02)
+        assert beats.stats.count == 10
+
+
+class TestJitterStats:
+    """Testy dla klasy JitterStats"""
+
+    def test_summary(self):
+        """Test zgodności statystyk z modułem statistics"""
+        samples = [0.001, 0.003, -0.002, 0.0005, 0.004]
+        stats = JitterStats()
+        for sample in samples:
+            stats.add(sample)
+
+        summary = stats.summary()
+        assert summary['count'] == 5
+        assert summary['mean_ms'] == pytest.approx(statistics.mean(samples) * 1000)
+        assert summary['stdev_ms'] == pytest.approx(statistics.stdev(samples) * 1000)
+        assert summary['max_ms'] == pytest.approx(4.0)
+
+    def test_empty(self):
+        """Test statystyk bez pomiarów"""
+        assert JitterStats().summary() == {'count': 0, 'mean_ms': 0.0, 'stdev_ms': 0.0, 'max_ms': 0.0}
+
+
+class TestSleepUntil:
+    """Testy dla funkcji sleep_until"""
+
+    def test_reaches_deadline(self):
+        """Test że funkcja nie wraca przed terminem"""
+        deadline = time.perf_counter() + 0.03
+        assert sleep_until(deadline)
+        assert time.perf_counter() >= deadline
+
+    def test_past_deadline(self):
+        """Test terminu, który już minął"""
+        assert sleep_until(time.perf_counter() - 1)
+
+    def test_stopped(self):
+        """Test zatrzymania zdarzeniem"""
+        stop = threading.Event()
+        stop.set()
+        assert not sleep_until(time.perf_counter() + 10, stop)
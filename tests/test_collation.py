@@ -0,0 +1,56 @@
+"""
+Testy jednostkowe dla modułu collation.py
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from metri.logic.collation import ALPHABET, collation_key
+
+
+class TestCollationKey:
+    """Testy dla funkcji collation_key"""
+
+    def test_polish_alphabet_order(self):
+        """Test kolejności liter polskiego alfabetu"""
+        letters = list(ALPHABET)
+        assert sorted(reversed(letters), key=collation_key) == letters
+
+    @pytest.mark.parametrize('lower, higher', [
+        ('Lis', 'Łabędź'),
+        ('Łza', 'Mak'),
+        ('Azalia', 'Ąę'),
+        ('Cyna', 'Ćma'),
+        ('Ewa', 'Ęa'),
+        ('Nuta', 'Ńa'),
+        ('Oset', 'Ósemka'),
+        ('Ósemka', 'Pies'),
+        ('Sypać', 'Śnieg'),
+        ('Zupa', 'Źródło'),
+        ('Źródło', 'Żaba'),
+    ])
+    def test_diacritics_after_base_letter(self, lower, higher):
+        """Test że polskie litery są po swojej literze bazowej"""
+        assert collation_key(lower) < collation_key(higher)
+
+    def test_case_insensitive_first(self):
+        """Test że wielkość liter rozstrzyga tylko remisy"""
+        assert collation_key('apple') < collation_key('Apple') < collation_key('apples')
+        assert collation_key('łza') < collation_key('Łza') < collation_key('łzy')
+
+    def test_foreign_accents(self):
+        """Test liter z obcymi akcentami"""
+        assert collation_key('cafe') < collation_key('café') < collation_key('cafes')
+        assert collation_key('Über') < collation_key('Vater')
+
+    def test_spaces_and_digits_before_letters(self):
+        """Test kolejności spacji, cyfr i liter"""
+        assert sorted(['Ala', 'Al b', '2 Ala', 'Ala ma'], key=collation_key) == ['2 Ala', 'Al b', 'Ala', 'Ala ma']
+
+    def test_bytes_key(self):
+        """Test że klucz jest typu bytes"""
+        assert isinstance(collation_key('Żółta łódź'), bytes)
+        assert collation_key('') < collation_key('a')
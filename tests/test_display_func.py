@@ -1,4 +1,5 @@
 import pytest
+import re
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
@@ -8,9 +9,14 @@ from metri.logic.display_func import (
     get_display_chords,
     get_display_2,
     get_display,
-    chords_to_scheme
+    render_html,
+    render_columns,
+    render_chords,
+    chords_to_scheme,
+    markup_runs,
+    split_columns
 )
-from metri.logic import song_func
+from metri.logic import display_func, song_func
 
 
 @pytest.fixture
@@ -327,6 +333,19 @@ class TestGetDisplay:
         assert "<code>" in result
         assert "</code>" in result
     
+    @pytest.mark.parametrize('chord_line, lyrics_line', [
+        ('C G', 'Line|one'),
+        ('C  G ', 'Line two'),
+        ('Am\tF', 'Ref|rain|x'),
+        (' Cmaj7 G', '|a|b|c'),
+        ('', 'x|y'),
+    ])
+    def test_chord_markup_matches_regex(self, chord_line, lyrics_line):
+        """Chord markup equals wrapping every non-space run of the aligned line."""
+        song = {'id': None, 'content': ['v'], 'lyrics': {'v': [lyrics_line]}, 'chords': {'v': [chord_line]}}
+        aligned = re.sub(r'([^\s]+)', r'<code>\1</code>', chords_to_scheme(chord_line, lyrics_line))
+        assert render_html(song) == f"<b>{aligned}</b>\n{lyrics_line.replace('|', '')}".strip()
+
     def test_second_voice_italicized(self):
         """Lines starting with ( are italicized."""
         result = get_display(5)
@@ -363,6 +382,180 @@ class TestGetDisplay:
         assert "<code>" in result
 
 
+class TestDisplayCache:
+    """Tests for the rendered display cache."""
+
+    def test_reopening_song_reuses_output(self, monkeypatch):
+        """Unchanged song is rendered only once per renderer."""
+        first = get_display(1)
+        with pytest.MonkeyPatch.context() as m:
+            m.setattr(display_func, '_build_html', lambda song: pytest.fail('rendered again'))
+            assert get_display(1) is first
+        assert get_display_2(1) == get_display_2(1)
+
+    def test_edited_song_rendered_again(self, sample_songs):
+        """Replacing the song dict (as song_edit does) invalidates its output."""
+        before = get_display_lyrics(1)
+        sample_songs[0] = dict(sample_songs[0], content=['c'])
+
+        after = get_display_lyrics(1)
+        assert after != before
+        assert after.startswith('[c]')
+
+    def test_columns_result_not_shared(self):
+        """Callers get their own copy of the [lyrics, chords] list."""
+        result = get_display_2(1)
+        result.append('extra')
+        assert len(get_display_2(1)) == 2
+
+    def test_cache_bounded(self, monkeypatch):
+        """Least recently used entries are evicted."""
+        monkeypatch.setattr(display_func, 'DISPLAY_CACHE_SIZE', 2)
+        display_func.clear_display_cache()
+        get_display(1)
+        get_display(2)
+        get_display(3)
+
+        assert len(display_func._display_cache) == 2
+        assert (1, 'html', 0) not in display_func._display_cache
+
+
+class TestRenderSongDict:
+    """Tests for renderers taking a song dict."""
+
+    def test_same_output_as_id_wrappers(self, sample_songs):
+        """render_* match the id-based functions."""
+        for song in sample_songs:
+            assert render_html(song) == get_display(song['id'])
+            assert render_columns(song) == get_display_2(song['id'])
+
+    def test_no_lookup(self, monkeypatch, sample_songs):
+        """Rendering a loaded song does not call get_song."""
+        monkeypatch.setattr(display_func, 'get_song', lambda song_id: pytest.fail('looked up'))
+        assert '<code>C</code>' in render_html(sample_songs[0])
+
+    def test_unsaved_song(self):
+        """Songs without an id (e.g. form preview) can be rendered."""
+        song = {'content': ['v'], 'lyrics': {'v': ['Hej']}, 'chords': {'v': ['C']}}
+        assert render_columns(song) == ['Hej', 'C']
+
+
+class TestMarkupRuns:
+    """Tests for turning HTML markup into tagged text runs."""
+
+    @pytest.fixture
+    def song(self):
+        return {
+            'id': None, 'title': 'Test', 'content': ['i', 'v', 'c', 's1'],
+            'lyrics': {'i': ['C G'], 'v': ['Hej |sokoły', '(drugi głos)'], 'c': ['Refren'], 's1': []},
+            'chords': {'v': ['C G'], 'c': ['Am F']},
+        }
+
+    def test_text_matches_markup(self, song):
+        """Joined runs give the markup text without tags."""
+        text = ''.join(text for text, tags in markup_runs(render_html(song)))
+        assert text.split('\n') == [
+            'C G', '', '    C     G ', 'Hej sokoły', '(drugi głos)', '',
+            '    Am F', '    Refren', '', '[Tabulatura: static/tab/test_1.svg]', '',
+        ]
+
+    def test_tags(self, song):
+        """Each kind of line gets its tag, chords and chorus lines are marked."""
+        runs = markup_runs(render_html(song))
+        tags_of = {text: tags for text, tags in runs if text.strip()}
+
+        assert tags_of['C G\n'] == ('intro',)
+        assert tags_of['C'] == ('chords', 'chord')
+        assert tags_of['Hej sokoły\n'] == ('lyrics',)
+        assert tags_of['(drugi głos)\n'] == ('second_voice',)
+        assert tags_of['Am'] == ('chords', 'chorus', 'chord')
+        assert tags_of['    Refren\n'] == ('lyrics', 'chorus')
+        assert tags_of['[Tabulatura: static/tab/test_1.svg]\n'] == ('tab',)
+        assert [tags for text, tags in runs if text == '\n' and tags == ('gap',)]
+
+    def test_empty(self):
+        """Empty markup gives no runs."""
+        assert markup_runs('') == []
+
+
+class TestSplitColumns:
+    """Tests for splitting side-by-side output into columns."""
+
+    def test_single_column(self):
+        """Lyrics and chords are paired line by line."""
+        assert split_columns(['a\nb\nc', 'C\nG']) == [[('a', 'C'), ('b', 'G'), ('c', '')]]
+
+    def test_last_column_takes_rest(self):
+        """No lines are lost when they do not fit the columns."""
+        lyrics = '\n'.join(str(i) for i in range(7))
+        columns = split_columns([lyrics, ''], columns=2, lines_per_column=3)
+        assert [[line for line, _ in column] for column in columns] == [['0', '1', '2'], ['3', '4', '5', '6']]
+
+
+class TestTransposition:
+    """Tests for the transpose parameter of the renderers."""
+
+    @pytest.fixture
+    def song(self):
+        return {
+            'id': 42, 'key': 'C',
+            'content': ['i', 'v'],
+            'lyrics': {'i': ['C G'], 'v': ['A |Capella Dla', 'Bez akordów']},
+            'chords': {'v': ['C/E G7', 'Am']},
+        }
+
+    def test_chords_transposed(self, song):
+        """Chord lines and intro lines move, lyrics stay."""
+        lyrics, chords = render_columns(song, 2)
+        assert chords.split('\n') == ['', '', 'D/F# A7', 'Bm']
+        assert lyrics.split('\n') == ['D A', '', 'A Capella Dla', 'Bez akordów']
+
+    def test_intro_section_with_lyrics_unchanged(self):
+        """Lyrics in an 'i' section (a section without chords) are not transposed."""
+        song = {
+            'id': 43, 'key': 'C', 'content': ['i'],
+            'lyrics': {'i': ['Dziwny jest ten świat', 'Gdzie jeszcze wciąż', 'C G']},
+            'chords': {},
+        }
+        lyrics, _ = render_columns(song, 2)
+        assert lyrics.split('\n') == ['Dziwny jest ten świat', 'Gdzie jeszcze wciąż', 'D A']
+        assert '<b>Dziwny jest ten świat</b>' in render_html(song, 2)
+
+    def test_zero_and_octave_unchanged(self, song):
+        """Transposing by 0 or 12 gives the original output."""
+        assert render_html(song, 12) == render_html(song, 0) == render_html(song)
+
+    def test_negative_equals_positive(self, song):
+        """-1 and +11 are the same transposition."""
+        assert render_html(song, -1) == render_html(song, 11)
+        assert '<code>F#7</code>' in render_html(song, -1)
+
+    def test_flat_key_spelling(self, song):
+        """Chords are spelled to suit the new key."""
+        assert render_chords(song, 1).split('\n')[1] == 'Db/F Ab7'
+        assert render_chords(song, 6).split('\n')[1] == 'F#/A# C#7'
+
+    def test_tokens_parsed_once(self, song, monkeypatch):
+        """Stepping through transpositions reuses the parsed chord lines."""
+        render_html(song, 1)
+        monkeypatch.setattr(display_func, 'song_chord_tokens', None)
+        for n in range(-11, 12):
+            render_html(song, n)
+
+    @pytest.mark.parametrize('key', ['', 'H'])
+    def test_unknown_key_keeps_accidentals(self, song, key):
+        """Without a known key each chord keeps its kind of accidental."""
+        song['key'] = key
+        song['chords']['v'] = ['C/E Bb7', 'Am']
+        assert render_chords(song, 1).split('\n')[1] == 'C#/F B7'
+        assert render_chords(song, 3).split('\n')[1] == 'D#/G Db7'
+
+    def test_id_wrappers_accept_transpose(self):
+        """The id-based functions pass transpose through."""
+        assert get_display_2(1, 2)[1] == render_columns(display_func.get_song(1), 2)[1]
+        assert '<code>D</code>' in get_display(1, 2)
+
+
 class TestIntegration:
     """Integration tests for display functions."""
     
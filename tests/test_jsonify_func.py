@@ -14,6 +14,7 @@ from metri.logic.jsonify_func import (
     redefine_sections,
     name_sections,
     del_repetitions,
+    parse_sections,
     song_data_jsonify_auto
 )
 
@@ -151,6 +152,36 @@ class TestRedefineSections:
         assert all(section['content'] for section in text)
 
 
+class TestParseSections:
+    """Testy dla funkcji parse_sections"""
+
+    @pytest.mark.parametrize('text', [
+        "",
+        "[Verse]\nC F G\nLine 1\nAm\n[Chorus]\nLine 2\nG   D\n[Solo]\nC G\nAm F",
+        "Line 1\nC G\n\n\n\nLine 2\n  \n\t\nC\n\n\n\n",
+        "[V] tekst\n[]\nLine\n[Intro 2]\n[\nC/E D#m Bb\nla la",
+        "Line 1\r\nC   G7\r\n[c]\r\nAm\r\nHej",
+    ])
+    def test_matches_split_and_redefine(self, text):
+        """Test zgodności z split_into_sections + redefine_sections"""
+        assert parse_sections(text) == redefine_sections(split_into_sections(text))
+
+    def test_chord_lines(self):
+        """Test rozpoznawania linii z akordami"""
+        result = parse_sections("[v]\nLyrics\nC G7 D/F# Bbmaj7 Esus4\nAm I\nA D E")
+        assert result[0]['chords'] == ["", "C G7 D/F# Bbmaj7 Esus4", "A D E"]
+        assert result[0]['lyrics'] == ["Lyrics", "Am I"]
+
+    def test_consecutive_empty_sections_removed(self):
+        """Test usuwania kolejnych pustych sekcji"""
+        text = [
+            {"section": "v", "content": ["Line"]},
+            {"section": "c", "content": []},
+            {"section": "i", "content": []},
+        ]
+        assert [section['section'] for section in redefine_sections(text)] == ["v"]
+
+
 class TestNameSections:
     """Testy dla funkcji name_sections"""
     
@@ -218,6 +249,26 @@ class TestNameSections:
         sections = [s['section'][0] for s in result]
         assert 'v' in sections or 'c' in sections or 'i' in sections
 
+    def test_name_sections_repeated_section_is_chorus(self):
+        """Test oznaczania powtórzonej sekcji jako refren"""
+        text = [
+            {"section": "v", "content": ["C F", "Line"], "chords": ["C F"], "lyrics": ["Line"]},
+            {"section": "v", "content": ["Other"], "chords": [], "lyrics": ["Other"]},
+            {"section": "s", "content": ["C F", "Line"], "chords": ["C F"], "lyrics": ["Line"]},
+        ]
+        result = name_sections(text)
+        assert [s['section'] for s in result] == ['c', 'v', 'c1']
+
+    def test_name_sections_same_chords_share_name(self):
+        """Test wspólnej nazwy sekcji o tych samych akordach"""
+        text = [
+            {"section": "v", "chords": ["C F"], "lyrics": ["Line 1"]},
+            {"section": "v", "chords": ["G"], "lyrics": ["Line 2"]},
+            {"section": "v", "chords": ["C F"], "lyrics": ["Line 3"]},
+        ]
+        result = name_sections(text)
+        assert [s['section'] for s in result] == ['v', 'va', 'v1']
+
 
 class TestDelRepetitions:
     """Testy dla funkcji del_repetitions"""
@@ -0,0 +1,176 @@
+"""
+Testy jednostkowe dla modułu keys.py
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from metri.logic.keys import (
+    FLAT_SCALE, transpose, transposed_key, get_key_table, parse_chord_line, spell_chord_line,
+    transpose_songbook
+)
+from metri.logic.song_repository import SongRepository
+
+
+class TestTranspose:
+    """Testy dla funkcji transpose"""
+
+    def test_transpose_up(self):
+        """Test transpozycji linii akordów w górę"""
+        assert transpose('C G Am F', 'C', 2) == 'D A Bm G'
+
+    def test_suffix_kept(self):
+        """Test zachowania sufiksów akordów"""
+        assert transpose('Cmaj7 Gsus4', 'C', 1) == 'C#maj7 G#sus4'
+
+    def test_relative_to_key(self):
+        """Test że wynik jest liczony względem tonacji"""
+        assert transpose('C', 'C', 2) == 'D'
+        assert transpose('G', 'G', 2) == 'D'
+
+    def test_unknown_key(self):
+        """Test nieznanej tonacji"""
+        with pytest.raises(ValueError):
+            transpose('C', 'H', 1)
+
+
+class TestTransposedKey:
+    """Testy dla funkcji transposed_key"""
+
+    @pytest.mark.parametrize('key, n, expected', [
+        ('C', 2, 'D'),
+        ('G', 2, 'A'),
+        ('F', -1, 'E'),
+        ('C', 1, 'Db'),
+        ('Am', 2, 'Bm'),
+        ('Em', 1, 'Fm'),
+        ('', 5, 'F'),
+        ('A', 12, 'A'),
+    ])
+    def test_transposed_key(self, key, n, expected):
+        """Test nazwy tonacji po transpozycji"""
+        assert transposed_key(key, n) == expected
+
+    def test_unknown_key(self):
+        """Test nieznanej tonacji"""
+        with pytest.raises(ValueError):
+            transposed_key('X', 1)
+
+    def test_key_table_spelling(self):
+        """Test pisowni dźwięków w tonacjach krzyżykowych i bemolowych"""
+        assert get_key_table('D')[6] == 'F#'
+        assert get_key_table('Bb')[10] == 'Bb'
+
+
+class TestChordTokens:
+    """Testy dla parse_chord_line i spell_chord_line"""
+
+    def test_parse(self):
+        """Test podziału linii na akordy"""
+        assert parse_chord_line('Am7/G  F#') == (
+            (0, 5, 9, '', 'm7/G', 'm7', 7, ''),
+            (7, 9, 6, '#', '', '', None, ''),
+        )
+        assert parse_chord_line('(x2)') == ()
+
+    def test_parse_cached(self):
+        """Test że ta sama linia jest parsowana raz"""
+        assert parse_chord_line('C G Am F') is parse_chord_line('C G Am F')
+
+    def test_spell_keeps_columns(self):
+        """Test zachowania odstępów między akordami"""
+        line = '  C    G7 (x2)'
+        assert spell_chord_line(line, parse_chord_line(line), 2) == '  D    A7 (x2)'
+
+    def test_spell_bass(self):
+        """Test transpozycji basu"""
+        line = 'C/E Dm7/C'
+        assert spell_chord_line(line, parse_chord_line(line), 1, FLAT_SCALE) == 'Db/F Ebm7/Db'
+        assert spell_chord_line(line, parse_chord_line(line), 1, bass=False) == 'C#/E D#m7/C'
+
+    def test_spell_accidental_preference(self):
+        """Test zachowania rodzaju znaków chromatycznych bez tonacji"""
+        line = 'Bb F#'
+        assert spell_chord_line(line, parse_chord_line(line), 1) == 'B G'
+        assert spell_chord_line(line, parse_chord_line(line), 2) == 'C G#'
+        assert spell_chord_line(line, parse_chord_line(line), 3) == 'Db A'
+
+
+def make_song(song_id, key, capo='', chords=('C G/B Am',)):
+    return {'id': song_id, 'title': f'Song {song_id}', 'key': key, 'capo': capo,
+            'content': ['i', 'v'], 'lyrics': {'i': ['C F'], 'v': ['Tekst']}, 'chords': {'v': list(chords)}}
+
+
+class TestTransposeSongbook:
+    """Testy dla funkcji transpose_songbook"""
+
+    def test_semitones(self):
+        """Test przesunięcia wszystkich piosenek o tyle samo półtonów"""
+        songs = [make_song(1, 'C'), make_song(2, 'Am', chords=['Am E7'])]
+        result = transpose_songbook(songs, semitones=2)
+
+        assert [song['key'] for song in result] == ['D', 'Bm']
+        assert result[0]['chords']['v'] == ['D A/C# Bm']
+        assert result[0]['lyrics'] == {'i': ['D G'], 'v': ['Tekst']}
+        assert result[1]['chords']['v'] == ['Bm F#7']
+        assert songs[0]['chords']['v'] == ['C G/B Am']
+
+    def test_target_key_with_capo(self):
+        """Test docelowej tonacji z uwzględnieniem kapodastra"""
+        songs = [make_song(1, 'C'), make_song(2, 'C', capo='2'), make_song(3, 'G', capo='bad')]
+        result = transpose_songbook(songs, target_key='D')
+
+        assert result[0]['chords']['v'] == ['D A/C# Bm']
+        assert result[1] is songs[1]  # already sounds in D
+        assert transpose_songbook([make_song(4, 'G', capo='2')], target_key='A')[0]['key'] == 'G'  # sounds in A
+        assert result[2]['key'] == 'D'
+        assert result[2]['chords']['v'] == ['G D/F# Em']  # G -> D moves down a fourth
+
+    def test_target_key_skips_unknown_keys(self):
+        """Test pomijania piosenek bez tonacji"""
+        songs = [make_song(1, ''), make_song(2, 'H')]
+        assert transpose_songbook(songs, target_key='E') == songs
+
+    def test_flat_spelling(self):
+        """Test pisowni bemolowej w tonacjach bemolowych"""
+        result = transpose_songbook([make_song(1, 'C')], semitones=-2)
+        assert result[0]['key'] == 'Bb'
+        assert result[0]['chords']['v'] == ['Bb F/A Gm']
+
+    def test_invalid_arguments(self):
+        """Test niepoprawnych argumentów"""
+        with pytest.raises(ValueError):
+            transpose_songbook([], semitones=1, target_key='C')
+        with pytest.raises(ValueError):
+            transpose_songbook([])
+        with pytest.raises(ValueError):
+            transpose_songbook([], target_key='X')
+
+    def test_save_in_one_write(self, monkeypatch):
+        """Test zapisu wyników jednym wywołaniem save_songs"""
+        songs = [make_song(i, 'C') for i in range(1, 4)]
+        repository = SongRepository.from_songs(songs)
+        monkeypatch.setattr('metri.logic.song_func.get_repository', lambda: repository)
+        saves = []
+        monkeypatch.setattr(repository, 'save', saves.append)
+
+        transpose_songbook(songs[1:], semitones=5, save=True)
+
+        assert len(saves) == 1
+        assert [song['key'] for song in saves[0]] == ['C', 'F', 'F']
+
+    def test_save_keeps_intro_lyrics(self, monkeypatch):
+        """Test że zapis nie zmienia tekstu w sekcjach 'i' bez akordów"""
+        song = dict(make_song(1, 'C'), lyrics={'i': ['Dziwny jest ten świat', 'C F'], 'v': ['Tekst']})
+        repository = SongRepository.from_songs([song])
+        monkeypatch.setattr('metri.logic.song_func.get_repository', lambda: repository)
+        saves = []
+        monkeypatch.setattr(repository, 'save', saves.append)
+
+        result = transpose_songbook([song], semitones=2, save=True)
+
+        assert result[0]['lyrics']['i'] == ['Dziwny jest ten świat', 'D G']
+        assert saves[0][0]['lyrics']['i'] == ['Dziwny jest ten świat', 'D G']
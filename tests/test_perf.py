@@ -1,6 +1,9 @@
 import pytest
 
-from metri.logic import display_func, jsonify_func, song_func
+from metri.logic import display_func, jsonify_func, keys, song_func
+from metri.logic.song_repository import SongRepository
+from metri.logic.song_snapshot import BinaryStorage
+from metri.logic.song_storage import JsonStorage
 
 pytestmark = [pytest.mark.perf]
 
@@ -87,6 +90,48 @@ def huge_songbook():
     return songs
 
 
+@pytest.fixture(scope="module")
+def songbook_50k():
+    songs = []
+    for idx in range(1, 50001):
+        songs.append(
+            {
+                "id": idx,
+                "title": f"Piosenka {idx} o {'górach' if idx % 7 == 0 else 'morzu'}",
+                "artist": f"Artysta {idx % 300}",
+                "group": f"Grupa {idx % 40}",
+                "language": "polski" if idx % 4 == 0 else "angielski",
+                "tags": ["rock", "live"] if idx % 5 == 0 else ["folk"],
+            }
+        )
+    return songs
+
+
+@pytest.fixture(scope="module")
+def songbook_files(tmp_path_factory):
+    """songs.json and songs.bin with 3,000 songs of 120 lines each."""
+    def section(idx, name):
+        return [f"{idx}{name} {line}: Hej, tam gdzieś z nad czarnej wody|siada na koń" for line in range(40)]
+
+    chords = ["C G/B Am7 F", "Dm7 G7sus4 C"] * 20
+    songs = [
+        {
+            "id": idx,
+            "title": f"Piosenka {idx}",
+            "artist": f"Artysta {idx % 50}",
+            "tags": ["folk"],
+            "content": ["v", "v2", "c"],
+            "lyrics": {name: section(idx, name) for name in ("v", "v2", "c")},
+            "chords": {"v": chords, "c": chords},
+        }
+        for idx in range(1, 3001)
+    ]
+    path = str(tmp_path_factory.mktemp("songbook") / "songs.json")
+    JsonStorage(path).write(songs)
+    BinaryStorage(path).write(songs)
+    return path
+
+
 @pytest.fixture(scope="module")
 def very_long_song_text():
     verse = "|C G Am F| " + "lorem ipsum " * 10
@@ -131,6 +176,7 @@ def test_display_html_many_songs(benchmark, monkeypatch, songs_dataset):
     monkeypatch.setattr(song_func, "get_song", lambda song_id: songs_by_id[song_id])
 
     def run():
+        display_func.clear_display_cache()
         for song in songs_dataset:
             display_func.get_display(song["id"])
 
@@ -143,12 +189,44 @@ def test_display_plaintext_many_songs(benchmark, monkeypatch, songs_dataset):
     monkeypatch.setattr(song_func, "get_song", lambda song_id: songs_by_id[song_id])
 
     def run():
+        display_func.clear_display_cache()
         for song in songs_dataset:
             display_func.get_display_2(song["id"])
 
     benchmark(run)
 
 
+def test_display_reopen_cached(benchmark, monkeypatch, songs_dataset):
+    songs_by_id = {song["id"]: song for song in songs_dataset}
+    monkeypatch.setattr(display_func, "get_song", lambda song_id: songs_by_id[song_id])
+    song_id = songs_dataset[0]["id"]
+    display_func.get_display(song_id)
+
+    benchmark(display_func.get_display, song_id)
+
+
+def test_transpose_long_song_all_steps(benchmark):
+    chords = {f"v{idx}": ["C G/B Am7 F", "Dm7 G7sus4 C", "Bb F/A Gm C7"] * 10 for idx in range(20)}
+    song = {"id": 1, "key": "C", "content": list(chords), "lyrics": {}, "chords": chords}
+
+    def run():
+        display_func.clear_display_cache()
+        for step in range(-11, 12):
+            display_func.transposed_song(song, step)
+
+    benchmark(run)
+
+
+def test_transpose_songbook_5k(benchmark):
+    chords = {"v": ["C G/B Am7 F", "Dm7 G7sus4 C"], "c": ["F C/E Dm G", "Bb F/A Gm C7"]}
+    songs = [
+        {"id": idx, "key": "C", "capo": str(idx % 4), "content": ["v", "c"], "lyrics": {}, "chords": chords}
+        for idx in range(1, 5001)
+    ]
+
+    benchmark(keys.transpose_songbook, songs, target_key="E")
+
+
 def test_jsonify_auto_bulk(benchmark, raw_song_inputs):
     def run():
         for idx, raw in enumerate(raw_song_inputs, start=1):
@@ -158,7 +236,8 @@ def test_jsonify_auto_bulk(benchmark, raw_song_inputs):
 
 
 def test_filter_songs_large_dataset(benchmark, monkeypatch, large_songbook):
-    monkeypatch.setattr(song_func, "load_songs", lambda: large_songbook)
+    repository = SongRepository.from_songs(large_songbook)
+    monkeypatch.setattr(song_func, "get_repository", lambda: repository)
 
     def run():
         song_func.filter_songs({"search": "title", "language": "polski", "tags": ["folk"]})
@@ -167,7 +246,8 @@ def test_filter_songs_large_dataset(benchmark, monkeypatch, large_songbook):
 
 
 def test_get_tags_large_dataset(benchmark, monkeypatch, large_songbook):
-    monkeypatch.setattr(song_func, "load_songs", lambda: large_songbook)
+    repository = SongRepository.from_songs(large_songbook)
+    monkeypatch.setattr(song_func, "get_repository", lambda: repository)
 
     def run():
         song_func.get_tags()
@@ -176,7 +256,8 @@ def test_get_tags_large_dataset(benchmark, monkeypatch, large_songbook):
 
 
 def test_filter_songs_huge_dataset(benchmark, monkeypatch, huge_songbook):
-    monkeypatch.setattr(song_func, "load_songs", lambda: huge_songbook)
+    repository = SongRepository.from_songs(huge_songbook)
+    monkeypatch.setattr(song_func, "get_repository", lambda: repository)
 
     def run():
         song_func.filter_songs({"search": "ballada", "language": "polski", "tags": ["rock"]})
@@ -184,8 +265,22 @@ def test_filter_songs_huge_dataset(benchmark, monkeypatch, huge_songbook):
     benchmark(run)
 
 
+def test_search_songs_50k(benchmark, monkeypatch, songbook_50k):
+    repository = SongRepository.from_songs(songbook_50k)
+    index = repository.index()
+    monkeypatch.setattr(song_func, "get_repository", lambda: repository)
+
+    def run():
+        # measure the search itself, not a hit in the query result cache
+        index._results.clear()
+        song_func.filter_songs({"search": "artysta 12", "order": "asc"})
+
+    benchmark(run)
+
+
 def test_list_many_songs_mapping(benchmark, monkeypatch, huge_songbook):
-    monkeypatch.setattr(song_func, "load_songs", lambda: huge_songbook)
+    repository = SongRepository.from_songs(huge_songbook)
+    monkeypatch.setattr(song_func, "get_repository", lambda: repository)
 
     def run():
         songs = song_func.load_songs()
@@ -203,6 +298,14 @@ def test_list_many_songs_mapping(benchmark, monkeypatch, huge_songbook):
     benchmark(run)
 
 
+def test_load_song_list_json(benchmark, songbook_files):
+    benchmark(lambda: [song["title"] for song in JsonStorage(songbook_files).read()])
+
+
+def test_load_song_list_binary(benchmark, songbook_files):
+    benchmark(lambda: [song["title"] for song in BinaryStorage(songbook_files).read()])
+
+
 def test_add_very_long_song_jsonify(benchmark, very_long_song_text):
     def run():
         jsonify_func.song_data_jsonify_auto(very_long_song_text, 999_001)
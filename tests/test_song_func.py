@@ -12,19 +12,33 @@ from unittest.mock import patch, MagicMock
 # Dodaj src do ścieżki Python
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
+from metri.logic.song_repository import SongRepository
 from metri.logic.song_func import (
     get_objective_key,
     filter_songs,
+    iter_filtered_songs,
     get_tags,
     get_song,
     load_songs,
     save_songs,
     get_new_song,
     remove_song,
+    delete_songs,
+    upsert_song,
     get_songs_by_ids
 )
 
 
+@pytest.fixture
+def songbook(monkeypatch):
+    """Podstawia repozytorium w pamięci zamiast pliku songs.json"""
+    def use_songs(songs):
+        repository = SongRepository.from_songs(songs)
+        monkeypatch.setattr('metri.logic.song_func.get_repository', lambda: repository)
+        return repository
+    return use_songs
+
+
 class TestGetObjectiveKey:
     """Testy dla funkcji get_objective_key"""
     
@@ -69,6 +83,14 @@ class TestGetObjectiveKey:
         mock_get_song.return_value = {'key': 'C', 'capo': 'invalid'}
         result = get_objective_key(1)
         assert result == 'C'  # Domyślnie capo = 0
+
+    @patch('metri.logic.song_func.get_song')
+    def test_get_objective_key_not_c(self, mock_get_song):
+        """Test tonacji innej niż C z kapodastrem"""
+        mock_get_song.return_value = {'key': 'G', 'capo': 2}
+        assert get_objective_key(1) == 'A'
+        mock_get_song.return_value = {'key': 'Am', 'capo': 3}
+        assert get_objective_key(1) == 'Cm'
     
     @patch('metri.logic.song_func.get_song')
     def test_get_objective_key_song_not_found(self, mock_get_song):
@@ -81,136 +103,126 @@ class TestGetObjectiveKey:
 class TestFilterSongs:
     """Testy dla funkcji filter_songs"""
     
-    @patch('metri.logic.song_func.load_songs')
-    def test_filter_songs_no_filters(self, mock_load):
+    def test_filter_songs_no_filters(self, songbook):
         """Test bez filtrów - zwraca wszystkie piosenki"""
         mock_songs = [
             {'id': 1, 'title': 'Song A'},
             {'id': 2, 'title': 'Song B'}
         ]
-        mock_load.return_value = mock_songs
+        songbook(mock_songs)
         
         result = filter_songs({})
         assert len(result) == 2
     
-    @patch('metri.logic.song_func.load_songs')
-    def test_filter_songs_by_search_title(self, mock_load):
+    def test_filter_songs_by_search_title(self, songbook):
         """Test filtrowania po tytule"""
         mock_songs = [
             {'id': 1, 'title': 'Rock Song', 'artist': '', 'group': ''},
             {'id': 2, 'title': 'Pop Song', 'artist': '', 'group': ''},
             {'id': 3, 'title': 'Another Rock', 'artist': '', 'group': ''}
         ]
-        mock_load.return_value = mock_songs
+        songbook(mock_songs)
         
         result = filter_songs({'search': 'rock'})
         assert len(result) == 2
         assert all('rock' in song['title'].lower() for song in result)
     
-    @patch('metri.logic.song_func.load_songs')
-    def test_filter_songs_by_search_artist(self, mock_load):
+    def test_filter_songs_by_search_artist(self, songbook):
         """Test filtrowania po artyście"""
         mock_songs = [
             {'id': 1, 'title': 'Song 1', 'artist': 'Beatles', 'group': ''},
             {'id': 2, 'title': 'Song 2', 'artist': 'Queen', 'group': ''},
             {'id': 3, 'title': 'Song 3', 'artist': 'The Beatles', 'group': ''}
         ]
-        mock_load.return_value = mock_songs
+        songbook(mock_songs)
         
         result = filter_songs({'search': 'beatles'})
         assert len(result) == 2
     
-    @patch('metri.logic.song_func.load_songs')
-    def test_filter_songs_by_language(self, mock_load):
+    def test_filter_songs_by_language(self, songbook):
         """Test filtrowania po języku"""
         mock_songs = [
             {'id': 1, 'title': 'Song 1', 'language': 'polski', 'artist': '', 'group': ''},
             {'id': 2, 'title': 'Song 2', 'language': 'english', 'artist': '', 'group': ''},
             {'id': 3, 'title': 'Song 3', 'language': 'polski', 'artist': '', 'group': ''}
         ]
-        mock_load.return_value = mock_songs
+        songbook(mock_songs)
         
         result = filter_songs({'language': 'polski'})
         assert len(result) == 2
         assert all(song['language'] == 'polski' for song in result)
     
-    @patch('metri.logic.song_func.load_songs')
-    def test_filter_songs_by_tags_single(self, mock_load):
+    def test_filter_songs_by_tags_single(self, songbook):
         """Test filtrowania po pojedynczym tagu"""
         mock_songs = [
             {'id': 1, 'title': 'Song 1', 'tags': ['rock', 'ballad'], 'artist': '', 'group': ''},
             {'id': 2, 'title': 'Song 2', 'tags': ['pop'], 'artist': '', 'group': ''},
             {'id': 3, 'title': 'Song 3', 'tags': ['rock'], 'artist': '', 'group': ''}
         ]
-        mock_load.return_value = mock_songs
+        songbook(mock_songs)
         
         result = filter_songs({'tags': 'rock'})
         assert len(result) == 2
     
-    @patch('metri.logic.song_func.load_songs')
-    def test_filter_songs_by_tags_multiple(self, mock_load):
+    def test_filter_songs_by_tags_multiple(self, songbook):
         """Test filtrowania po wielu tagach"""
         mock_songs = [
             {'id': 1, 'title': 'Song 1', 'tags': ['rock', 'ballad'], 'artist': '', 'group': ''},
             {'id': 2, 'title': 'Song 2', 'tags': ['pop'], 'artist': '', 'group': ''},
             {'id': 3, 'title': 'Song 3', 'tags': ['jazz', 'ballad'], 'artist': '', 'group': ''}
         ]
-        mock_load.return_value = mock_songs
+        songbook(mock_songs)
         
         result = filter_songs({'tags': ['rock', 'ballad']})
         assert len(result) >= 2
     
-    @patch('metri.logic.song_func.load_songs')
-    def test_filter_songs_sort_by_title(self, mock_load):
+    def test_filter_songs_sort_by_title(self, songbook):
         """Test sortowania po tytule"""
         mock_songs = [
             {'id': 1, 'title': 'Zebra Song', 'artist': '', 'group': ''},
             {'id': 2, 'title': 'Apple Song', 'artist': '', 'group': ''},
             {'id': 3, 'title': 'Banana Song', 'artist': '', 'group': ''}
         ]
-        mock_load.return_value = mock_songs
+        songbook(mock_songs)
         
         result = filter_songs({'sort_by': 'title'})
         assert result[0]['title'] == 'Apple Song'
         assert result[-1]['title'] == 'Zebra Song'
     
-    @patch('metri.logic.song_func.load_songs')
-    def test_filter_songs_sort_by_artist(self, mock_load):
+    def test_filter_songs_sort_by_artist(self, songbook):
         """Test sortowania po artyście"""
         mock_songs = [
             {'id': 1, 'title': 'Song 1', 'artist': 'Zebra Band', 'group': ''},
             {'id': 2, 'title': 'Song 2', 'artist': 'Alpha Band', 'group': ''},
             {'id': 3, 'title': 'Song 3', 'artist': 'Beta Band', 'group': ''}
         ]
-        mock_load.return_value = mock_songs
+        songbook(mock_songs)
         
         result = filter_songs({'sort_by': 'artist'})
         assert result[0]['artist'] == 'Alpha Band'
         assert result[-1]['artist'] == 'Zebra Band'
     
-    @patch('metri.logic.song_func.load_songs')
-    def test_filter_songs_sort_descending(self, mock_load):
+    def test_filter_songs_sort_descending(self, songbook):
         """Test sortowania malejącego"""
         mock_songs = [
             {'id': 1, 'title': 'Apple', 'artist': '', 'group': ''},
             {'id': 2, 'title': 'Banana', 'artist': '', 'group': ''},
             {'id': 3, 'title': 'Cherry', 'artist': '', 'group': ''}
         ]
-        mock_load.return_value = mock_songs
+        songbook(mock_songs)
         
         result = filter_songs({'sort_by': 'title', 'order': 'desc'})
         assert result[0]['title'] == 'Cherry'
         assert result[-1]['title'] == 'Apple'
     
-    @patch('metri.logic.song_func.load_songs')
-    def test_filter_songs_combined_filters(self, mock_load):
+    def test_filter_songs_combined_filters(self, songbook):
         """Test kombinacji filtrów"""
         mock_songs = [
             {'id': 1, 'title': 'Rock Song A', 'artist': 'Band X', 'language': 'polski', 'tags': ['rock'], 'group': ''},
             {'id': 2, 'title': 'Rock Song B', 'artist': 'Band Y', 'language': 'english', 'tags': ['rock'], 'group': ''},
             {'id': 3, 'title': 'Pop Song', 'artist': 'Band Z', 'language': 'polski', 'tags': ['pop'], 'group': ''}
         ]
-        mock_load.return_value = mock_songs
+        songbook(mock_songs)
         
         result = filter_songs({
             'search': 'rock',
@@ -221,18 +233,60 @@ class TestFilterSongs:
         assert result[0]['id'] == 1
 
 
+class TestIterFilteredSongs:
+    """Testy dla funkcji iter_filtered_songs"""
+
+    @pytest.fixture
+    def many_songs(self, songbook):
+        songs = [{'id': i, 'title': f'Song {i:03}', 'artist': '', 'group': ''} for i in range(1, 101)]
+        songbook(songs)
+        return songs
+
+    @pytest.mark.parametrize('search_args', [{}, {'sort_by': 'title', 'order': 'desc'}, {'search': 'song 0'}])
+    def test_matches_filter_songs(self, many_songs, search_args):
+        """Test zgodności z filter_songs"""
+        assert list(iter_filtered_songs(search_args)) == filter_songs(search_args)
+
+    def test_offset_and_limit(self, many_songs):
+        """Test stronicowania wyników"""
+        search_args = {'sort_by': 'title', 'order': 'desc'}
+        page = list(iter_filtered_songs(search_args, offset=10, limit=5))
+        assert page == filter_songs(search_args)[10:15]
+        assert list(iter_filtered_songs(search_args, offset=200)) == []
+
+    def test_lazy(self, many_songs):
+        """Test że wyniki są zwracane leniwie"""
+        songs = iter_filtered_songs({'sort_by': 'title'})
+        assert not isinstance(songs, list)
+        assert next(songs)['title'] == 'Song 001'
+
+    def test_file_backed_repository(self, tmp_path, monkeypatch):
+        """Test wczytania i przeładowania pliku przy przeglądaniu bez filtrów"""
+        songs_path = tmp_path / 'songs.json'
+        songs_path.write_text(json.dumps([{'id': 1, 'title': 'A'}, {'id': 2, 'title': 'B'}]), encoding='utf-8')
+        repository = SongRepository(str(songs_path))
+        monkeypatch.setattr('metri.logic.song_func.get_repository', lambda: repository)
+
+        assert list(iter_filtered_songs({})) == filter_songs({})
+        assert [song['id'] for song in iter_filtered_songs({})] == [1, 2]
+
+        songs_path.write_text(json.dumps([{'id': 3, 'title': 'C'}]), encoding='utf-8')
+        stat = os.stat(songs_path)
+        os.utime(songs_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert [song['id'] for song in iter_filtered_songs({})] == [3]
+
+
 class TestGetTags:
     """Testy dla funkcji get_tags"""
     
-    @patch('metri.logic.song_func.load_songs')
-    def test_get_tags_from_songs(self, mock_load):
+    def test_get_tags_from_songs(self, songbook):
         """Test pobierania tagów z piosenek"""
         mock_songs = [
             {'id': 1, 'tags': ['rock', 'ballad']},
             {'id': 2, 'tags': ['pop', 'rock']},
             {'id': 3, 'tags': ['jazz']}
         ]
-        mock_load.return_value = mock_songs
+        songbook(mock_songs)
         
         result = get_tags()
         assert 'rock' in result
@@ -240,48 +294,44 @@ class TestGetTags:
         assert 'ballad' in result
         assert 'jazz' in result
     
-    @patch('metri.logic.song_func.load_songs')
-    def test_get_tags_unique(self, mock_load):
+    def test_get_tags_unique(self, songbook):
         """Test że tagi są unikalne"""
         mock_songs = [
             {'id': 1, 'tags': ['rock', 'rock', 'pop']},
             {'id': 2, 'tags': ['rock', 'jazz']}
         ]
-        mock_load.return_value = mock_songs
+        songbook(mock_songs)
         
         result = get_tags()
         assert result.count('rock') == 1
     
-    @patch('metri.logic.song_func.load_songs')
-    def test_get_tags_sorted(self, mock_load):
+    def test_get_tags_sorted(self, songbook):
         """Test że tagi są posortowane"""
         mock_songs = [
             {'id': 1, 'tags': ['zebra', 'apple', 'banana']}
         ]
-        mock_load.return_value = mock_songs
+        songbook(mock_songs)
         
         result = get_tags()
         assert result == sorted(result)
     
-    @patch('metri.logic.song_func.load_songs')
-    def test_get_tags_case_insensitive(self, mock_load):
+    def test_get_tags_case_insensitive(self, songbook):
         """Test że tagi są normalizowane do małych liter"""
         mock_songs = [
             {'id': 1, 'tags': ['Rock', 'JAZZ', 'Pop']}
         ]
-        mock_load.return_value = mock_songs
+        songbook(mock_songs)
         
         result = get_tags()
         assert all(tag.islower() for tag in result)
     
-    @patch('metri.logic.song_func.load_songs')
-    def test_get_tags_no_tags(self, mock_load):
+    def test_get_tags_no_tags(self, songbook):
         """Test piosenek bez tagów"""
         mock_songs = [
             {'id': 1},
             {'id': 2, 'tags': []}
         ]
-        mock_load.return_value = mock_songs
+        songbook(mock_songs)
         
         result = get_tags()
         assert result == []
@@ -290,57 +340,52 @@ class TestGetTags:
 class TestGetSong:
     """Testy dla funkcji get_song"""
     
-    @patch('metri.logic.song_func.load_songs')
-    def test_get_song_found(self, mock_load):
+    def test_get_song_found(self, songbook):
         """Test znalezienia piosenki"""
         mock_songs = [
             {'id': 1, 'title': 'Song 1'},
             {'id': 2, 'title': 'Song 2'}
         ]
-        mock_load.return_value = mock_songs
+        songbook(mock_songs)
         
         result = get_song(1)
         assert result is not None
         assert result['id'] == 1
         assert result['title'] == 'Song 1'
     
-    @patch('metri.logic.song_func.load_songs')
-    def test_get_song_not_found(self, mock_load):
+    def test_get_song_not_found(self, songbook):
         """Test nieznalezionej piosenki"""
         mock_songs = [{'id': 1, 'title': 'Song 1'}]
-        mock_load.return_value = mock_songs
+        songbook(mock_songs)
         
         result = get_song(999)
         assert result is None
     
-    @patch('metri.logic.song_func.load_songs')
-    def test_get_song_string_id(self, mock_load):
+    def test_get_song_string_id(self, songbook):
         """Test z ID jako string"""
         mock_songs = [{'id': 1, 'title': 'Song 1'}]
-        mock_load.return_value = mock_songs
+        songbook(mock_songs)
         
         result = get_song('1')
         assert result is not None
         assert result['id'] == 1
     
-    @patch('metri.logic.song_func.load_songs')
-    def test_get_song_invalid_id(self, mock_load):
+    def test_get_song_invalid_id(self, songbook):
         """Test z nieprawidłowym ID"""
         mock_songs = [{'id': 1, 'title': 'Song 1'}]
-        mock_load.return_value = mock_songs
+        songbook(mock_songs)
         
         result = get_song('invalid')
         assert result is None
     
-    @patch('metri.logic.song_func.load_songs')
-    def test_get_song_filters_none_values(self, mock_load):
+    def test_get_song_filters_none_values(self, songbook):
         """Test filtrowania wartości None"""
         mock_songs = [
             {'id': 1, 'title': 'Song 1'},
             None,
             {'id': 2, 'title': 'Song 2'}
         ]
-        mock_load.return_value = mock_songs
+        songbook(mock_songs)
         
         result = get_song(1)
         assert result is not None
@@ -349,48 +394,56 @@ class TestGetSong:
 class TestGetSongsByIds:
     """Testy dla funkcji get_songs_by_ids"""
     
-    @patch('metri.logic.song_func.load_songs')
-    def test_get_songs_by_ids_single(self, mock_load):
+    def test_get_songs_by_ids_single(self, songbook):
         """Test pobierania pojedynczej piosenki"""
         mock_songs = [
             {'id': 1, 'title': 'Song 1'},
             {'id': 2, 'title': 'Song 2'}
         ]
-        mock_load.return_value = mock_songs
+        songbook(mock_songs)
         
         result = get_songs_by_ids([1])
         assert len(result) == 1
         assert result[0]['id'] == 1
     
-    @patch('metri.logic.song_func.load_songs')
-    def test_get_songs_by_ids_multiple(self, mock_load):
+    def test_get_songs_by_ids_multiple(self, songbook):
         """Test pobierania wielu piosenek"""
         mock_songs = [
             {'id': 1, 'title': 'Song 1'},
             {'id': 2, 'title': 'Song 2'},
             {'id': 3, 'title': 'Song 3'}
         ]
-        mock_load.return_value = mock_songs
+        songbook(mock_songs)
         
         result = get_songs_by_ids([1, 3])
         assert len(result) == 2
         assert any(s['id'] == 1 for s in result)
         assert any(s['id'] == 3 for s in result)
     
-    @patch('metri.logic.song_func.load_songs')
-    def test_get_songs_by_ids_not_found(self, mock_load):
+    def test_get_songs_by_ids_not_found(self, songbook):
         """Test z nieistniejącymi ID"""
         mock_songs = [{'id': 1, 'title': 'Song 1'}]
-        mock_load.return_value = mock_songs
+        songbook(mock_songs)
         
         result = get_songs_by_ids([999])
         assert len(result) == 0
+
+    def test_get_songs_by_ids_songbook_order(self, songbook):
+        """Test że piosenki są zwracane w kolejności śpiewnika"""
+        mock_songs = [
+            {'id': 1, 'title': 'Song 1'},
+            {'id': 2, 'title': 'Song 2'},
+            {'id': 3, 'title': 'Song 3'}
+        ]
+        songbook(mock_songs)
+
+        result = get_songs_by_ids(['3', 1, 3])
+        assert [s['id'] for s in result] == [1, 3]
     
-    @patch('metri.logic.song_func.load_songs')
-    def test_get_songs_by_ids_empty_list(self, mock_load):
+    def test_get_songs_by_ids_empty_list(self, songbook):
         """Test z pustą listą ID"""
         mock_songs = [{'id': 1, 'title': 'Song 1'}]
-        mock_load.return_value = mock_songs
+        songbook(mock_songs)
         
         result = get_songs_by_ids([])
         assert len(result) == 0
@@ -399,41 +452,97 @@ class TestGetSongsByIds:
 class TestRemoveSong:
     """Testy dla funkcji remove_song"""
     
-    @patch('metri.logic.song_func.save_songs')
-    @patch('metri.logic.song_func.load_songs')
-    def test_remove_song_success(self, mock_load, mock_save):
+    def test_remove_song_success(self, songbook):
         """Test pomyślnego usunięcia piosenki"""
         mock_songs = [
             {'id': 1, 'title': 'Song 1'},
             {'id': 2, 'title': 'Song 2'}
         ]
-        mock_load.return_value = mock_songs
+        repository = songbook(mock_songs)
         
         result = remove_song(1)
         assert result is True
-        mock_save.assert_called_once()
+        assert repository.get(1) is None
+        assert [song['id'] for song in repository.songs()] == [2]
     
-    @patch('metri.logic.song_func.save_songs')
-    @patch('metri.logic.song_func.load_songs')
-    def test_remove_song_not_found(self, mock_load, mock_save):
+    def test_remove_song_not_found(self, songbook):
         """Test usuwania nieistniejącej piosenki"""
         mock_songs = [{'id': 1, 'title': 'Song 1'}]
-        mock_load.return_value = mock_songs
+        songbook(mock_songs)
         
         result = remove_song(999)
         assert result is False
     
-    @patch('metri.logic.song_func.save_songs')
-    @patch('metri.logic.song_func.load_songs')
-    def test_remove_song_invalid_id(self, mock_load, mock_save):
+    def test_remove_song_invalid_id(self, songbook):
         """Test nieprawidłowego ID"""
         mock_songs = [{'id': 1, 'title': 'Song 1'}]
-        mock_load.return_value = mock_songs
+        songbook(mock_songs)
         
         result = remove_song('invalid')
         assert result is False
 
 
+class TestDeleteSongs:
+    """Testy dla funkcji delete_songs"""
+
+    def test_delete_many_single_write(self, songbook):
+        """Test usunięcia wielu piosenek jednym zapisem"""
+        repository = songbook([{'id': i, 'title': f'Song {i}'} for i in range(1, 6)])
+
+        with patch.object(repository, '_write', wraps=repository._write) as mock_write:
+            result = delete_songs([1, '3', 5, 999])
+
+        assert result == 3
+        mock_write.assert_called_once()
+        assert [song['id'] for song in repository.songs()] == [2, 4]
+
+    def test_delete_nothing_does_not_write(self, songbook):
+        """Test że brak zmian nie powoduje zapisu"""
+        repository = songbook([{'id': 1}])
+
+        with patch.object(repository, '_write') as mock_write:
+            assert delete_songs([7]) == 0
+
+        mock_write.assert_not_called()
+
+
+class TestUpsertSong:
+    """Testy dla funkcji upsert_song i get_new_song"""
+
+    def test_upsert_replaces_in_place(self, songbook):
+        """Test zastąpienia piosenki bez zmiany kolejności"""
+        repository = songbook([{'id': 1, 'title': 'A'}, {'id': 2, 'title': 'B'}])
+
+        upsert_song({'id': 1, 'title': 'A2'})
+
+        assert [song['title'] for song in repository.songs()] == ['A2', 'B']
+        assert get_song(1)['title'] == 'A2'
+
+    def test_upsert_inserts_new(self, songbook):
+        """Test dodania nowej piosenki"""
+        repository = songbook([{'id': 1, 'title': 'A'}])
+
+        upsert_song({'id': 10, 'title': 'New'})
+
+        assert repository.get(10)['title'] == 'New'
+        assert get_new_song() == 11
+
+    def test_new_song_ids_increment(self, songbook):
+        """Test kolejnych identyfikatorów nowych piosenek"""
+        songbook([{'id': 3}, {'id': 1}])
+
+        assert get_new_song() == 4
+        assert get_new_song() == 5
+        assert get_song(5)['title'] == ''
+
+    def test_new_song_id_after_deleting_max(self, songbook):
+        """Test identyfikatora po usunięciu piosenki o największym ID"""
+        songbook([{'id': 1}, {'id': 2}])
+
+        delete_songs([2])
+        assert get_new_song() == 2
+
+
 class TestLoadSaveSongs:
     """Testy dla funkcji load_songs i save_songs"""
     
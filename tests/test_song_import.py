@@ -0,0 +1,87 @@
+"""
+Testy jednostkowe dla modułu song_import.py
+"""
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from metri.logic.jsonify_func import song_data_jsonify_auto
+from metri.logic.song_import import bulk_import, main
+from metri.logic.song_repository import SongRepository
+
+
+SONG_TEXT = "[v]\nC G\nHej sokoły\n[c]\nAm F\nOmijajcie góry"
+
+
+@pytest.fixture
+def repository(monkeypatch):
+    """Podstawia repozytorium w pamięci zamiast pliku songs.json"""
+    repository = SongRepository.from_songs([{'id': 1, 'title': 'Stara'}, {'id': 7, 'title': 'Inna'}])
+    monkeypatch.setattr('metri.logic.song_func.get_repository', lambda: repository)
+    return repository
+
+
+class TestBulkImport:
+    """Testy dla funkcji bulk_import"""
+
+    def test_mixed_sources(self, repository, tmp_path):
+        """Test importu z plików, tekstu, bajtów i słowników"""
+        song_file = tmp_path / 'Sokoły.txt'
+        song_file.write_text(SONG_TEXT, encoding='utf-8')
+
+        songs = bulk_import([song_file, SONG_TEXT, SONG_TEXT.encode('utf-8'),
+                             {'title': 'Formularz', 'lyrics': SONG_TEXT, 'tags': 'a; b'}], workers=1)
+
+        assert [song['id'] for song in songs] == [8, 9, 10, 11]
+        assert [song['title'] for song in songs] == ['Sokoły', '', '', 'Formularz']
+        assert songs[0] == song_data_jsonify_auto({'title': 'Sokoły', 'lyrics': SONG_TEXT}, 8)
+        assert songs[3]['tags'] == ['a', 'b']
+        assert [song['id'] for song in repository.songs()] == [1, 7, 8, 9, 10, 11]
+
+    def test_single_save(self, repository):
+        """Test zapisu wszystkich piosenek jednym wywołaniem"""
+        with patch.object(repository, 'save', wraps=repository.save) as mock_save:
+            bulk_import([SONG_TEXT] * 20, workers=1)
+
+        mock_save.assert_called_once()
+        assert len(repository.songs()) == 22
+
+    def test_process_pool_keeps_order(self, repository):
+        """Test że równoległe parsowanie zachowuje kolejność"""
+        texts = [f"[v]\nC G\nWers {i}" for i in range(40)]
+        songs = bulk_import(texts, workers=2)
+
+        assert [song['lyrics']['v'] for song in songs] == [[f"Wers {i}"] for i in range(40)]
+        assert [song['id'] for song in songs] == list(range(8, 48))
+
+    def test_empty_input(self, repository):
+        """Test pustej listy bez zapisu"""
+        with patch.object(repository, 'save') as mock_save:
+            assert bulk_import([]) == []
+        mock_save.assert_not_called()
+
+
+class TestMain:
+    """Testy dla wiersza poleceń"""
+
+    def test_imports_files(self, repository, tmp_path, capsys):
+        """Test importu plików z wiersza poleceń"""
+        paths = []
+        for title in ('Pierwsza', 'Druga'):
+            path = tmp_path / f'{title}.txt'
+            path.write_text(SONG_TEXT, encoding='utf-8')
+            paths.append(str(path))
+
+        assert main(paths + ['--workers', '1']) == 0
+        assert [song['title'] for song in repository.songs()][-2:] == ['Pierwsza', 'Druga']
+        assert 'Imported 2 songs' in capsys.readouterr().out
+
+    def test_missing_file(self, repository, tmp_path):
+        """Test błędu dla nieistniejącego pliku"""
+        with pytest.raises(SystemExit):
+            main([str(tmp_path / 'brak.txt')])
+        assert len(repository.songs()) == 2
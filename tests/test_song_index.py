@@ -0,0 +1,222 @@
+"""
+Testy jednostkowe dla modułu song_index.py
+"""
+import random
+import sys
+from pathlib import Path
+
+import pytest
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from metri.logic.collation import collation_key
+from metri.logic.song_index import SongIndex, RESULT_CACHE_SIZE
+from metri.logic.song_repository import SongRepository
+
+
+@pytest.fixture
+def songs():
+    return [
+        {'id': 1, 'title': 'Ballada o Janku', 'artist': 'Kaczmarski', 'group': '',
+         'language': 'polski', 'tags': ['Poezja', 'ballada']},
+        {'id': 2, 'title': 'Mury', 'artist': 'Jacek Kaczmarski', 'group': 'Mury',
+         'language': 'Polski', 'tags': ['poezja']},
+        {'id': 3, 'title': 'Wonderwall', 'artist': 'Oasis', 'group': 'Ballady rockowe',
+         'language': 'eng', 'tags': ['rock']},
+        {'id': 4, 'title': 'Żółta łódź', 'artist': '', 'group': ''},
+    ]
+
+
+def brute_force(songs, term):
+    term = term.lower()
+    return {
+        song['id'] for song in songs
+        if any(term in song.get(field, '').lower() for field in ('title', 'artist', 'group'))
+    }
+
+
+class TestSongIndex:
+    """Testy dla klasy SongIndex"""
+
+    @pytest.mark.parametrize('term', ['ball', 'BALLAD', 'mur', 'ka', 'a', 'ŻÓŁ', 'kaczmarski', 'xyz', 'wall'])
+    def test_search_matches_substring_scan(self, songs, term):
+        """Test zgodności z wyszukiwaniem podciągu"""
+        assert SongIndex(songs).search(term) == brute_force(songs, term)
+
+    def test_no_match_across_fields(self, songs):
+        """Test że dopasowanie nie łączy dwóch pól"""
+        assert SongIndex(songs).search('muryjacek') == set()
+        assert SongIndex(songs).search('murymury') == set()
+
+    def test_add_and_remove(self, songs):
+        """Test aktualizacji indeksu po zmianach"""
+        index = SongIndex(songs)
+        index.add({'id': 2, 'title': 'Obława', 'artist': 'Jacek Kaczmarski', 'group': ''})
+        index.add({'id': 5, 'title': 'Nowa ballada', 'artist': '', 'group': ''})
+        index.remove(1)
+
+        assert index.search('mury') == set()
+        assert index.search('obła') == {2}
+        assert index.search('ballad') == {3, 5}
+
+    def test_repository_keeps_index_in_sync(self, songs):
+        """Test synchronizacji indeksu z repozytorium"""
+        repository = SongRepository.from_songs(songs)
+        assert [s['id'] for s in repository.filter({'search': 'ballad'})] == [1, 3]
+
+        repository.upsert({'id': 1, 'title': 'Obława', 'artist': '', 'group': ''})
+        repository.upsert({'id': 6, 'title': 'Ballada wagonowa', 'artist': '', 'group': ''})
+        repository.delete([3])
+
+        assert [s['id'] for s in repository.filter({'search': 'ballad', 'sort_by': 'id'})] == [6]
+
+    def test_facets(self, songs):
+        """Test filtrowania po języku i tagach"""
+        index = SongIndex(songs)
+
+        assert index.with_language('POLSKI') == {1, 2}
+        assert index.with_language('niemiecki') == set()
+        assert index.with_any_tag(['poezja']) == {1, 2}
+        assert index.with_any_tag(['rock', 'Ballada']) == {1, 3}
+
+    def test_facet_counts(self, songs):
+        """Test liczników tagów i języków"""
+        index = SongIndex(songs)
+        assert index.tag_counts() == {'poezja': 2, 'ballada': 1, 'rock': 1}
+        assert index.language_counts() == {'polski': 2, 'eng': 1}
+
+        index.add({'id': 3, 'title': 'Wonderwall', 'language': 'polski', 'tags': ['poezja']})
+        index.remove(1)
+        assert index.tag_counts() == {'poezja': 2}
+        assert index.language_counts() == {'polski': 2}
+
+
+class TestQueryCache:
+    """Testy dla pamięci wyników SongIndex.query"""
+
+    def test_extended_term_refines_previous_result(self, songs):
+        """Test zawężania poprzedniego wyniku przy dopisywaniu liter"""
+        index = SongIndex(songs)
+        assert index.query('bal') == {1, 3}
+
+        with patch.object(index, 'search') as mock_search:
+            assert index.query('ball') == {1, 3}
+            assert index.query('ballada') == {1}
+            mock_search.assert_not_called()
+
+    def test_backspace_hits_cache(self, songs):
+        """Test że powrót do wcześniejszego zapytania korzysta z pamięci"""
+        index = SongIndex(songs)
+        first = index.query('mur', language='polski')
+        index.query('mury', language='polski')
+
+        assert index.query('mur', language='POLSKI') is first
+
+    def test_different_facets_not_refined(self, songs):
+        """Test że inne filtry nie korzystają z poprzedniego wyniku"""
+        index = SongIndex(songs)
+        assert index.query('bal', tags=['rock']) == {3}
+        assert index.query('ball') == {1, 3}
+        assert index.query('ball', tags=['poezja', 'rock']) == {1, 3}
+
+    def test_cache_cleared_on_change(self, songs):
+        """Test czyszczenia pamięci po zmianie śpiewnika"""
+        index = SongIndex(songs)
+        assert index.query('bal') == {1, 3}
+
+        index.add({'id': 7, 'title': 'Bal u Pana Boga'})
+        assert index.query('bal') == {1, 3, 7}
+        assert index.query('bal u') == {7}
+
+    def test_lru_eviction(self, songs):
+        """Test usuwania najstarszych wyników"""
+        index = SongIndex(songs)
+        for i in range(RESULT_CACHE_SIZE + 5):
+            index.query(f'term {i}')
+
+        assert len(index._results) == RESULT_CACHE_SIZE
+        assert ('term 0', '', ()) not in index._results
+
+    def test_no_filters(self, songs):
+        """Test zapytania bez filtrów"""
+        assert SongIndex(songs).query('', None, []) is None
+
+
+def reference_filter(songs, search_args):
+    """Pierwotny algorytm filter_songs (sortowanie stabilne + reverse)"""
+    result = list(songs)
+    if search_args.get('search'):
+        term = search_args['search'].lower()
+        result = [s for s in result if any(term in s.get(f, '').lower() for f in ('title', 'artist', 'group'))]
+    field = search_args.get('sort_by', 'title')
+    if field == 'id':
+        result.sort(key=lambda s: s['id'])
+    elif field in ('title', 'artist', 'group', 'language'):
+        result.sort(key=lambda s: collation_key(s.get(field, '')))
+    if search_args.get('order') == 'desc':
+        result.reverse()
+    return [s['id'] for s in result]
+
+
+class TestSortOrders:
+    """Testy dla posortowanych indeksów kolejności"""
+
+    @pytest.fixture
+    def random_songs(self):
+        rng = random.Random(7)
+        words = ['Alfa', 'beta', 'Gamma', 'alfa', 'Delta', '', 'Łza', 'lato', 'Ćma']
+        ids = rng.sample(range(1, 500), 200)
+        return [
+            {'id': song_id, 'title': rng.choice(words), 'artist': rng.choice(words),
+             'group': rng.choice(words), 'language': rng.choice(['pl', 'eng', ''])}
+            for song_id in ids
+        ]
+
+    @pytest.mark.parametrize('sort_by', ['title', 'artist', 'group', 'language', 'id', 'unknown'])
+    @pytest.mark.parametrize('order', ['asc', 'desc'])
+    @pytest.mark.parametrize('search', ['', 'al', 'alfa', 'delta'])
+    def test_matches_stable_sort(self, random_songs, sort_by, order, search):
+        """Test zgodności z sortowaniem stabilnym (również przy remisach)"""
+        search_args = {'search': search, 'sort_by': sort_by, 'order': order}
+        repository = SongRepository.from_songs(random_songs)
+
+        expected = reference_filter(random_songs, search_args)
+        assert [s['id'] for s in repository.filter(search_args)] == expected
+
+    def test_polish_title_order(self):
+        """Test sortowania tytułów według polskiego alfabetu"""
+        titles = ['Żurawie', 'Mury', 'Łódka', 'Lato', 'Zima', 'Źródło', 'ćma', 'Cisza', 'Ósemka', 'Owca']
+        repository = SongRepository.from_songs([{'id': i, 'title': t} for i, t in enumerate(titles)])
+
+        assert [s['title'] for s in repository.filter({'sort_by': 'title'})] == [
+            'Cisza', 'ćma', 'Lato', 'Łódka', 'Mury', 'Owca', 'Ósemka', 'Zima', 'Źródło', 'Żurawie'
+        ]
+
+    def test_iteration_survives_changes(self, random_songs):
+        """Test że rozpoczęte przeglądanie wyników nie jest zaburzone zmianami"""
+        repository = SongRepository.from_songs(random_songs)
+        search_args = {'sort_by': 'title'}
+        expected = [s['id'] for s in repository.filter(search_args)]
+
+        songs = repository.iter_filter(search_args)
+        first = [next(songs)['id'] for _ in range(10)]
+        repository.upsert({'id': 1000, 'title': 'Aaaa'})
+        repository.delete([expected[20]])
+
+        assert first + [s['id'] for s in songs] == expected[:20] + expected[21:]
+
+    def test_orders_follow_changes(self, random_songs):
+        """Test aktualizacji kolejności po zmianach"""
+        repository = SongRepository.from_songs(random_songs)
+        repository.filter({'sort_by': 'title'})
+        repository.filter({'sort_by': 'id', 'order': 'desc'})
+
+        edited = dict(random_songs[5], title='Aaaa')
+        repository.upsert(edited)
+        repository.upsert({'id': 1000, 'title': 'Zzz', 'artist': '', 'group': '', 'language': ''})
+        repository.delete([random_songs[0]['id']])
+
+        songs = repository.songs()
+        for search_args in ({'sort_by': 'title'}, {'sort_by': 'id', 'order': 'desc'}):
+            assert [s['id'] for s in repository.filter(search_args)] == reference_filter(songs, search_args)
@@ -0,0 +1,104 @@
+"""
+Testy jednostkowe dla modułu song_prefetch.py
+"""
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from metri.logic import display_func
+from metri.logic.song_prefetch import DisplayPrefetcher, adjacent_songs
+
+
+SONGS = [
+    {'id': song_id, 'title': f'Piosenka {song_id}', 'content': ['v'],
+     'lyrics': {'v': [f'Hej |sokoły {song_id}']}, 'chords': {'v': ['C G']}}
+    for song_id in (4, 8, 15, 16, 23)
+]
+
+
+@pytest.fixture
+def prefetcher():
+    display_func.clear_display_cache()
+    prefetcher = DisplayPrefetcher()
+    yield prefetcher
+    prefetcher.shutdown()
+
+
+class TestAdjacentSongs:
+    """Testy dla funkcji adjacent_songs"""
+
+    def test_next_and_previous(self):
+        """Test wyboru sąsiednich piosenek"""
+        assert [song['id'] for song in adjacent_songs(SONGS, 15)] == [16, 8]
+        assert [song['id'] for song in adjacent_songs(SONGS, 15, radius=2)] == [16, 8, 23, 4]
+
+    def test_edges(self):
+        """Test początku i końca listy"""
+        assert [song['id'] for song in adjacent_songs(SONGS, 4)] == [8]
+        assert [song['id'] for song in adjacent_songs(SONGS, 23)] == [16]
+
+    def test_unknown_song(self):
+        """Test piosenki spoza listy"""
+        assert adjacent_songs(SONGS, 99) == []
+
+
+class TestDisplayPrefetcher:
+    """Testy dla klasy DisplayPrefetcher"""
+
+    def test_renders_into_cache(self, prefetcher):
+        """Test że przygotowane piosenki są brane z pamięci"""
+        prefetcher.prefetch(SONGS[:2])
+        prefetcher.wait()
+
+        for song in SONGS[:2]:
+            assert (song['id'], 'runs', 0) in display_func._display_cache
+            assert (song['id'], 'columns', 0) in display_func._display_cache
+        runs = display_func._display_cache[(4, 'runs', 0)][1]
+        assert display_func.render_runs(SONGS[0]) is runs
+
+    def test_transpose(self, prefetcher):
+        """Test przygotowania transponowanej piosenki"""
+        prefetcher.prefetch(SONGS[:1], transpose=2)
+        prefetcher.wait()
+        assert display_func.render_columns(SONGS[0], 2) == ['Hej sokoły 4', 'D A']
+        assert (4, 'columns', 2) in display_func._display_cache
+
+    def test_runs_on_worker_thread(self):
+        """Test że renderowanie odbywa się poza wątkiem wywołującym"""
+        threads = []
+        prefetcher = DisplayPrefetcher(renderers=[lambda song, transpose: threads.append(threading.current_thread())])
+        prefetcher.prefetch(SONGS[:1])
+        prefetcher.wait()
+        prefetcher.shutdown()
+        assert threads and threads[0] is not threading.current_thread()
+
+    def test_newer_prefetch_drops_queued_songs(self):
+        """Test że nowe żądanie anuluje niezaczęte renderowanie"""
+        started = threading.Event()
+        release = threading.Event()
+        rendered = []
+
+        def renderer(song, transpose):
+            started.set()
+            release.wait(5)
+            rendered.append(song['id'])
+
+        prefetcher = DisplayPrefetcher(renderers=[renderer])
+        prefetcher.prefetch(SONGS[:3])
+        started.wait(5)
+        prefetcher.prefetch(SONGS[4:])
+        release.set()
+        prefetcher.wait()
+        prefetcher.shutdown()
+        assert rendered == [4, 23]
+
+    def test_errors_ignored(self):
+        """Test że błąd renderowania nie przerywa przygotowania"""
+        prefetcher = DisplayPrefetcher(renderers=[lambda song, transpose: 1 / 0])
+        prefetcher.prefetch(SONGS[:2])
+        prefetcher.wait()
+        prefetcher.shutdown()
@@ -0,0 +1,84 @@
+"""
+Testy jednostkowe dla modułu song_repository.py
+"""
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from metri.logic.song_repository import SongRepository
+from metri.logic.song_storage import unpack_sections
+
+
+def write_songs(path, songs):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(songs, f)
+
+
+@pytest.fixture
+def songs_path(tmp_path):
+    path = tmp_path / 'songs.json'
+    write_songs(path, [
+        {'id': 1, 'title': 'Song 1'},
+        None,
+        {'id': 2, 'title': 'Song 2'}
+    ])
+    return str(path)
+
+
+class TestSongRepository:
+    """Testy dla klasy SongRepository"""
+
+    def test_get_by_id(self, songs_path):
+        """Test wyszukiwania piosenki po ID"""
+        repository = SongRepository(songs_path)
+        assert repository.get(2)['title'] == 'Song 2'
+        assert repository.get(999) is None
+
+    def test_none_values_skipped(self, songs_path):
+        """Test pomijania wartości None z pliku"""
+        repository = SongRepository(songs_path)
+        assert [song['id'] for song in repository.songs()] == [1, 2]
+
+    def test_file_parsed_once(self, songs_path):
+        """Test że niezmieniony plik nie jest ponownie parsowany"""
+        repository = SongRepository(songs_path)
+        first = repository.songs()
+        assert repository.songs() is first
+
+    def test_reload_on_file_change(self, songs_path):
+        """Test przeładowania po zmianie pliku"""
+        repository = SongRepository(songs_path)
+        assert repository.get(3) is None
+
+        write_songs(songs_path, [{'id': 3, 'title': 'New song title'}])
+        stat = os.stat(songs_path)
+        os.utime(songs_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert repository.get(3)['title'] == 'New song title'
+        assert repository.get(1) is None
+
+    def test_missing_file(self, tmp_path):
+        """Test brakującego pliku"""
+        repository = SongRepository(str(tmp_path / 'missing.json'))
+        assert repository.songs() == []
+
+    def test_save_updates_cache(self, songs_path):
+        """Test że zapis aktualizuje pamięć podręczną bez ponownego odczytu"""
+        repository = SongRepository(songs_path)
+        repository.save([{'id': 5, 'title': 'Saved'}])
+
+        assert repository.get(5)['title'] == 'Saved'
+        with open(songs_path, encoding='utf-8') as f:
+            assert unpack_sections(json.load(f)) == [{'id': 5, 'title': 'Saved'}]
+
+    def test_from_songs_without_file(self):
+        """Test repozytorium bez pliku"""
+        repository = SongRepository.from_songs([{'id': 1}, None])
+        assert repository.get(1) == {'id': 1}
+        repository.save([{'id': 2}])
+        assert repository.get(2) == {'id': 2}
@@ -0,0 +1,130 @@
+"""
+Testy jednostkowe dla modułu song_snapshot.py
+"""
+import copy
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from metri.logic import song_func
+from metri.logic.song_repository import SongRepository
+from metri.logic.song_snapshot import BinaryStorage, LazySong
+
+
+SONGS = [
+    {'id': 1, 'title': 'Hej sokoły', 'artist': 'Ludowa', 'tags': ['ludowa'], 'content': ['v', 'c'],
+     'lyrics': {'v': ['Hej, tam gdzieś'], 'c': ['Hej, hej, hej sokoły']},
+     'chords': {'v': ['C G'], 'c': ['Am F']}, 'display': ''},
+    {'id': 2, 'title': 'Żółta łódź', 'content': [], 'lyrics': {}, 'chords': {}},
+    {'id': 5, 'title': 'Bez tekstu'},
+]
+
+
+@pytest.fixture
+def songs_path(tmp_path):
+    path = tmp_path / 'songs.json'
+    path.write_text(json.dumps(SONGS), encoding='utf-8')
+    return str(path)
+
+
+@pytest.fixture
+def storage(songs_path):
+    BinaryStorage(songs_path).read()  # import songs.json
+    return BinaryStorage(songs_path)
+
+
+class TestBinaryStorage:
+    """Testy dla klasy BinaryStorage"""
+
+    def test_imports_json_once(self, songs_path):
+        """Test jednorazowego importu songs.json"""
+        storage = BinaryStorage(songs_path)
+        assert storage.read() == SONGS
+        assert os.path.exists(storage.snapshot_path)
+
+        os.remove(songs_path)
+        assert BinaryStorage(songs_path).read() == SONGS
+
+    def test_bodies_decoded_on_first_use(self, storage):
+        """Test dekodowania tekstu dopiero przy otwarciu piosenki"""
+        songs = storage.read()
+        assert all(isinstance(song, LazySong) and not song.loaded for song in songs)
+        assert [song['title'] for song in songs] == ['Hej sokoły', 'Żółta łódź', 'Bez tekstu']
+        assert songs[0].get('tags') == ['ludowa']
+        assert list(songs[0]) == list(SONGS[0])
+        assert not any(song.loaded for song in songs)
+
+        assert songs[0]['lyrics'] == SONGS[0]['lyrics']
+        assert songs[0].loaded and not songs[1].loaded
+
+    @pytest.mark.parametrize('convert', [
+        dict, lambda song: {**song}, copy.copy, copy.deepcopy,
+        lambda song: json.loads(json.dumps(song)), lambda song: dict(song.items()),
+    ])
+    def test_conversions_include_body(self, storage, convert):
+        """Test że kopie i JSON zawierają tekst piosenki"""
+        song = storage.read()[0]
+        converted = convert(song)
+        assert converted == SONGS[0]
+        assert type(converted) is dict
+
+    def test_rewrite_keeps_unopened_songs(self, storage):
+        """Test zapisu bez dekodowania nieotwartych piosenek"""
+        songs = storage.read()
+        songs[1]['title'] = 'Edytowana'
+        storage.write(songs + [{'id': 6, 'title': 'Nowa', 'lyrics': {'v': ['la']}}])
+
+        assert not songs[0].loaded
+        assert songs[0]['chords'] == SONGS[0]['chords']
+        reread = BinaryStorage(storage.path).read()
+        assert [song['title'] for song in reread] == ['Hej sokoły', 'Edytowana', 'Bez tekstu', 'Nowa']
+        assert reread[0] == SONGS[0]
+        assert reread[3]['lyrics'] == {'v': ['la']}
+
+    def test_old_songs_survive_reread(self, storage):
+        """Test że piosenki z poprzedniego odczytu nadal działają"""
+        old = storage.read()
+        BinaryStorage(storage.path).write(SONGS[:1])
+        assert storage.read() == SONGS[:1]
+        assert old[0]['lyrics'] == SONGS[0]['lyrics']
+
+    def test_rejects_other_files(self, storage):
+        """Test odrzucenia pliku w innym formacie"""
+        with open(storage.snapshot_path, 'wb') as f:
+            f.write(b'\0' * 64)
+        with pytest.raises(ValueError):
+            storage.read()
+
+
+class TestBinaryRepository:
+    """Testy dla repozytorium w trybie binary"""
+
+    @pytest.fixture(autouse=True)
+    def isolated_repository(self, monkeypatch, songs_path):
+        monkeypatch.setattr(song_func, '_repository', None)
+        monkeypatch.setattr(song_func, '_storage_mode', 'json')
+        monkeypatch.setattr(song_func, 'get_songs_path', lambda: songs_path)
+
+    def test_list_without_decoding(self, storage):
+        """Test listy i wyszukiwania bez dekodowania tekstów"""
+        repository = SongRepository(storage=storage)
+        found = repository.filter({'search': 'sokoły', 'sort_by': 'title'})
+
+        assert [song['id'] for song in found] == [1]
+        assert not any(song.loaded for song in repository.songs())
+
+    def test_storage_mode(self, songs_path):
+        """Test trybu zapisu 'binary'"""
+        song_func.set_storage_mode('binary')
+        song_id = song_func.get_new_song()
+        song_func.upsert_song(dict(song_func.get_song(song_id), title='Nowa'))
+
+        song_func.set_storage_mode('binary')
+        assert song_func.get_song(song_id)['title'] == 'Nowa'
+        assert song_func.get_song(1)['lyrics'] == SONGS[0]['lyrics']
+        assert json.loads(Path(songs_path).read_text(encoding='utf-8')) == SONGS
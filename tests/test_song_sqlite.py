@@ -0,0 +1,126 @@
+"""
+Testy jednostkowe dla modułu song_sqlite.py
+"""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from metri.logic.song_repository import SongRepository
+from metri.logic.song_sqlite import SqliteSongStore
+
+
+SONGS = [
+    {'id': 1, 'title': 'Rock Song A', 'artist': 'Band X', 'group': '', 'language': 'polski',
+     'tags': ['Rock', 'ballad'], 'content': ['v'], 'lyrics': {'v': ['Hej |sokoły']}, 'chords': {'v': ['C G']}},
+    {'id': 2, 'title': 'Żółta łódź', 'artist': 'Band Y', 'group': 'Rockowa grupa', 'language': 'english',
+     'tags': ['pop'], 'content': [], 'lyrics': {}, 'chords': {}},
+    {'id': 3, 'title': 'apple', 'artist': 'Band Z', 'group': '', 'language': 'Polski',
+     'tags': ['rock'], 'content': [], 'lyrics': {}, 'chords': {}},
+    {'id': 4, 'title': 'Apple', 'artist': '', 'group': '', 'language': '',
+     'tags': [], 'content': [], 'lyrics': {}, 'chords': {}},
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SqliteSongStore(str(tmp_path / 'songs.sqlite3'))
+    store.save(SONGS)
+    yield store
+    store.close()
+
+
+class TestSqliteSongStore:
+    """Testy dla klasy SqliteSongStore"""
+
+    @pytest.mark.parametrize('search_args', [
+        {},
+        {'search': 'rock'},
+        {'search': 'ÓŁT'},
+        {'search': 'a'},
+        {'language': 'polski'},
+        {'tags': 'ROCK'},
+        {'tags': ['pop', 'ballad']},
+        {'sort_by': 'title'},
+        {'filter_by': 'title', 'order': 'desc'},
+        {'sort_by': 'artist', 'order': 'desc'},
+        {'sort_by': 'id', 'order': 'desc'},
+        {'search': 'band', 'language': 'polski', 'tags': ['rock'], 'sort_by': 'title'},
+    ])
+    def test_filter_matches_repository(self, store, search_args):
+        """Test zgodności filtrowania z SongRepository"""
+        expected = SongRepository.from_songs(SONGS).filter(search_args)
+        assert [song['id'] for song in store.filter(search_args)] == [song['id'] for song in expected]
+
+    @pytest.mark.parametrize('search_args', [{}, {'search': 'band', 'sort_by': 'title'}, {'order': 'desc'}])
+    def test_iter_filter_pages(self, store, search_args):
+        """Test stronicowania wyników"""
+        expected = store.filter(search_args)
+        assert list(store.iter_filter(search_args)) == expected
+        assert list(store.iter_filter(search_args, offset=1, limit=2)) == expected[1:3]
+
+    def test_round_trip(self, store):
+        """Test odczytu zapisanych piosenek"""
+        assert store.songs() == SONGS
+        assert store.get(2)['title'] == 'Żółta łódź'
+        assert store.get(999) is None
+
+    def test_tags(self, store):
+        """Test pobierania tagów"""
+        assert store.tags() == ['ballad', 'pop', 'rock']
+
+    def test_counts(self, store):
+        """Test liczników tagów i języków"""
+        assert store.tag_counts() == {'ballad': 1, 'pop': 1, 'rock': 2}
+        assert store.language_counts() == {'polski': 2, 'english': 1}
+
+    def test_upsert_and_delete(self, store):
+        """Test dodawania, edycji i usuwania piosenek"""
+        store.upsert({'id': 1, 'title': 'Edited', 'tags': ['jazz']})
+        store.upsert({'id': store.next_id(), 'title': 'New'})
+
+        assert [song['id'] for song in store.songs()] == [1, 2, 3, 4, 5]
+        assert store.get(1)['title'] == 'Edited'
+        assert store.tags() == ['jazz', 'pop', 'rock']
+        assert store.filter({'search': 'rock song'}) == []
+
+        assert store.delete([1, 5, 999]) == 2
+        assert [song['id'] for song in store.songs()] == [2, 3, 4]
+        assert store.tags() == ['pop', 'rock']
+
+    def test_search_lyrics(self, store):
+        """Test wyszukiwania w tekście piosenki"""
+        assert [song['id'] for song in store.search_lyrics('sokoły')] == [1]
+        assert [song['id'] for song in store.search_lyrics('ej')] == [1]
+        assert store.search_lyrics('zzz') == []
+
+    def test_migration_from_json(self, tmp_path):
+        """Test jednorazowego importu songs.json"""
+        songs_path = tmp_path / 'songs.json'
+        songs_path.write_text(json.dumps(SONGS), encoding='utf-8')
+
+        store = SqliteSongStore.from_json_path(str(songs_path))
+        assert [song['id'] for song in store.songs()] == [1, 2, 3, 4]
+        store.delete([1])
+        store.close()
+
+        reopened = SqliteSongStore.from_json_path(str(songs_path))
+        assert [song['id'] for song in reopened.songs()] == [2, 3, 4]
+        reopened.close()
+
+    def test_failed_migration_is_retried(self, tmp_path):
+        """Test że nieudany import nie zostawia pustej bazy"""
+        songs_path = tmp_path / 'songs.json'
+        songs_path.write_text(json.dumps([{'id': 1, 'title': None}]), encoding='utf-8')
+
+        with pytest.raises(Exception):
+            SqliteSongStore.from_json_path(str(songs_path))
+        assert sorted(path.name for path in tmp_path.iterdir()) == ['songs.json']
+
+        songs_path.write_text(json.dumps(SONGS), encoding='utf-8')
+        store = SqliteSongStore.from_json_path(str(songs_path))
+        assert [song['id'] for song in store.songs()] == [1, 2, 3, 4]
+        store.close()
@@ -0,0 +1,178 @@
+"""
+Testy jednostkowe dla modułu song_storage.py
+"""
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from metri.logic.song_storage import JsonStorage, JournalStorage, pack_sections, unpack_sections
+from metri.logic.song_repository import SongRepository
+from metri.logic import song_func
+
+
+@pytest.fixture
+def songs_path(tmp_path):
+    path = tmp_path / 'songs.json'
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump([{'id': 1, 'title': 'Song 1'}, {'id': 2, 'title': 'Song 2'}], f)
+    return str(path)
+
+
+def read_snapshot(path):
+    with open(path, encoding='utf-8') as f:
+        return unpack_sections(json.load(f))
+
+
+CHORUS = ['Hej, hej', 'sokoły']
+SONGS_WITH_SECTIONS = [
+    {'id': 1, 'title': 'A', 'content': ['v', 'c', 'c2'],
+     'lyrics': {'v': ['Zwrotka'], 'c': list(CHORUS), 'c2': list(CHORUS)},
+     'chords': {'v': ['C G'], 'c': ['Am F'], 'c2': ['Am F']}},
+    {'id': 2, 'title': 'B', 'content': ['c'], 'lyrics': {'c': list(CHORUS)}, 'chords': {'c': []}},
+    {'id': 3, 'title': 'C'},
+]
+
+
+class TestJsonStorage:
+    """Testy dla klasy JsonStorage"""
+
+    def test_write_is_atomic(self, songs_path):
+        """Test że zapis nie zostawia plików tymczasowych"""
+        storage = JsonStorage(songs_path)
+        storage.write([{'id': 3, 'title': 'Zażółć'}])
+
+        assert read_snapshot(songs_path) == [{'id': 3, 'title': 'Zażółć'}]
+        assert os.listdir(os.path.dirname(songs_path)) == ['songs.json']
+
+    def test_failed_write_keeps_snapshot(self, songs_path):
+        """Test że błąd zapisu nie uszkadza śpiewnika"""
+        storage = JsonStorage(songs_path)
+
+        with pytest.raises(TypeError):
+            storage.write([{'id': 3, 'title': object()}])
+
+        assert len(read_snapshot(songs_path)) == 2
+        assert os.listdir(os.path.dirname(songs_path)) == ['songs.json']
+
+    def test_sections_stored_once(self, songs_path):
+        """Test zapisu powtarzających się sekcji tylko raz"""
+        JsonStorage(songs_path).write(SONGS_WITH_SECTIONS)
+
+        with open(songs_path, encoding='utf-8') as f:
+            snapshot = json.load(f)
+        assert len(snapshot['sections']) == 4
+        assert snapshot['songs'][1]['chords'] == {'c': []}
+        assert snapshot['songs'][0]['lyrics']['c'] == snapshot['songs'][1]['lyrics']['c']
+        assert snapshot['songs'][2] == {'id': 3, 'title': 'C'}
+
+        songs = JsonStorage(songs_path).read()
+        assert songs == SONGS_WITH_SECTIONS
+        assert songs[0]['lyrics']['c'] is songs[1]['lyrics']['c']
+
+    def test_pack_does_not_modify_songs(self):
+        """Test że pakowanie nie zmienia piosenek"""
+        songs = json.loads(json.dumps(SONGS_WITH_SECTIONS))
+        snapshot = pack_sections(songs)
+
+        assert songs == SONGS_WITH_SECTIONS
+        assert unpack_sections(json.loads(json.dumps(snapshot))) == SONGS_WITH_SECTIONS
+
+    def test_inline_string_body(self, songs_path):
+        """Test że treść sekcji będąca napisem nie jest brana za odwołanie"""
+        songs = [{'id': 1, 'lyrics': {'v': 'abc', 'c': ['Hej']}}]
+        JsonStorage(songs_path).write(songs)
+
+        assert JsonStorage(songs_path).read() == songs
+
+    def test_reads_plain_list_snapshot(self, songs_path):
+        """Test odczytu starszego formatu (lista piosenek)"""
+        with open(songs_path, 'w', encoding='utf-8') as f:
+            json.dump(SONGS_WITH_SECTIONS, f)
+
+        assert JsonStorage(songs_path).read() == SONGS_WITH_SECTIONS
+
+    def test_leftover_journal_replayed(self, songs_path):
+        """Test odtworzenia dziennika pozostawionego przez tryb journal"""
+        JournalStorage(songs_path).apply([], upserted=[{'id': 3, 'title': 'New'}], deleted=[1])
+
+        songs = JsonStorage(songs_path).read()
+        assert [song['id'] for song in songs] == [2, 3]
+
+
+class TestJournalStorage:
+    """Testy dla klasy JournalStorage"""
+
+    def test_changes_appended_not_rewritten(self, songs_path):
+        """Test że zmiana dopisuje wpis zamiast przepisywać śpiewnik"""
+        repository = SongRepository(storage=JournalStorage(songs_path))
+        repository.upsert({'id': 3, 'title': 'Song 3'})
+        repository.delete([1])
+
+        assert len(read_snapshot(songs_path)) == 2
+        with open(songs_path + '.journal', encoding='utf-8') as f:
+            assert len(f.readlines()) == 2
+
+        reopened = SongRepository(storage=JournalStorage(songs_path))
+        assert [song['id'] for song in reopened.songs()] == [2, 3]
+
+    def test_compaction(self, songs_path):
+        """Test przepisania dziennika do pliku songs.json"""
+        repository = SongRepository(storage=JournalStorage(songs_path, compact_every=3))
+        for song_id in range(3, 6):
+            repository.upsert({'id': song_id, 'title': f'Song {song_id}'})
+
+        assert [song['id'] for song in read_snapshot(songs_path)] == [1, 2, 3, 4, 5]
+        assert not os.path.exists(songs_path + '.journal')
+
+    def test_flush(self, songs_path):
+        """Test ręcznego opróżnienia dziennika"""
+        repository = SongRepository(storage=JournalStorage(songs_path))
+        repository.upsert({'id': 1, 'title': 'Edited'})
+        repository.flush()
+
+        assert read_snapshot(songs_path)[0]['title'] == 'Edited'
+        assert not os.path.exists(songs_path + '.journal')
+
+    def test_torn_last_line_ignored(self, songs_path):
+        """Test pominięcia niedokończonego wpisu po awarii"""
+        storage = JournalStorage(songs_path)
+        storage.apply([], upserted=[{'id': 3, 'title': 'Song 3'}])
+        with open(songs_path + '.journal', 'a', encoding='utf-8') as f:
+            f.write('{"op": "upsert", "song": {"id"')
+
+        repository = SongRepository(storage=JournalStorage(songs_path))
+        assert [song['id'] for song in repository.songs()] == [1, 2, 3]
+
+        repository.upsert({'id': 4, 'title': 'Song 4'})
+        reopened = SongRepository(storage=JournalStorage(songs_path))
+        assert [song['id'] for song in reopened.songs()] == [1, 2, 3, 4]
+
+
+class TestStorageMode:
+    """Testy dla funkcji set_storage_mode"""
+
+    @pytest.fixture(autouse=True)
+    def isolated_repository(self, monkeypatch, songs_path):
+        monkeypatch.setattr(song_func, '_repository', None)
+        monkeypatch.setattr(song_func, '_storage_mode', 'json')
+        monkeypatch.setattr(song_func, 'get_songs_path', lambda: songs_path)
+
+    def test_unknown_mode(self):
+        """Test nieznanego trybu zapisu"""
+        with pytest.raises(ValueError):
+            song_func.set_storage_mode('xml')
+
+    def test_switch_back_flushes_journal(self, songs_path):
+        """Test że zmiana trybu zapisuje dziennik do songs.json"""
+        song_func.set_storage_mode('journal')
+        song_id = song_func.get_new_song()
+        assert os.path.exists(songs_path + '.journal')
+
+        song_func.set_storage_mode('json')
+        assert not os.path.exists(songs_path + '.journal')
+        assert read_snapshot(songs_path)[-1]['id'] == song_id